@@ -44,12 +44,18 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # HTML / JSON gzip NAPLO_TOMORITES_MIN_BAJT felett (a tartalmat módosítók előtt kell álljon)
+    'naplo.middleware.TomoritoMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # opt-in: csak NAPLO_PROFILOZAS = True esetén aktív (lásd lent)
+    'naplo.middleware.ProfilozoMiddleware',
+    # opt-in: csak NAPLO_LASSU_LEKERDEZES_MS megadása esetén aktív
+    'naplo.middleware.LassuLekerdezesMiddleware',
 ]
 
 ROOT_URLCONF = 'hmnaplo.urls'
@@ -119,6 +125,17 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
 STATIC_URL = 'static/'
+STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Tartalom-hash a fájlnévben (naplo_bevitel.3f2a….js): a böngésző egy évig cache-elheti,
+# változáskor új név. Élesben (DEBUG=False) telepítéskor `python manage.py collectstatic`
+# kell; addig az oldalak hash nélküli nevekkel jelennek meg (nem 500-zal).
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    # ManifestStaticFilesStorage + .gz/.br változatok (naplo/storage.py)
+    'staticfiles': {'BACKEND': 'naplo.storage.TomoritettManifestStorage'},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -132,3 +149,17 @@ TINYMCE_DEFAULT_CONFIG = {
     'plugins': 'link lists',
     'toolbar': 'bold italic | link | bullist numlist | removeformat',
 }
+
+
+# Kérés-profilozás (naplo.middleware.ProfilozoMiddleware): idő, DB idő, lekérdezésszám
+# URL név szerint; Server-Timing fejléc; statisztika: /naplo/api/profil/ (staff)
+NAPLO_PROFILOZAS = False
+NAPLO_PROFIL_MERET = 5000   # gyűrűpuffer: ennyi utolsó kérés marad meg
+
+# Lassú lekérdezések naplója (naplo.middleware.LassuLekerdezesMiddleware): a küszöb
+# feletti SQL + EXPLAIN QUERY PLAN az adminba (Lassú lekérdezések); None = kikapcsolva
+NAPLO_LASSU_LEKERDEZES_MS = None
+NAPLO_LASSU_LEKERDEZES_MAX = 500
+
+# Tömörítés (naplo.middleware.TomoritoMiddleware, naplo.storage): ez alatt nem tömörítünk
+NAPLO_TOMORITES_MIN_BAJT = 1024
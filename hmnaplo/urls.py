@@ -14,11 +14,18 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from naplo.views import statikus_fajl
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("naplo/", include("naplo.urls")),
 ]
 
+if not settings.DEBUG:
+    # DEBUG alatt a runserver szolgálja ki (hash nélkül); élesben a collectstatic kimenete
+    urlpatterns += [re_path(rf"^{settings.STATIC_URL.strip('/')}/(?P<path>.*)$", statikus_fajl)]
+
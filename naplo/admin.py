@@ -1,7 +1,26 @@
-from django.contrib import admin
-from .models import NaploSor, Param
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db import transaction
+from django.utils import timezone
+
+from .forms import ELETKEREK_CHOICES
+from .kereses import kereso_kifejezes, normalizal
+from .models import LassuLekerdezes, NaploSor, Param
+from .signals import tomeges_modositas_utan
 
 admin.site.register(Param)
+
+
+class NaploSorActionForm(ActionForm):
+    # a tömeges műveletek paraméterei (a művelet-választó mellett jelennek meg)
+    uj_kategoria = forms.CharField(required=False, label="Új kategória")
+    eletkerek = forms.MultipleChoiceField(
+        required=False, choices=ELETKEREK_CHOICES, label="Életkerék",
+        widget=forms.SelectMultiple(attrs={"size": 3}),
+    )
+
+
 @admin.register(NaploSor)
 class NaploSorAdmin(admin.ModelAdmin):
     list_display = (
@@ -18,7 +37,73 @@ class NaploSorAdmin(admin.ModelAdmin):
         "kapcsolodo_cel",
     )
 
-    list_filter = ("datum", "kategoria", "erzelem")
-    search_fields = ("tevekenyseg", "megjegyzes")
+    # a (datum, kezdet) indexen; nagy táblán a datum list_filter helyett
+    date_hierarchy = "datum"
+    list_filter = ("kategoria", "erzelem")
+    search_fields = ("kereso",)
+    search_help_text = "Ékezet- és kisbetű-független keresés a tevékenységben, megjegyzésben és a címkékben."
     ordering = ("-datum", "-kezdet")
+    # nincs külön COUNT(*) a teljes táblára minden oldalon
+    show_full_result_count = False
+
+    action_form = NaploSorActionForm
+    actions = ("kategoria_atallitas", "eletkerek_beallitas")
+
+    def get_search_results(self, request, queryset, search_term):
+        # a normalizált 'kereso' árnyékmezőben (sima szöveg, markup nélkül), szavanként ÉS
+        szavak = normalizal(search_term).split()
+        for szo in szavak:
+            queryset = queryset.filter(kereso__contains=szo)
+        return queryset, False
+
+    def _tomeges_update(self, queryset, **ertekek):
+        """Egyetlen UPDATE (nincs soronkénti save / jelzés); utána a jelzések munkája egyben."""
+        with transaction.atomic():
+            sorok = list(queryset.values_list("id", "datum"))
+            if not sorok:
+                return 0
+            idk = [pk for pk, _ in sorok]
+            # az update() kihagyja az auto_now-t: a modositva-t (valtozasok API) itt kell állítani
+            queryset.update(**ertekek, modositva=timezone.now())
+            tomeges_modositas_utan(idk, {d for _, d in sorok})
+        return len(idk)
+
+    @admin.action(description="Kijelöltek átkategorizálása (Új kategória)")
+    def kategoria_atallitas(self, request, queryset):
+        uj = (request.POST.get("uj_kategoria") or "").strip()
+        if not uj:
+            self.message_user(request, "Add meg az új kategóriát.", messages.WARNING)
+            return
+        # a kereso a kategoria_norm-ot is tartalmazza: ugyanabban az UPDATE-ben épül újra
+        norm = normalizal(uj)
+        db = self._tomeges_update(
+            queryset, kategoria=uj, kategoria_norm=norm, kereso=kereso_kifejezes(kategoria_norm=norm),
+        )
+        self.message_user(request, f"{db} sor új kategóriája: {uj}.", messages.SUCCESS)
+
+    @admin.action(description="Kijelöltek Életkerék címkéinek beállítása")
+    def eletkerek_beallitas(self, request, queryset):
+        # az action_form már ellenőrizte a kódokat (érvénytelennél a művelet nem fut)
+        cimkek = request.POST.getlist("eletkerek")
+        db = self._tomeges_update(queryset, eletkerek_focus=cimkek)
+        leiras = ", ".join(cimkek) if cimkek else "(nincs)"
+        self.message_user(request, f"{db} sor Életkerék címkéi: {leiras}.", messages.SUCCESS)
+
+
+@admin.register(LassuLekerdezes)
+class LassuLekerdezesAdmin(admin.ModelAdmin):
+    list_display = ("idopont", "ido_ms", "teljes_scan", "url", "sql_eleje")
+    list_filter = ("teljes_scan",)
+    search_fields = ("sql", "url")
+    ordering = ("-idopont", "-id")
+    readonly_fields = ("idopont", "url", "ido_ms", "teljes_scan", "sql", "params", "terv")
+
+    @admin.display(description="SQL")
+    def sql_eleje(self, obj):
+        return obj.sql[:120]
+
+    def has_add_permission(self, request):
+        return False
 
+    def has_change_permission(self, request, obj=None):
+        return False
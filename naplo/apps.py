@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class NaploConfig(AppConfig):
     name = 'naplo'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (receiver-ek regisztrálása)
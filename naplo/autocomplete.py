@@ -0,0 +1,123 @@
+"""
+Tevékenység-javaslatok (autocomplete) folyamaton belüli prefix indexszel.
+
+Rendezett kulcslista + bisect: a prefixhez tartozó szakasz O(log n) alatt
+megvan, a pontozás (gyakoriság × frissesség) a teljes szakaszon fut, a legjobb
+`limit` darab korlátos kupaccal (heapq.nlargest) jön ki – nincs ábécé szerinti
+levágás, egy rövid prefixnél a sokadik kulcs is nyerhet.
+Az index lustán épül az első kérésnél (egy GROUP BY), utána a NaploSor
+mentés / törlés inkrementálisan frissíti (signals.py).
+
+Több worker-folyamat esetén mindegyik saját indexet tart; a másik folyamatban
+mentett sor ott csak újraindítás / `ervenytelenit()` után jelenik meg.
+"""
+import heapq
+import threading
+from bisect import bisect_left, insort
+from datetime import date
+
+from django.db.models import Count, Max
+
+from .kereses import PREFIX_VEG, normalizal
+from .models import NaploSor
+
+
+def kulcs(szoveg):
+    # ékezet- és kisbetű-független: "ebed" is megtalálja az "Ebéd"-et
+    return normalizal(szoveg)
+
+
+class TevekenysegIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._kesz = False
+        self._adat = {}       # szöveg -> [db, utolsó dátum]
+        self._rendezett = []  # (kulcs, szöveg), kulcs szerint rendezve
+
+    def _epit(self):
+        rows = (
+            NaploSor.objects
+            .exclude(tevekenyseg="")
+            .values_list("tevekenyseg")
+            .annotate(db=Count("id"), utolso=Max("datum"))
+            .order_by()
+        )
+        adat = {}
+        for szoveg, db, utolso in rows:
+            szoveg = szoveg.strip()
+            if not szoveg:
+                continue
+            e = adat.setdefault(szoveg, [0, utolso])
+            e[0] += db
+            if utolso and (e[1] is None or utolso > e[1]):
+                e[1] = utolso
+        self._adat = adat
+        self._rendezett = sorted((kulcs(s), s) for s in adat)
+        self._kesz = True
+
+    def _biztosit(self):
+        if not self._kesz:
+            with self._lock:
+                if not self._kesz:
+                    self._epit()
+
+    def ervenytelenit(self):
+        with self._lock:
+            self._kesz = False
+            self._adat = {}
+            self._rendezett = []
+
+    def hozzaad(self, szoveg, datum):
+        szoveg = (szoveg or "").strip()
+        if not szoveg or not self._kesz:
+            return  # még nem épült fel: az első kérés úgyis a DB-ből tölt
+        with self._lock:
+            e = self._adat.get(szoveg)
+            if e is None:
+                self._adat[szoveg] = [1, datum]
+                insort(self._rendezett, (kulcs(szoveg), szoveg))
+                return
+            e[0] += 1
+            if datum and (e[1] is None or datum > e[1]):
+                e[1] = datum
+
+    def levon(self, szoveg):
+        szoveg = (szoveg or "").strip()
+        if not szoveg or not self._kesz:
+            return
+        with self._lock:
+            e = self._adat.get(szoveg)
+            if e is None:
+                return
+            e[0] -= 1
+            if e[0] <= 0:
+                del self._adat[szoveg]
+                k = (kulcs(szoveg), szoveg)
+                i = bisect_left(self._rendezett, k)
+                if i < len(self._rendezett) and self._rendezett[i] == k:
+                    del self._rendezett[i]
+            # az utolsó dátum itt nem csökken – a pontozásban ez elhanyagolható
+
+    def javasol(self, prefix, limit=10, ma=None):
+        self._biztosit()
+        p = kulcs(prefix)
+        if not p:
+            return []
+        ma = ma or date.today()
+
+        with self._lock:
+            rendezett = self._rendezett
+            # a prefix teljes szakasza: p <= kulcs < p + U+10FFFF
+            eleje = bisect_left(rendezett, (p, ""))
+            vege = bisect_left(rendezett, (p + PREFIX_VEG, ""), eleje)
+            jeloltek = [(szoveg, *self._adat[szoveg]) for _, szoveg in rendezett[eleje:vege]]
+
+        def pont(j):
+            _, db, utolso = j
+            napja = (ma - utolso).days if utolso else 3650
+            return db / (1.0 + max(0, napja) / 30.0)
+
+        return heapq.nlargest(limit, jeloltek, key=pont)
+
+
+tevekenyseg_index = TevekenysegIndex()
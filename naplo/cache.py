@@ -0,0 +1,64 @@
+"""
+Tartomány-cache a számolós API-khoz (hőtérkép, összehasonlítás, ...).
+
+A kulcsban benne van egy globális adatverzió, amit minden NaploSor mentés /
+törlés megnövel (lásd signals.py), így a régi bejegyzések maguktól elévülnek.
+Az alap LocMemCache folyamatonként külön él; több worker esetén közös
+cache backend (pl. Redis, memcached) kell a settings-ben.
+"""
+from django.core.cache import cache
+
+
+VERZIO_KULCS = "naplo:adatverzio"
+ALAP_IDOTARTAM = 60 * 60 * 24
+
+
+def adat_verzio():
+    v = cache.get(VERZIO_KULCS)
+    if v is None:
+        cache.add(VERZIO_KULCS, 1, None)
+        v = cache.get(VERZIO_KULCS, 1)
+    return v
+
+
+def adat_valtozott():
+    """Minden tartomány-cache bejegyzés érvénytelenítése (verzióléptetés)."""
+    try:
+        cache.incr(VERZIO_KULCS)
+    except ValueError:
+        cache.add(VERZIO_KULCS, 1, None)
+
+
+def tartomany_cache(nev, kulcs_reszek, szamol, timeout=ALAP_IDOTARTAM):
+    """
+    nev: az API rövid neve (pl. 'hoterkep')
+    kulcs_reszek: a paraméterek (start, end, szűrők) – a kulcs része
+    szamol: argumentum nélküli függvény, cache miss esetén fut le
+    """
+    key = f"naplo:{nev}:v{adat_verzio()}:" + ":".join(str(p) for p in kulcs_reszek)
+    value = cache.get(key)
+    if value is None:
+        value = szamol()
+        cache.set(key, value, timeout)
+    return value
+
+
+def nap_cache_kulcs(datum):
+    return f"naplo:nap:{datum.isoformat()}"
+
+
+def nap_cache(datum, szamol, timeout=ALAP_IDOTARTAM):
+    """
+    Egy nap adatai (napi összkép). Nem a globális verzióhoz kötött: csak az
+    adott nap változása érvényteleníti (nap_cache_torles, signals.py).
+    """
+    key = nap_cache_kulcs(datum)
+    value = cache.get(key)
+    if value is None:
+        value = szamol()
+        cache.set(key, value, timeout)
+    return value
+
+
+def nap_cache_torles(*datumok):
+    cache.delete_many([nap_cache_kulcs(d) for d in datumok if d])
@@ -0,0 +1,73 @@
+"""
+Cél-összesítő (CelOsszesito) karbantartása.
+
+Mentéskor / törléskor csak az érintett cél sora változik, F() kifejezésekkel
+(nincs GROUP BY a teljes naplón). Az első/utolsó dátumot csak akkor kell
+újraszámolni, ha épp a szélső sor tűnik el – ez a (kapcsolodo_cel, datum)
+indexen egy célra szűkített MIN/MAX.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .models import CelOsszesito, NaploSor
+
+
+def cel_hozzaad(cel, ido, datum):
+    if not (cel or "").strip() or ido is None:
+        return
+    frissitve = CelOsszesito.objects.filter(cel=cel).update(
+        osszes_ido=F("osszes_ido") + ido,
+        sorok=F("sorok") + 1,
+        elso_datum=Least(Coalesce("elso_datum", Value(datum)), Value(datum)),
+        utolso_datum=Greatest(Coalesce("utolso_datum", Value(datum)), Value(datum)),
+    )
+    if frissitve:
+        return
+    try:
+        with transaction.atomic():
+            CelOsszesito.objects.create(cel=cel, osszes_ido=ido, sorok=1, elso_datum=datum, utolso_datum=datum)
+    except IntegrityError:
+        # párhuzamos létrehozás: a másik nyert, mi csak hozzáadunk
+        cel_hozzaad(cel, ido, datum)
+
+
+def cel_levon(cel, ido, datum):
+    if not (cel or "").strip() or ido is None:
+        return
+    CelOsszesito.objects.filter(cel=cel).update(
+        osszes_ido=F("osszes_ido") - ido,
+        sorok=F("sorok") - 1,
+    )
+    obj = CelOsszesito.objects.filter(cel=cel).first()
+    if obj is None:
+        return
+    if obj.sorok <= 0:
+        obj.delete()
+    elif datum in (obj.elso_datum, obj.utolso_datum):
+        cel_datumok_ujraszamolasa(cel)
+
+
+def cel_datumok_ujraszamolasa(cel):
+    agg = NaploSor.objects.filter(kapcsolodo_cel=cel).aggregate(elso=Min("datum"), utolso=Max("datum"))
+    CelOsszesito.objects.filter(cel=cel).update(elso_datum=agg["elso"], utolso_datum=agg["utolso"])
+
+
+def cel_osszesito_ujraepites():
+    """Teljes újraépítés (parancs / első feltöltés). -> létrehozott sorok száma"""
+    rows = (
+        NaploSor.objects
+        .exclude(kapcsolodo_cel="")
+        .values("kapcsolodo_cel")
+        .annotate(osszes=Sum("ido"), db=Count("id"), elso=Min("datum"), utolso=Max("datum"))
+        .order_by()
+    )
+    objs = [
+        CelOsszesito(cel=r["kapcsolodo_cel"], osszes_ido=r["osszes"], sorok=r["db"],
+                     elso_datum=r["elso"], utolso_datum=r["utolso"])
+        for r in rows
+    ]
+    with transaction.atomic():
+        CelOsszesito.objects.all().delete()
+        CelOsszesito.objects.bulk_create(objs, batch_size=500)
+    return len(objs)
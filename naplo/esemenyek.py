@@ -0,0 +1,64 @@
+"""
+Folyamaton belüli eseményszóró a server-sent events végponthoz (api_esemenyek).
+
+A NaploSor mentés / törlés (signals.py) a tranzakció lezárása után "ezek a
+napok változtak" üzenetet küld; minden nyitott stream saját asyncio sorban
+kapja meg. A jelzések szinkron szálból jönnek, ezért a sorba írás az adott
+stream event loopján át történik (call_soon_threadsafe).
+
+Csak egy folyamaton belül működik: több worker esetén a másik folyamatban
+mentett változásról nem tud (ahhoz közös csatorna kellene, pl. Redis pub/sub).
+"""
+import asyncio
+import threading
+
+
+SOR_MERET = 100   # ha egy lassú kliens ennyi üzenettel le van maradva, "minden" jelzést kap
+
+
+class Kozvetito:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._feliratkozok = set()   # (loop, asyncio.Queue)
+
+    def feliratkozas(self):
+        elem = (asyncio.get_running_loop(), asyncio.Queue(maxsize=SOR_MERET))
+        with self._lock:
+            self._feliratkozok.add(elem)
+        return elem
+
+    def leiratkozas(self, elem):
+        with self._lock:
+            self._feliratkozok.discard(elem)
+
+    def feliratkozok_szama(self):
+        with self._lock:
+            return len(self._feliratkozok)
+
+    def kuld(self, uzenet):
+        with self._lock:
+            cimzettek = list(self._feliratkozok)
+        for loop, sor in cimzettek:
+            try:
+                loop.call_soon_threadsafe(_betesz, sor, uzenet)
+            except RuntimeError:
+                # a stream loopja már leállt (leiratkozás még nem futott le)
+                self.leiratkozas((loop, sor))
+
+
+def _betesz(sor, uzenet):
+    if sor.full():
+        # túl lassú kliens: a részletek helyett egy teljes frissítés-jelzés
+        while not sor.empty():
+            sor.get_nowait()
+        uzenet = {"minden": True}
+    sor.put_nowait(uzenet)
+
+
+kozvetito = Kozvetito()
+
+
+def napok_valtoztak(*datumok):
+    napok = sorted({d.isoformat() for d in datumok if d})
+    if napok and kozvetito.feliratkozok_szama():
+        kozvetito.kuld({"napok": napok})
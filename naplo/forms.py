@@ -1,4 +1,3 @@
-from tinymce.widgets import TinyMCE
 from django import forms
 from datetime import datetime, timedelta
 from .models import NaploSor, Param
@@ -81,3 +80,21 @@ class NaploSorForm(forms.ModelForm):
 
 
     
+
+
+class NaploSorAdatForm(NaploSorForm):
+    """
+    JSON API-khoz: ugyanazok a mezők és clean() szabályok, de a választólisták
+    (5 Param lekérdezés) nélkül – azok csak a HTML widgethez kellenek.
+    """
+
+    def __init__(self, *args, **kwargs):
+        forms.ModelForm.__init__(self, *args, **kwargs)
+
+    def clean(self):
+        cleaned = super().clean()
+        # az ido NOT NULL: a HTML formnál a JS tölti a kezdet/vég mezőket, itt kötelező
+        idohiba = any(self.has_error(f) for f in ("datum", "kezdet", "veg"))
+        if cleaned.get("ido") is None and self.instance.ido is None and not idohiba:
+            self.add_error(None, "Kell dátum, kezdet és vég (az időtartam ebből számolódik).")
+        return cleaned
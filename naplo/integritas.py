@@ -0,0 +1,63 @@
+"""
+Idővonal-integritás: a sweep (timeline.idovonal_sweep) futtatása az adatbázison
+és az eredmény mentése az IdovonalEllenorzes táblába.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+
+from .models import IdovonalEllenorzes, NaploSor
+from .timeline import idovonal_sweep, nap_osszesites, sor_intervallum
+
+
+def _elozo_sor_vege(datum):
+    """A `datum` előtti utolsó sor (id, end) párja – indexelt szomszéd-lookup."""
+    row = (
+        NaploSor.objects
+        .filter(datum__lt=datum, kezdet__isnull=False)
+        .order_by("-datum", "-kezdet", "-id")
+        .values_list("id", "datum", "kezdet", "ido")
+        .first()
+    )
+    if not row:
+        return None
+    iv = sor_intervallum(*row[1:])
+    return row[0], iv[1]
+
+
+def idovonal_ellenorzes(start_d=None, end_d=None):
+    """Sweep a [start_d, end_d] tartományon (None = nyitott vég). -> {datum: nap}"""
+    qs = NaploSor.objects.all()
+    if start_d:
+        qs = qs.filter(datum__gte=start_d)
+    if end_d:
+        qs = qs.filter(datum__lte=end_d)
+
+    rows = qs.order_by("datum", "kezdet", "id").values_list("id", "datum", "kezdet", "ido")
+    elozo = _elozo_sor_vege(start_d) if start_d else None
+    return idovonal_sweep(rows.iterator(chunk_size=2000), elozo=elozo)
+
+
+def idovonal_mentes(napok, start_d=None, end_d=None):
+    """A sweep eredményének mentése; a tartomány korábbi sorai törlődnek."""
+    qs = IdovonalEllenorzes.objects.all()
+    if start_d:
+        qs = qs.filter(datum__gte=start_d)
+    if end_d:
+        qs = qs.filter(datum__lte=end_d)
+
+    with transaction.atomic():
+        qs.delete()
+        IdovonalEllenorzes.objects.bulk_create(
+            [IdovonalEllenorzes(datum=d, **nap_osszesites(nap)) for d, nap in napok.items()],
+            batch_size=500,
+        )
+
+
+def nap_frissites(datum):
+    """
+    Mentés / törlés után: a nap és a következő nap újraellenőrzése (a következő
+    nap első sora a módosított sorhoz képest lehet hézagos vagy átfedő).
+    """
+    start_d, end_d = datum, datum + timedelta(days=1)
+    idovonal_mentes(idovonal_ellenorzes(start_d, end_d), start_d, end_d)
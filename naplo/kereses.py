@@ -0,0 +1,209 @@
+"""
+Keresés-segédek: ékezet- és kisbetű-független normalizálás, a NaploSor
+árnyék (shadow) mezőinek kitöltése és az indexelhető prefix-szűrő.
+
+A modul szándékosan nem importálja a modelleket (a models.py használja).
+"""
+import html
+import re
+import unicodedata
+from datetime import timedelta
+
+from django.db.models import F, Q, TextField, Value
+from django.db.models.functions import Concat, StrIndex, Substr
+from django.utils.dateparse import parse_date
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+
+# forrásmező -> normalizált árnyékmező (indexelt, prefix-kereséshez)
+NORM_MEZOK = {
+    "kategoria": "kategoria_norm",
+    "kapcsolodo": "kapcsolodo_norm",
+    "szerep": "szerep_norm",
+    "erzelem": "erzelem_norm",
+    "kapcsolodo_cel": "kapcsolodo_cel_norm",
+}
+
+# a teljes szöveges kereső ('kereso' mező) ezekből áll össze – a megjegyzésből
+# a sima szöveges változat, hogy a TinyMCE markup (pl. "strong", "nbsp") ne találjon
+KERESO_MEZOK = ("tevekenyseg", "megjegyzes_szoveg", *NORM_MEZOK)
+
+# listás végpontokban a megjegyzés helyett ennyi karakteres kivonat megy
+KIVONAT_HOSSZ = 200
+
+# mentéskor (update_fields esetén is) mindig írandó árnyékmezők
+ARNYEK_MEZOK = ("kereso", "megjegyzes_szoveg", "megjegyzes_kivonat", *NORM_MEZOK.values())
+
+PREFIX_VEG = "\U0010ffff"
+
+
+def normalizal(szoveg):
+    """'Érzelem  Öröm' -> 'erzelem orom' (NFKD, ékezet le, casefold, szóközök össze)."""
+    if not szoveg:
+        return ""
+    s = unicodedata.normalize("NFKD", str(szoveg))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return " ".join(s.casefold().split())
+
+
+def html_szoveg(tartalom):
+    """TinyMCE HTML -> sima szöveg: tagek le, entitások feloldva, szóközök össze."""
+    if not tartalom:
+        return ""
+    # blokkelemek határán szóköz kell, különben "<p>a</p><p>b</p>" -> "ab"
+    tartalom = re.sub(r"<(br|/p|/div|/li|/h\d)\b[^>]*>", " ", str(tartalom), flags=re.I)
+    return " ".join(html.unescape(strip_tags(tartalom)).split())
+
+
+def kivonat(szoveg, hossz=KIVONAT_HOSSZ):
+    """Legfeljebb `hossz` karakteres kivonat (a végén "…", ha csonka)."""
+    return Truncator(szoveg or "").chars(hossz, truncate="…")
+
+
+def arnyek_mezok_kitoltese(obj):
+    """A NaploSor árnyékmezőinek (megjegyzés szöveg/kivonat, kereso, *_norm) frissítése."""
+    obj.megjegyzes_szoveg = html_szoveg(obj.megjegyzes)
+    obj.megjegyzes_kivonat = kivonat(obj.megjegyzes_szoveg)
+    for forras, cel in NORM_MEZOK.items():
+        setattr(obj, cel, normalizal(getattr(obj, forras, "")))
+    obj.kereso = "\n".join(normalizal(getattr(obj, m, "")) for m in KERESO_MEZOK)
+
+
+def kereso_kifejezes(**uj_normok):
+    """
+    SQL kifejezés a 'kereso' újraépítésére update()-hez, ha csak *_norm mező változott
+    (pl. admin tömeges átkategorizálás): az első sorok (tevékenység, megjegyzés) a
+    régi kereso-ból maradnak, a többi a *_norm oszlopokból áll össze.
+    A normalizal() a sortörést szóközzé teszi, így a sorok száma mindig fix.
+
+    Az ugyanabban az UPDATE-ben beállított *_norm értékeket át kell adni
+    (kereso_kifejezes(kategoria_norm="...")): a SET jobb oldala a régi sort látja.
+    """
+    elo = len(KERESO_MEZOK) - len(NORM_MEZOK)
+    vege = StrIndex("kereso", Value("\n"))
+    for _ in range(elo - 1):
+        vege = vege + StrIndex(Substr("kereso", vege + 1), Value("\n"))
+    reszek = [Substr("kereso", 1, vege)]
+    for i, mezo in enumerate(NORM_MEZOK.values()):
+        if i:
+            reszek.append(Value("\n"))
+        reszek.append(Value(uj_normok[mezo]) if mezo in uj_normok else F(mezo))
+    return Concat(*reszek, output_field=TextField())
+
+
+def prefix_q(mezo, prefix):
+    """
+    Indexet használó prefix-szűrő: mezo >= p AND mezo < p + U+10FFFF.
+    (SQLite-on a LIKE 'p%' csak NOCASE indexszel gyorsul, a tartomány igen.)
+    """
+    return Q(**{f"{mezo}__gte": prefix, f"{mezo}__lt": prefix + PREFIX_VEG})
+
+
+# ---- Mezős lekérdezőnyelv a dashboardhoz ----
+#   kategoria:Munka erzelem:öröm ertek>=7 ido>60 nap:hétfő datum>=2025-12-01 szabad szöveg
+# A mezős részekből célzott (indexelhető) Q szűrők lesznek, csak a maradék
+# szabad szöveg megy a 'kereso' árnyékmezőre.
+
+LEKERDEZES_TOKEN = re.compile(r'(?P<mezo>\w+)(?P<op>>=|<=|:|=|>|<)(?:"(?P<idezett>[^"]*)"|(?P<ertek>\S+))')
+SZABAD_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+# lekérdezésben használható nevek -> forrásmező (prefix-keresés a *_norm mezőn)
+SZOVEGES_MEZOK = {
+    "kategoria": "kategoria",
+    "kat": "kategoria",
+    "kapcsolodo": "kapcsolodo",
+    "szerep": "szerep",
+    "erzelem": "erzelem",
+    "cel": "kapcsolodo_cel",
+}
+
+SZAM_OPERATOROK = {":": "exact", "=": "exact", ">": "gt", ">=": "gte", "<": "lt", "<=": "lte"}
+
+# Django week_day: 1 = vasárnap ... 7 = szombat
+NAPOK_WEEK_DAY = {
+    "hetfo": 2, "h": 2,
+    "kedd": 3, "k": 3,
+    "szerda": 4, "sze": 4,
+    "csutortok": 5, "cs": 5,
+    "pentek": 6, "p": 6,
+    "szombat": 7, "szo": 7,
+    "vasarnap": 1, "v": 1,
+}
+
+
+def lekerdezes_forditas(q):
+    """
+    Mezős keresőkifejezés -> (Q szűrő, szabad szöveg, hibák listája).
+
+    A fel nem ismert `valami:...` tokenek (pl. URL) szabad szövegként maradnak.
+    """
+    szuro = Q()
+    hibak = []
+    maradek = []
+    pos = 0
+
+    for m in LEKERDEZES_TOKEN.finditer(q or ""):
+        if m.start() > 0 and not q[m.start() - 1].isspace():
+            continue  # szó belsejében (pl. "http://x") nem mező
+        mezo = normalizal(m.group("mezo"))
+        op = m.group("op")
+        ertek = m.group("idezett") if m.group("idezett") is not None else m.group("ertek")
+
+        resz = _mezo_szuro(mezo, op, ertek)
+        if resz is None:
+            continue  # ismeretlen mező: szabad szöveg marad
+        maradek.append(q[pos:m.start()])
+        pos = m.end()
+        if isinstance(resz, str):
+            hibak.append(resz)
+        else:
+            szuro &= resz
+    maradek.append((q or "")[pos:])
+
+    szabad = " ".join(
+        (idezett if idezett else sima)
+        for idezett, sima in SZABAD_TOKEN.findall(" ".join(maradek))
+    ).strip()
+    return szuro, szabad, hibak
+
+
+def _mezo_szuro(mezo, op, ertek):
+    """Egy mezős token -> Q; hibás érték esetén hibaüzenet (str); ismeretlen mezőre None."""
+    if mezo in SZOVEGES_MEZOK:
+        if op not in (":", "="):
+            return f"{mezo}: csak ':' vagy '=' használható"
+        forras = SZOVEGES_MEZOK[mezo]
+        norm = normalizal(ertek)
+        if not norm:
+            return Q(**{forras: ""})
+        norm_mezo = NORM_MEZOK[forras]
+        return Q(**{norm_mezo: norm}) if op == "=" else prefix_q(norm_mezo, norm)
+
+    if mezo == "ertek":
+        try:
+            szam = int(ertek)
+        except ValueError:
+            return f"ertek: nem szám ({ertek})"
+        return Q(**{f"ertek__{SZAM_OPERATOROK[op]}": szam})
+
+    if mezo == "ido":
+        try:
+            perc = int(ertek)
+        except ValueError:
+            return f"ido: nem szám ({ertek}) – percben add meg"
+        return Q(**{f"ido__{SZAM_OPERATOROK[op]}": timedelta(minutes=perc)})
+
+    if mezo == "nap":
+        nap = NAPOK_WEEK_DAY.get(normalizal(ertek))
+        if nap is None or op not in (":", "="):
+            return f"nap: ismeretlen nap ({ertek})"
+        return Q(datum__week_day=nap)
+
+    if mezo == "datum":
+        d = parse_date(ertek)
+        if d is None:
+            return f"datum: hibás dátum ({ertek}) – YYYY-MM-DD"
+        return Q(**{f"datum__{SZAM_OPERATOROK[op]}": d})
+
+    return None
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from naplo.szintetikus import general_naplo_sorok
+from naplo.timeline import hoterkep_racs
+
+
+def general_sorok(evek, sor_per_nap, seed=1):
+    """
+    (kategoria, datum, kezdet, ido) sorok memóriában, ugyanabból a generátorból,
+    amivel a szintetikus_feltoltes a többi mérés adatbázisát tölti (éjfélt átlépő
+    alvás, hézagok, párhuzamos sorok) – a hőtérkép így ugyanazon az adaton mér.
+    """
+    return [
+        (s.kategoria, s.datum, s.kezdet, s.ido)
+        for s in general_naplo_sorok(evek, sor_per_nap, seed=seed)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Hőtérkép (hét napja × óra) számítás benchmark szintetikus adaton (DB nélkül)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--evek", type=int, default=5)
+        parser.add_argument("--sor-per-nap", type=int, default=15)
+        parser.add_argument("--ismetles", type=int, default=3)
+
+    def handle(self, *args, **options):
+        sorok = general_sorok(options["evek"], options["sor_per_nap"])
+        bemeneti_sec = sum(s[3].total_seconds() for s in sorok)
+
+        idok = []
+        for _ in range(options["ismetles"]):
+            t0 = time.perf_counter()
+            racsok = hoterkep_racs(iter(sorok))
+            idok.append(time.perf_counter() - t0)
+
+        racs_sec = sum(sec for racs in racsok.values() for nap in racs for sec in nap)
+        legjobb = min(idok)
+
+        self.stdout.write(f"Sorok: {len(sorok)} ({options['evek']} év, {options['sor_per_nap']} sor/nap)")
+        self.stdout.write(f"Legjobb idő: {legjobb * 1000:.1f} ms | {len(sorok) / legjobb:,.0f} sor/s")
+        self.stdout.write(f"Percek: bemenet {bemeneti_sec / 60:,.0f} | rács {racs_sec / 60:,.0f}")
+        if abs(racs_sec - bemeneti_sec) > 1:
+            self.stderr.write(self.style.ERROR("Eltérés a bemenet és a rács összege között!"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Kész. A rács összege egyezik a bemenettel."))
@@ -0,0 +1,148 @@
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import date
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from naplo.models import NaploSor
+from naplo.szintetikus import meresi_vegpontok, szintetikus_feltoltes, szintetikus_torles
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Minden nézet és API időzítése a test clienttel, több adatméreten (szintetikus "
+        "adat külön teszt adatbázisban). Eredmény: JSON fájl, commitok közti összevetéshez."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--evek", default="1,3", help="adatméretek években, vesszővel (alap: 1,3)")
+        parser.add_argument("--sor-per-nap", type=int, default=15)
+        parser.add_argument("--ismetles", type=int, default=5)
+        parser.add_argument("--meleg", action="store_true", help="cache-t nem üríti kérések között")
+        parser.add_argument("--kimenet", default="bench_nezetek.json")
+        parser.add_argument("--db-fajl", default="", help="teszt adatbázis fájl (alap: memóriában)")
+        parser.add_argument(
+            "--vegpont", action="append", default=[], metavar="URL_NEV",
+            help="csak ezek a végpontok (ismételhető, pl. --vegpont dashboard)",
+        )
+        parser.add_argument(
+            "--q", action="append", default=[],
+            help="dashboard keresőkifejezés (ismételhető); megadva ezek mérődnek az alapok helyett",
+        )
+        parser.add_argument(
+            "--memoria", action="store_true",
+            help="kérésenkénti memóriacsúcs (tracemalloc) egy külön, nem időzített kéréssel",
+        )
+
+    def handle(self, *args, **opts):
+        meretek = [int(x) for x in opts["evek"].split(",") if x.strip()]
+
+        if opts["db_fajl"]:
+            connection.settings_dict["TEST"]["NAME"] = opts["db_fajl"]
+        regi_nev = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+        try:
+            with override_settings(ALLOWED_HOSTS=["testserver"]):
+                eredmenyek = []
+                for evek in meretek:
+                    eredmenyek += self._meret(evek, opts)
+        finally:
+            connection.creation.destroy_test_db(regi_nev, verbosity=0)
+
+        kimenet = {
+            "commit": _git_commit(),
+            "idopont": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "adatbazis": connection.vendor,
+            "ismetles": opts["ismetles"],
+            "meleg_cache": opts["meleg"],
+            "memoria": opts["memoria"],
+            "vegpont_szuro": opts["vegpont"],
+            "eredmenyek": eredmenyek,
+        }
+        with open(opts["kimenet"], "w", encoding="utf-8") as f:
+            json.dump(kimenet, f, ensure_ascii=False, indent=1)
+        self.stdout.write(self.style.SUCCESS(f"Kész. Eredmény: {opts['kimenet']}"))
+
+    def _vegpontok(self, ma, opts):
+        vegpontok = meresi_vegpontok(ma)
+        if opts["q"]:
+            dashboard = next(url for nev, url, _ in vegpontok if nev == "dashboard")
+            vegpontok = [v for v in vegpontok if v[0] != "dashboard"]
+            vegpontok += [("dashboard", dashboard, {"q": q}) for q in opts["q"]]
+        if opts["vegpont"]:
+            vegpontok = [v for v in vegpontok if v[0] in opts["vegpont"]]
+        return vegpontok
+
+    def _meret(self, evek, opts):
+        szintetikus_torles()
+        t0 = time.perf_counter()
+        sorok = szintetikus_feltoltes(evek, opts["sor_per_nap"])
+        self.stdout.write(f"\n== {evek} év: {sorok} sor (generálás {time.perf_counter() - t0:.1f} s) ==")
+
+        client = Client()
+        ma = NaploSor.objects.order_by("-datum").values_list("datum", flat=True).first() or date.today()
+        out = []
+        for nev, url, params in self._vegpontok(ma, opts):
+            idok = []
+            lekerdezes = meret = statusz = None
+            for _ in range(opts["ismetles"]):
+                if not opts["meleg"]:
+                    cache.clear()
+                with CaptureQueriesContext(connection) as ctx:
+                    t0 = time.perf_counter()
+                    resp = client.get(url, params)
+                    idok.append((time.perf_counter() - t0) * 1000)
+                lekerdezes, statusz, meret = len(ctx.captured_queries), resp.status_code, len(resp.content)
+
+            memoria_kb = None
+            if opts["memoria"]:
+                # külön kérés: a tracemalloc lassít, az időzítést nem torzíthatja
+                if not opts["meleg"]:
+                    cache.clear()
+                tracemalloc.start()
+                client.get(url, params)
+                memoria_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+                tracemalloc.stop()
+
+            idok.sort()
+            sor = {
+                "evek": evek,
+                "sorok": sorok,
+                "vegpont": nev,
+                "params": params,
+                "statusz": statusz,
+                "lekerdezes": lekerdezes,
+                "meret_bajt": meret,
+                "median_ms": round(idok[len(idok) // 2], 2),
+                "min_ms": round(idok[0], 2),
+                "max_ms": round(idok[-1], 2),
+                "memoria_csucs_kb": memoria_kb,
+            }
+            out.append(sor)
+            cimke = f"{nev} q={params['q']!r}" if "q" in params else nev
+            self.stdout.write(
+                f"{cimke[:38]:38} {statusz} | lekérdezés: {lekerdezes:>3} | {meret / 1024:8.1f} KB | "
+                f"medián: {sor['median_ms']:8.1f} ms | legjobb: {sor['min_ms']:8.1f} ms"
+                + (f" | mem: {memoria_kb:8.1f} KB" if memoria_kb is not None else "")
+            )
+        return out
@@ -0,0 +1,215 @@
+import json
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, Request, build_opener
+
+from django.core.management.base import BaseCommand
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.signals import got_request_exception
+from django.core.wsgi import get_wsgi_application
+from django.db import OperationalError, connection
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from naplo.models import NaploSor
+from naplo.szintetikus import meresi_vegpontok, szintetikus_feltoltes
+
+
+class _CsendesHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class _NincsAtiranyitas(HTTPRedirectHandler):
+    # a sikeres mentés 302 – nem követjük, az már új kérés lenne
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class _ZarHibaSzamlalo:
+    """got_request_exception: a szerver oldali 'database is locked' hibák száma."""
+
+    def __init__(self):
+        self.db = 0
+        self.egyeb = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, sender, request=None, **kwargs):
+        exc = sys.exc_info()[1]
+        with self._lock:
+            if isinstance(exc, OperationalError) and "locked" in str(exc):
+                self.db += 1
+            else:
+                self.egyeb[type(exc).__name__] += 1
+
+
+def _szazalekok(idok):
+    if len(idok) < 2:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    q = statistics.quantiles(idok, n=100, method="inclusive")
+    return {"p50_ms": round(q[49], 1), "p95_ms": round(q[94], 1), "p99_ms": round(q[98], 1)}
+
+
+class Command(BaseCommand):
+    help = (
+        "Terheléses teszt: helyben indított többszálú WSGI szerver (saját, ideiglenes SQLite "
+        "teszt adatbázissal) ellen párhuzamos kliensek – API olvasás és naplo_bevitel POST "
+        "állítható arányban. Áteresztőképesség, késleltetés-percentilisek, SQLite zár-hibák."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kliensek", type=int, default=8, help="párhuzamos kliens szálak")
+        parser.add_argument("--mp", type=float, default=20, help="futási idő másodpercben")
+        parser.add_argument("--iras-arany", type=float, default=0.1, help="írások aránya (0–1)")
+        parser.add_argument("--evek", type=int, default=1, help="szintetikus adat mérete")
+        parser.add_argument("--sor-per-nap", type=int, default=15)
+        parser.add_argument("--kimenet", default="", help="eredmény JSON fájlba is")
+
+    def handle(self, *args, **opts):
+        # fájl alapú teszt DB: memóriában nem lennének valódi zár-ütközések
+        db_fajl = tempfile.NamedTemporaryFile(prefix="naplo_terheles_", suffix=".sqlite3", delete=False).name
+        connection.settings_dict["TEST"]["NAME"] = db_fajl
+        regi_nev = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+
+        zar = _ZarHibaSzamlalo()
+        got_request_exception.connect(zar)
+        kerelog = logging.getLogger("django.request")
+        regi_szint = kerelog.level
+        kerelog.setLevel(logging.CRITICAL)  # az 500-as tracebackek ne árasszák el a kimenetet
+        try:
+            with override_settings(DEBUG=False, ALLOWED_HOSTS=["127.0.0.1", "localhost"]):
+                sorok = szintetikus_feltoltes(opts["evek"], opts["sor_per_nap"])
+                self.stdout.write(f"Teszt adatbázis: {db_fajl} | {sorok} sor")
+                eredmeny = self._futtat(opts, zar)
+        finally:
+            kerelog.setLevel(regi_szint)
+            got_request_exception.disconnect(zar)
+            connection.creation.destroy_test_db(regi_nev, verbosity=0)
+
+        eredmeny["sorok"] = sorok
+        self._kiir(eredmeny)
+        if opts["kimenet"]:
+            with open(opts["kimenet"], "w", encoding="utf-8") as f:
+                json.dump(eredmeny, f, ensure_ascii=False, indent=1)
+        self.stdout.write(self.style.SUCCESS("Kész."))
+
+    def _futtat(self, opts, zar):
+        httpd = ThreadedWSGIServer(("127.0.0.1", 0), _CsendesHandler, allow_reuse_address=False)
+        httpd.set_app(get_wsgi_application())
+        szal = threading.Thread(target=httpd.serve_forever, daemon=True)
+        szal.start()
+        alap = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+        ma = NaploSor.objects.order_by("-datum").values_list("datum", flat=True).first() or date.today()
+        olvasasok = [
+            f"{alap}{url}?{urlencode(params)}"
+            for nev, url, params in meresi_vegpontok(ma) if nev.startswith("api_")
+        ]
+        bevitel = alap + reverse("naplo_bevitel")
+        connection.close()  # a szerver szálak saját kapcsolatot nyitnak
+
+        meresek = []   # (tipus, ms, statusz)
+        meres_lock = threading.Lock()
+        hatarido = time.perf_counter() + opts["mp"]
+
+        def kliens(seed):
+            rnd = random.Random(seed)
+            jar = CookieJar()
+            opener = build_opener(HTTPCookieProcessor(jar), _NincsAtiranyitas)
+            opener.open(bevitel, timeout=30).read()   # csrftoken süti
+            csrf = next((c.value for c in jar if c.name == "csrftoken"), "")
+
+            sajat = []
+            while time.perf_counter() < hatarido:
+                if rnd.random() < opts["iras_arany"]:
+                    tipus = "iras"
+                    nap = ma - timedelta(days=rnd.randint(0, 30))
+                    perc = rnd.randint(0, 23 * 60)
+                    adat = urlencode({
+                        "datum": nap.isoformat(),
+                        "kezdet": f"{perc // 60:02d}:{perc % 60:02d}",
+                        "veg": f"{(perc + 30) // 60 % 24:02d}:{(perc + 30) % 60:02d}",
+                        "tevekenyseg": f"Terheléses teszt bejegyzés {rnd.randint(1, 10 ** 6)}",
+                        "ertek": rnd.randint(1, 10),
+                        "kategoria": "Munka",
+                        "eletkerek_focus": "MUNKA",
+                        "csrfmiddlewaretoken": csrf,
+                    }).encode()
+                    req = Request(bevitel, data=adat, headers={"X-CSRFToken": csrf, "Referer": bevitel})
+                else:
+                    tipus = "olvasas"
+                    req = Request(rnd.choice(olvasasok))
+
+                t0 = time.perf_counter()
+                try:
+                    with opener.open(req, timeout=60) as resp:
+                        resp.read()
+                        statusz = resp.status
+                except HTTPError as e:
+                    statusz = e.code
+                except (URLError, OSError) as e:
+                    statusz = f"hiba: {type(e).__name__}"
+                sajat.append((tipus, (time.perf_counter() - t0) * 1000, statusz))
+
+            with meres_lock:
+                meresek.extend(sajat)
+
+        t0 = time.perf_counter()
+        szalak = [threading.Thread(target=kliens, args=(i,)) for i in range(opts["kliensek"])]
+        for t in szalak:
+            t.start()
+        for t in szalak:
+            t.join()
+        fal = time.perf_counter() - t0
+
+        httpd.shutdown()
+        httpd.server_close()
+
+        tipusok = {}
+        for tipus in ("olvasas", "iras"):
+            sajat = [m for m in meresek if m[0] == tipus]
+            idok = [m[1] for m in sajat]
+            # sikeres írás: 302 (átirányítás mentés után)
+            ok = sum(1 for m in sajat if m[2] in (200, 302))
+            tipusok[tipus] = {
+                "keres": len(sajat),
+                "sikeres": ok,
+                "statuszok": dict(Counter(str(m[2]) for m in sajat)),
+                **_szazalekok(idok),
+                "max_ms": round(max(idok), 1) if idok else None,
+            }
+
+        return {
+            "kliensek": opts["kliensek"],
+            "mp": round(fal, 1),
+            "iras_arany": opts["iras_arany"],
+            "osszes_keres": len(meresek),
+            "keres_per_mp": round(len(meresek) / fal, 1) if fal else None,
+            "zar_hibak": zar.db,
+            "egyeb_szerverhibak": dict(zar.egyeb),
+            "tipusok": tipusok,
+        }
+
+    def _kiir(self, e):
+        self.stdout.write(
+            f"{e['kliensek']} kliens, {e['mp']} s | {e['osszes_keres']} kérés | "
+            f"{e['keres_per_mp']} kérés/s | SQLite zár-hiba: {e['zar_hibak']}"
+        )
+        for tipus, t in e["tipusok"].items():
+            self.stdout.write(
+                f"  {tipus:8} {t['keres']:>6} kérés ({t['sikeres']} sikeres) | "
+                f"p50 {t['p50_ms']} ms | p95 {t['p95_ms']} ms | p99 {t['p99_ms']} ms | max {t['max_ms']} ms | "
+                f"{t['statuszok']}"
+            )
+        if e["egyeb_szerverhibak"]:
+            self.stdout.write(self.style.WARNING(f"  egyéb szerverhibák: {e['egyeb_szerverhibak']}"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from naplo.celok import cel_osszesito_ujraepites
+
+
+class Command(BaseCommand):
+    help = "Cél-összesítő (CelOsszesito) teljes újraépítése a NaploSor sorokból."
+
+    def handle(self, *args, **options):
+        db = cel_osszesito_ujraepites()
+        self.stdout.write(self.style.SUCCESS(f"Kész. Célok: {db}"))
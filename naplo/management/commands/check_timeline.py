@@ -0,0 +1,54 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+
+from naplo.integritas import idovonal_ellenorzes, idovonal_mentes
+from naplo.timeline import nap_osszesites
+
+
+class Command(BaseCommand):
+    help = (
+        "Idővonal-ellenőrzés: hézagok, átfedések, 0 perces sorok napi bontásban "
+        "egyetlen (datum, kezdet) szerint rendezett bejárással. Az eredmény az "
+        "IdovonalEllenorzes táblába kerül (a napi összkép onnan olvas)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=str, default="", help="YYYY-MM-DD (opcionális)")
+        parser.add_argument("--end", type=str, default="", help="YYYY-MM-DD (opcionális)")
+        parser.add_argument("--json", action="store_true", help="JSON összesítő a kimenetre")
+        parser.add_argument("--nem-ment", action="store_true", help="csak jelentés, a tábla nem frissül")
+
+    def handle(self, *args, **opts):
+        start_d = parse_date(opts["start"]) if opts["start"] else None
+        end_d = parse_date(opts["end"]) if opts["end"] else None
+
+        napok = idovonal_ellenorzes(start_d, end_d)
+        if not opts["nem_ment"]:
+            idovonal_mentes(napok, start_d, end_d)
+
+        osszes = {"napok": len(napok), "hibas_napok": 0, "hezag_db": 0, "hezag_perc": 0,
+                  "atfedes_db": 0, "atfedes_perc": 0, "nulla_db": 0}
+        hibas = []
+        for d in sorted(napok):
+            o = nap_osszesites(napok[d])
+            for k in ("hezag_db", "hezag_perc", "atfedes_db", "atfedes_perc", "nulla_db"):
+                osszes[k] += o[k]
+            if o["hezag_db"] or o["atfedes_db"] or o["nulla_db"]:
+                osszes["hibas_napok"] += 1
+                hibas.append({"datum": d.isoformat(), **o})
+
+        if opts["json"]:
+            self.stdout.write(json.dumps({"osszesites": osszes, "napok": hibas}, ensure_ascii=False, indent=2))
+            return
+
+        for h in hibas:
+            self.stdout.write(
+                f"{h['datum']}: hézag {h['hezag_db']} ({h['hezag_perc']} perc) | "
+                f"átfedés {h['atfedes_db']} ({h['atfedes_perc']} perc) | 0 perc {h['nulla_db']}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Kész. Napok: {osszes['napok']} | Hibás napok: {osszes['hibas_napok']} | "
+            f"Hézag: {osszes['hezag_db']} | Átfedés: {osszes['atfedes_db']} | 0 perc: {osszes['nulla_db']}"
+        ))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from naplo.models import NaploSor
+from naplo.szintetikus import szintetikus_feltoltes, szintetikus_torles
+
+
+class Command(BaseCommand):
+    help = (
+        "Szintetikus napló-adat generálása (NaploSor + Param) méréshez. "
+        "FIGYELEM: a --torles a meglévő naplót is törli – csak teszt adatbázison!"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--evek", type=int, default=1)
+        parser.add_argument("--sor-per-nap", type=int, default=15)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--torles", action="store_true", help="meglévő adatok törlése előtte")
+
+    def handle(self, *args, **opts):
+        if NaploSor.objects.exists():
+            if not opts["torles"]:
+                raise CommandError("Az adatbázisban már van napló. Csak --torles kapcsolóval (minden sor törlődik!).")
+            szintetikus_torles()
+
+        t0 = time.perf_counter()
+        db = szintetikus_feltoltes(opts["evek"], opts["sor_per_nap"], seed=opts["seed"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Kész. Beszúrt sorok: {db} ({opts['evek']} év, {opts['sor_per_nap']} sor/nap) | "
+            f"{time.perf_counter() - t0:.1f} s"
+        ))
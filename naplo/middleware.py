@@ -0,0 +1,223 @@
+"""
+Opt-in mérő middleware-ek.
+
+ProfilozoMiddleware (settings.NAPLO_PROFILOZAS = True):
+
+Kérésenként: teljes idő, DB idő, lekérdezésszám, válaszméret – a feloldott
+URL név szerint egy korlátos, memóriabeli gyűrűpufferbe. A válasz
+`Server-Timing` fejlécet kap (böngésző DevTools > Network > Timing).
+A statisztika: /naplo/api/profil/ (csak admin / staff), ürítés: POST
+/naplo/api/profil/torles/.
+
+LassuLekerdezesMiddleware (settings.NAPLO_LASSU_LEKERDEZES_MS = küszöb):
+a küszöb feletti utasítások SQL-je, paraméterei, ideje és EXPLAIN QUERY PLAN
+kimenete a LassuLekerdezes táblába kerül (admin). A mentés a válasz után
+történik, így a kérés esetleges rollbackje nem viszi el a naplót.
+
+TomoritoMiddleware: gzip a HTML és JSON válaszokra, ha elérik a
+settings.NAPLO_TOMORITES_MIN_BAJT méretet (a kicsiknél nem éri meg).
+"""
+import json
+import math
+import re
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.middleware.gzip import GZipMiddleware
+
+from .models import LassuLekerdezes
+
+
+_puffer = deque(maxlen=getattr(settings, "NAPLO_PROFIL_MERET", 5000))
+_lock = threading.Lock()
+
+
+class _DbIdomero:
+    """connection.execute_wrapper: lekérdezésszám és összidő egy kérésre."""
+
+    def __init__(self):
+        self.db = 0
+        self.ido = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.ido += time.perf_counter() - t0
+            self.db += 1
+
+
+class ProfilozoMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "NAPLO_PROFILOZAS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        meres = _DbIdomero()
+        t0 = time.perf_counter()
+        with connection.execute_wrapper(meres):
+            response = self.get_response(request)
+        fal = time.perf_counter() - t0
+
+        match = getattr(request, "resolver_match", None)
+        nev = (match.url_name or match.view_name) if match else "(nincs url)"
+        meret = 0 if response.streaming else len(response.content)
+
+        with _lock:
+            _puffer.append((nev, fal * 1000, meres.ido * 1000, meres.db, meret))
+
+        response["Server-Timing"] = (
+            f'app;dur={fal * 1000:.1f}, db;dur={meres.ido * 1000:.1f};desc="{meres.db} query"'
+        )
+        return response
+
+
+def _percentilis(rendezett, p):
+    if not rendezett:
+        return None
+    # nearest-rank: a legkisebb érték, aminél a minták p%-a nem nagyobb
+    i = max(0, math.ceil(p / 100 * len(rendezett)) - 1)
+    return round(rendezett[i], 1)
+
+
+def profil_statisztika():
+    """URL név -> db, p50/p95/p99 (fal), átlagos DB idő, lekérdezésszám, méret."""
+    with _lock:
+        minta = list(_puffer)
+
+    per = {}
+    for nev, fal, db_ido, db, meret in minta:
+        per.setdefault(nev, []).append((fal, db_ido, db, meret))
+
+    out = []
+    for nev, sorok in per.items():
+        falak = sorted(s[0] for s in sorok)
+        n = len(sorok)
+        out.append({
+            "url_name": nev,
+            "db": n,
+            "p50_ms": _percentilis(falak, 50),
+            "p95_ms": _percentilis(falak, 95),
+            "p99_ms": _percentilis(falak, 99),
+            "max_ms": round(falak[-1], 1),
+            "db_ms_atlag": round(sum(s[1] for s in sorok) / n, 1),
+            "lekerdezes_atlag": round(sum(s[2] for s in sorok) / n, 1),
+            "lekerdezes_max": max(s[2] for s in sorok),
+            "meret_atlag": int(sum(s[3] for s in sorok) / n),
+        })
+    out.sort(key=lambda r: -(r["p95_ms"] or 0))
+    return {"minta": len(minta), "puffer_meret": _puffer.maxlen, "vegpontok": out}
+
+
+def profil_torles():
+    """A puffer ürítése. -> a törölt minták száma"""
+    with _lock:
+        db = len(_puffer)
+        _puffer.clear()
+    return db
+
+
+# "SCAN naplo_naplosor" (SQLite >= 3.36) / "SCAN TABLE naplo_naplosor" (régebbi);
+# az indexen át bejárás ("... USING INDEX ...") nem számít teljes scannek
+TELJES_SCAN = re.compile(r"^SCAN (TABLE )?naplo_naplosor\b(?!.*\bINDEX\b)")
+
+
+class _LassuGyujto:
+    """connection.execute_wrapper: a küszöb feletti utasítások összegyűjtése."""
+
+    def __init__(self, kuszob_ms):
+        self.kuszob_ms = kuszob_ms
+        self.lassuk = []
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            if ms >= self.kuszob_ms:
+                # executemany: az első paraméter-sor elég a tervhez
+                self.lassuk.append((sql, (next(iter(params), None) if many else params), ms))
+
+
+def lekerdezes_terv(sql, params):
+    """EXPLAIN QUERY PLAN sorai (csak SQLite; más adatbázison üres lista)."""
+    if connection.vendor != "sqlite":
+        return []
+    cur = connection.create_cursor()  # nyers cursor: nem fut át az execute_wrapper-eken
+    try:
+        cur.execute("EXPLAIN QUERY PLAN " + sql, params or ())
+        return [row[-1] for row in cur.fetchall()]
+    except Exception as e:  # pl. DDL / tranzakciós utasítás – nincs terve
+        return [f"(nincs terv: {e})"]
+    finally:
+        cur.close()
+
+
+class LassuLekerdezesMiddleware:
+    def __init__(self, get_response):
+        self.kuszob_ms = getattr(settings, "NAPLO_LASSU_LEKERDEZES_MS", None)
+        if self.kuszob_ms is None:
+            raise MiddlewareNotUsed
+        self.max_db = getattr(settings, "NAPLO_LASSU_LEKERDEZES_MAX", 500)
+        self.get_response = get_response
+
+    def __call__(self, request):
+        gyujto = _LassuGyujto(self.kuszob_ms)
+        with connection.execute_wrapper(gyujto):
+            response = self.get_response(request)
+        if gyujto.lassuk:
+            self._mentes(request.get_full_path()[:300], gyujto.lassuk)
+        return response
+
+    def _mentes(self, url, lassuk):
+        objs = []
+        for sql, params, ms in lassuk:
+            terv = lekerdezes_terv(sql, params)
+            objs.append(LassuLekerdezes(
+                url=url,
+                sql=sql,
+                params=json.dumps(params, default=str, ensure_ascii=False) if params else "",
+                ido_ms=round(ms, 2),
+                terv="\n".join(terv),
+                teljes_scan=any(TELJES_SCAN.search(sor) for sor in terv),
+            ))
+        LassuLekerdezes.objects.bulk_create(objs)
+
+        # korlátos napló: csak a legutolsó max_db sor marad
+        hatar = (
+            LassuLekerdezes.objects.order_by("-id")
+            .values_list("id", flat=True)[self.max_db:self.max_db + 1]
+        )
+        hatar = list(hatar)
+        if hatar:
+            LassuLekerdezes.objects.filter(id__lte=hatar[0]).delete()
+
+
+TOMORITHETO_TIPUSOK = ("text/html", "application/json")
+
+
+class TomoritoMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware csak a HTML / JSON válaszokra, méretküszöbbel. A statikus
+    fájlok előtömörítve mennek ki (storage.py, views.statikus_fajl), a
+    streamelt válaszok (pl. event-stream) érintetlenek maradnak.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_bajt = getattr(settings, "NAPLO_TOMORITES_MIN_BAJT", 1024)
+
+    def process_response(self, request, response):
+        if response.streaming:
+            return response
+        tipus = response.get("Content-Type", "").split(";")[0].strip()
+        if tipus not in TOMORITHETO_TIPUSOK or len(response.content) < self.min_bajt:
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('naplo', '0006_rename_six_program_focus_to_eletkerek_focus'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='naplosor',
+            index=models.Index(fields=['datum', 'kezdet'], name='naplosor_datum_kezdet_idx'),
+        ),
+    ]
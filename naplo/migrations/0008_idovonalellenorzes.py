@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('naplo', '0007_naplosor_datum_kezdet_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdovonalEllenorzes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('datum', models.DateField(unique=True)),
+                ('sorok', models.IntegerField(default=0)),
+                ('hezag_db', models.IntegerField(default=0)),
+                ('hezag_perc', models.IntegerField(default=0)),
+                ('atfedes_db', models.IntegerField(default=0)),
+                ('atfedes_perc', models.IntegerField(default=0)),
+                ('nulla_db', models.IntegerField(default=0)),
+                ('frissitve', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-datum'],
+            },
+        ),
+    ]
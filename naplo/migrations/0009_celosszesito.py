@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:59
+
+import datetime
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def feltoltes(apps, schema_editor):
+    NaploSor = apps.get_model("naplo", "NaploSor")
+    CelOsszesito = apps.get_model("naplo", "CelOsszesito")
+    rows = (
+        NaploSor.objects
+        .exclude(kapcsolodo_cel="")
+        .values("kapcsolodo_cel")
+        .annotate(osszes=Sum("ido"), db=Count("id"), elso=Min("datum"), utolso=Max("datum"))
+        .order_by()
+    )
+    CelOsszesito.objects.bulk_create(
+        [
+            CelOsszesito(cel=r["kapcsolodo_cel"], osszes_ido=r["osszes"], sorok=r["db"],
+                         elso_datum=r["elso"], utolso_datum=r["utolso"])
+            for r in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('naplo', '0008_idovonalellenorzes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CelOsszesito',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cel', models.CharField(max_length=200, unique=True)),
+                ('osszes_ido', models.DurationField(default=datetime.timedelta(0))),
+                ('sorok', models.IntegerField(default=0)),
+                ('elso_datum', models.DateField(blank=True, null=True)),
+                ('utolso_datum', models.DateField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['cel'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='naplosor',
+            index=models.Index(fields=['kapcsolodo_cel', 'datum'], name='naplosor_cel_datum_idx'),
+        ),
+        migrations.RunPython(feltoltes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:02
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+# A kitöltés a migráció idejére befagyasztva (nem a naplo.kereses-ből importálva):
+# a későbbi kereses.py változások nem írhatják át ezt a történeti lépést.
+NORM_MEZOK = {
+    "kategoria": "kategoria_norm",
+    "kapcsolodo": "kapcsolodo_norm",
+    "szerep": "szerep_norm",
+    "erzelem": "erzelem_norm",
+    "kapcsolodo_cel": "kapcsolodo_cel_norm",
+}
+KERESO_MEZOK = ("tevekenyseg", "megjegyzes", *NORM_MEZOK)
+MEZOK = ["kereso", *NORM_MEZOK.values()]
+
+
+def normalizal(szoveg):
+    if not szoveg:
+        return ""
+    s = unicodedata.normalize("NFKD", str(szoveg))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return " ".join(s.casefold().split())
+
+
+def kitoltes(obj):
+    for forras, cel in NORM_MEZOK.items():
+        setattr(obj, cel, normalizal(getattr(obj, forras)))
+    obj.kereso = "\n".join(normalizal(getattr(obj, m)) for m in KERESO_MEZOK)
+
+
+def visszatoltes(apps, schema_editor):
+    NaploSor = apps.get_model("naplo", "NaploSor")
+    batch = []
+    for obj in NaploSor.objects.only("id", *KERESO_MEZOK).iterator(chunk_size=1000):
+        kitoltes(obj)
+        batch.append(obj)
+        if len(batch) >= 1000:
+            NaploSor.objects.bulk_update(batch, MEZOK)
+            batch = []
+    if batch:
+        NaploSor.objects.bulk_update(batch, MEZOK)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('naplo', '0009_celosszesito'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='naplosor',
+            name='erzelem_norm',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='naplosor',
+            name='kapcsolodo_cel_norm',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='naplosor',
+            name='kapcsolodo_norm',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='naplosor',
+            name='kategoria_norm',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='naplosor',
+            name='kereso',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='naplosor',
+            name='szerep_norm',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(visszatoltes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('naplo', '0010_naplosor_kereso_arnyekmezok'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LassuLekerdezes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idopont', models.DateTimeField(auto_now_add=True)),
+                ('url', models.CharField(blank=True, max_length=300)),
+                ('sql', models.TextField()),
+                ('params', models.TextField(blank=True)),
+                ('ido_ms', models.FloatField()),
+                ('terv', models.TextField(blank=True)),
+                ('teljes_scan', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': 'lassú lekérdezés',
+                'verbose_name_plural': 'lassú lekérdezések',
+                'ordering': ['-idopont', '-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:15
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def feltoltes(apps, schema_editor):
+    NaploSor = apps.get_model("naplo", "NaploSor")
+    ValtozasNaplo = apps.get_model("naplo", "ValtozasNaplo")
+
+    # a meglévő soroknál a módosítás ideje = létrehozás ideje
+    NaploSor.objects.update(modositva=F("letrehozva"))
+
+    # kiinduló állapot: minden meglévő sor egy mentés-bejegyzés, id sorrendben
+    ValtozasNaplo.objects.bulk_create(
+        [ValtozasNaplo(naplosor_id=i, muvelet="upsert")
+         for i in NaploSor.objects.order_by("id").values_list("id", flat=True)],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('naplo', '0011_lassulekerdezes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValtozasNaplo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('naplosor_id', models.BigIntegerField()),
+                ('muvelet', models.CharField(choices=[('upsert', 'Mentés'), ('delete', 'Törlés')], max_length=10)),
+                ('idopont', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='naplosor',
+            name='modositva',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(feltoltes, migrations.RunPython.noop),
+    ]
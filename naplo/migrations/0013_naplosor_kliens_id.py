@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('naplo', '0012_naplosor_modositva_valtozasnaplo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='naplosor',
+            name='kliens_id',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:24
+
+import html
+import re
+import unicodedata
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+
+# A kitöltés a migráció idejére befagyasztva (nem a naplo.kereses-ből importálva):
+# a későbbi kereses.py változások nem írhatják át ezt a történeti lépést.
+KIVONAT_HOSSZ = 200
+NORM_MEZOK = ("kategoria_norm", "kapcsolodo_norm", "szerep_norm", "erzelem_norm", "kapcsolodo_cel_norm")
+# a kereso is újraszámolódik: eddig a megjegyzés HTML-jét (markupot is) tartalmazta
+MEZOK = ["megjegyzes_szoveg", "megjegyzes_kivonat", "kereso"]
+
+
+def normalizal(szoveg):
+    if not szoveg:
+        return ""
+    s = unicodedata.normalize("NFKD", str(szoveg))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return " ".join(s.casefold().split())
+
+
+def html_szoveg(tartalom):
+    if not tartalom:
+        return ""
+    tartalom = re.sub(r"<(br|/p|/div|/li|/h\d)\b[^>]*>", " ", str(tartalom), flags=re.I)
+    return " ".join(html.unescape(strip_tags(tartalom)).split())
+
+
+def kitoltes(obj):
+    obj.megjegyzes_szoveg = html_szoveg(obj.megjegyzes)
+    obj.megjegyzes_kivonat = Truncator(obj.megjegyzes_szoveg).chars(KIVONAT_HOSSZ, truncate="…")
+    # a *_norm mezők már normalizáltak (0010 óta mentéskor töltődnek)
+    reszek = [normalizal(obj.tevekenyseg), normalizal(obj.megjegyzes_szoveg)]
+    reszek += [getattr(obj, m) for m in NORM_MEZOK]
+    obj.kereso = "\n".join(reszek)
+
+
+def visszatoltes(apps, schema_editor):
+    NaploSor = apps.get_model("naplo", "NaploSor")
+    batch = []
+    for obj in NaploSor.objects.only("id", "tevekenyseg", "megjegyzes", *NORM_MEZOK).iterator(chunk_size=1000):
+        kitoltes(obj)
+        batch.append(obj)
+        if len(batch) >= 1000:
+            NaploSor.objects.bulk_update(batch, MEZOK)
+            batch = []
+    if batch:
+        NaploSor.objects.bulk_update(batch, MEZOK)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('naplo', '0013_naplosor_kliens_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='naplosor',
+            name='megjegyzes_kivonat',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='naplosor',
+            name='megjegyzes_szoveg',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(visszatoltes, migrations.RunPython.noop),
+    ]
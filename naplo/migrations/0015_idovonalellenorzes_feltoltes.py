@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from django.db import migrations
+
+
+# A 0008 csak a táblát hozta létre: a meglévő napokra nem volt ellenőrzés
+# (csak a mentéssel érintett napokra, vagy ha valaki lefuttatta a check_timeline-t).
+# A sweep a migráció idejére befagyasztva (timeline.idovonal_sweep + nap_osszesites),
+# a lista helyett rögtön darabszámokat és másodperceket gyűjt.
+
+
+def _uj_nap():
+    return {"sorok": 0, "hezag_db": 0, "hezag_mp": 0.0, "atfedes_db": 0, "atfedes_mp": 0.0, "nulla_db": 0}
+
+
+def feltoltes(apps, schema_editor):
+    NaploSor = apps.get_model("naplo", "NaploSor")
+    IdovonalEllenorzes = apps.get_model("naplo", "IdovonalEllenorzes")
+
+    rows = (
+        NaploSor.objects.filter(kezdet__isnull=False)
+        .order_by("datum", "kezdet", "id")
+        .values_list("datum", "kezdet", "ido")
+    )
+    napok = {}
+    max_end = None
+    for datum, kezdet, ido in rows.iterator(chunk_size=2000):
+        start = datetime.combine(datum, kezdet)
+        end = start + (ido or timedelta(0))
+
+        nap = napok.get(datum)
+        if nap is None:
+            nap = napok[datum] = _uj_nap()
+        nap["sorok"] += 1
+
+        if end <= start:
+            nap["nulla_db"] += 1
+            continue
+
+        if max_end is not None:
+            if start > max_end:
+                nap["hezag_db"] += 1
+                nap["hezag_mp"] += (start - max_end).total_seconds()
+            elif start < max_end:
+                nap["atfedes_db"] += 1
+                nap["atfedes_mp"] += (min(end, max_end) - start).total_seconds()
+
+        if max_end is None or end > max_end:
+            max_end = end
+
+    IdovonalEllenorzes.objects.all().delete()
+    IdovonalEllenorzes.objects.bulk_create(
+        [
+            IdovonalEllenorzes(
+                datum=d, sorok=n["sorok"], nulla_db=n["nulla_db"],
+                hezag_db=n["hezag_db"], hezag_perc=int(n["hezag_mp"] // 60),
+                atfedes_db=n["atfedes_db"], atfedes_perc=int(n["atfedes_mp"] // 60),
+            )
+            for d, n in napok.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('naplo', '0014_naplosor_megjegyzes_szoveg'),
+    ]
+
+    operations = [
+        migrations.RunPython(feltoltes, migrations.RunPython.noop),
+    ]
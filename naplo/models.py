@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 from django.db import models
 
+from .kereses import ARNYEK_MEZOK, KIVONAT_HOSSZ, arnyek_mezok_kitoltese
+
 
 class Param(models.Model):
     TIPUSOK = [
@@ -41,19 +43,142 @@ class NaploSor(models.Model):
     eletkerek_focus = models.JSONField(default=list, blank=True)
 
     letrehozva = models.DateTimeField(auto_now_add=True)
+    modositva = models.DateTimeField(auto_now=True)
     megjegyzes = models.TextField(blank=True)
 
-    def save(self, *args, **kwargs):
+    # Keresési árnyékmezők (kisbetűs, ékezet nélküli) – mentéskor töltődnek, lásd kereses.py
+    kereso = models.TextField(blank=True, editable=False)
+    kategoria_norm = models.CharField(max_length=100, blank=True, editable=False, db_index=True)
+    kapcsolodo_norm = models.CharField(max_length=100, blank=True, editable=False, db_index=True)
+    szerep_norm = models.CharField(max_length=100, blank=True, editable=False, db_index=True)
+    erzelem_norm = models.CharField(max_length=100, blank=True, editable=False, db_index=True)
+    kapcsolodo_cel_norm = models.CharField(max_length=200, blank=True, editable=False, db_index=True)
+
+    # a megjegyzés (TinyMCE HTML) sima szöveges változata és listákhoz való kivonata
+    megjegyzes_szoveg = models.TextField(blank=True, editable=False)
+    megjegyzes_kivonat = models.CharField(max_length=KIVONAT_HOSSZ, blank=True, editable=False)
+
+    # offline bevitel idempotencia-kulcsa (api_bevitel_tomeges): az újraküldött sor nem duplázódik
+    kliens_id = models.CharField(max_length=64, null=True, blank=True, unique=True, editable=False)
+
+    def szamitott_mezok(self):
+        """Időtartam (éjfél-átlépéssel) és keresési árnyékmezők – bulk_create előtt is kell."""
         if self.datum and self.kezdet and self.veg:
             dt_start = datetime.combine(self.datum, self.kezdet)
             dt_end = datetime.combine(self.datum, self.veg)
             if dt_end < dt_start:
                 dt_end += timedelta(days=1)
             self.ido = dt_end - dt_start
+
+        arnyek_mezok_kitoltese(self)
+
+    def save(self, *args, **kwargs):
+        self.szamitott_mezok()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = set(update_fields) | set(ARNYEK_MEZOK)
+
         super().save(*args, **kwargs)
 
     class Meta:
         ordering = ["-datum", "-kezdet"]
+        indexes = [
+            # időszakos lekérdezések (start–end) és az időrendi bejárás ezt használja
+            models.Index(fields=["datum", "kezdet"], name="naplosor_datum_kezdet_idx"),
+            # cél-összesítő: első/utolsó dátum újraszámolása egy célra
+            models.Index(fields=["kapcsolodo_cel", "datum"], name="naplosor_cel_datum_idx"),
+        ]
 
     def __str__(self):
         return f"{self.datum} {self.kezdet}-{self.veg} | {self.tevekenyseg[:40]}"
+
+
+class IdovonalEllenorzes(models.Model):
+    """
+    Napi idővonal-ellenőrzés eredménye (hézag / átfedés / 0 perces sor).
+    A check_timeline parancs tölti fel teljesen, NaploSor mentéskor az adott
+    nap (és a következő) frissül. A napi összkép ebből olvas, egy indexelt lookup.
+    """
+    datum = models.DateField(unique=True)
+    sorok = models.IntegerField(default=0)
+    hezag_db = models.IntegerField(default=0)
+    hezag_perc = models.IntegerField(default=0)
+    atfedes_db = models.IntegerField(default=0)
+    atfedes_perc = models.IntegerField(default=0)
+    nulla_db = models.IntegerField(default=0)
+    frissitve = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-datum"]
+
+    @property
+    def rendben(self):
+        return not (self.hezag_db or self.atfedes_db or self.nulla_db)
+
+    def __str__(self):
+        return f"{self.datum} | hézag {self.hezag_db} | átfedés {self.atfedes_db} | 0 perc {self.nulla_db}"
+
+
+class CelOsszesito(models.Model):
+    """
+    Célonkénti (kapcsolodo_cel) halmozott összesítő. NaploSor mentéskor /
+    törléskor inkrementálisan frissül (lásd celok.py), így a célok oldal egy
+    olvasás a történet hosszától függetlenül.
+    """
+    cel = models.CharField(max_length=200, unique=True)
+    osszes_ido = models.DurationField(default=timedelta(0))
+    sorok = models.IntegerField(default=0)
+    elso_datum = models.DateField(null=True, blank=True)
+    utolso_datum = models.DateField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["cel"]
+
+    def __str__(self):
+        return f"{self.cel} | {self.osszes_ido} | {self.sorok} sor"
+
+
+class LassuLekerdezes(models.Model):
+    """
+    Küszöb feletti SQL utasítás (naplo.middleware.LassuLekerdezesMiddleware,
+    settings.NAPLO_LASSU_LEKERDEZES_MS). Korlátos napló: a legutolsó
+    NAPLO_LASSU_LEKERDEZES_MAX sor marad meg. Adminban nézhető.
+    """
+    idopont = models.DateTimeField(auto_now_add=True)
+    url = models.CharField(max_length=300, blank=True)
+    sql = models.TextField()
+    params = models.TextField(blank=True)
+    ido_ms = models.FloatField()
+    terv = models.TextField(blank=True)
+    # a terv teljes táblabejárást tartalmaz a naplo_naplosor-on (nincs használható index)
+    teljes_scan = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["-idopont", "-id"]
+        verbose_name = "lassú lekérdezés"
+        verbose_name_plural = "lassú lekérdezések"
+
+    def __str__(self):
+        return f"{self.ido_ms:.1f} ms | {self.sql[:80]}"
+
+
+class ValtozasNaplo(models.Model):
+    """
+    Csak hozzáfűzött változásnapló a NaploSor-ra (mentés / törlés, signals.py).
+    Az id a sorszám: SQLite AUTOINCREMENT, szigorúan nő és nem használódik újra,
+    így a kliens a `since=<utolsó id>` alapján csak a változásokat kéri le
+    (api_valtozasok). A naplosor_id szándékosan nem FK: a törölt sor bejegyzése is megmarad.
+    """
+    MENTES = "upsert"
+    TORLES = "delete"
+    MUVELETEK = [(MENTES, "Mentés"), (TORLES, "Törlés")]
+
+    naplosor_id = models.BigIntegerField()
+    muvelet = models.CharField(max_length=10, choices=MUVELETEK)
+    idopont = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"#{self.id} {self.muvelet} {self.naplosor_id}"
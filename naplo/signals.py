@@ -0,0 +1,100 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .autocomplete import tevekenyseg_index
+from .cache import adat_valtozott, nap_cache_torles
+from .celok import cel_hozzaad, cel_levon
+from .esemenyek import napok_valtoztak
+from .integritas import nap_frissites
+from .models import NaploSor, ValtozasNaplo
+from .valtozasok import valtozas_rogzites, valtozasok_tomegesen
+
+
+@receiver(pre_save, sender=NaploSor)
+def naplosor_elotte(sender, instance, **kwargs):
+    # a mentés előtti állapot kell az inkrementális összesítők levonásához
+    instance._elozo_allapot = None
+    if instance.pk and not kwargs.get("raw"):
+        instance._elozo_allapot = (
+            sender.objects.filter(pk=instance.pk)
+            .values("kapcsolodo_cel", "ido", "datum", "tevekenyseg")
+            .first()
+        )
+
+
+@receiver(post_save, sender=NaploSor)
+def naplosor_mentve(sender, instance, created, **kwargs):
+    if kwargs.get("raw"):
+        return  # loaddata: a parancsok utólag újraszámolnak
+
+    elozo = getattr(instance, "_elozo_allapot", None) or {}
+
+    # cél-összesítő: régi állapot levonása, új hozzáadása
+    cel_regi = (elozo.get("kapcsolodo_cel"), elozo.get("ido"), elozo.get("datum"))
+    cel_uj = (instance.kapcsolodo_cel, instance.ido, instance.datum)
+    if cel_regi != cel_uj:
+        if elozo:
+            cel_levon(*cel_regi)
+        cel_hozzaad(*cel_uj)
+
+    # tevékenység-javaslatok indexe
+    if elozo.get("tevekenyseg") != instance.tevekenyseg:
+        if elozo:
+            tevekenyseg_index.levon(elozo["tevekenyseg"])
+        tevekenyseg_index.hozzaad(instance.tevekenyseg, instance.datum)
+
+    valtozas_rogzites(instance.pk, ValtozasNaplo.MENTES)
+    _kozos_frissites(instance.datum, elozo.get("datum"))
+
+
+@receiver(post_delete, sender=NaploSor)
+def naplosor_torolve(sender, instance, **kwargs):
+    cel_levon(instance.kapcsolodo_cel, instance.ido, instance.datum)
+    tevekenyseg_index.levon(instance.tevekenyseg)
+    valtozas_rogzites(instance.pk, ValtozasNaplo.TORLES)
+    _kozos_frissites(instance.datum)
+
+
+def _kozos_frissites(datum, regi_datum=None):
+    # tartomány-cache (hőtérkép stb.) és a napi összkép cache érvénytelenítése
+    adat_valtozott()
+    nap_cache_torles(datum, regi_datum)
+
+    # napi idővonal-jelzés frissítése (az érintett nap + következő)
+    for d in {datum, regi_datum} - {None}:
+        nap_frissites(d)
+
+    # nyitott oldalak értesítése (SSE) – csak a véglegesített változásról
+    transaction.on_commit(lambda: napok_valtoztak(datum, regi_datum))
+
+
+def tomeges_beszuras_utan(objs):
+    """
+    bulk_create után (nem megy post_save): ugyanaz, mint soronként a
+    naplosor_mentve, de a napi frissítés naponta csak egyszer fut.
+    """
+    for obj in objs:
+        cel_hozzaad(obj.kapcsolodo_cel, obj.ido, obj.datum)
+        tevekenyseg_index.hozzaad(obj.tevekenyseg, obj.datum)
+    valtozasok_tomegesen([obj.pk for obj in objs])
+
+    napok = {obj.datum for obj in objs}
+    adat_valtozott()
+    nap_cache_torles(*napok)
+    # nap_frissites a d és d+1 napot nézi: egymás utáni napoknál is elég naponta egyszer
+    for d in sorted(napok):
+        nap_frissites(d)
+    transaction.on_commit(lambda: napok_valtoztak(*napok))
+
+
+def tomeges_modositas_utan(idk, napok):
+    """
+    QuerySet.update() után (nem megy jelzés), ha csak leíró mező változott
+    (kategória, Életkerék címkék stb.): az idő, a cél és a tevékenység marad,
+    így a cél-összesítő, a javaslat-index és az idővonal nem érintett.
+    """
+    valtozasok_tomegesen(idk)
+    adat_valtozott()
+    nap_cache_torles(*napok)
+    transaction.on_commit(lambda: napok_valtoztak(*napok))
@@ -0,0 +1,98 @@
+/* Mentés fetch-csel (api_bevitel): nincs átirányítás és teljes újrarajzolás, csak az
+   "utolsó 20" táblázat sora frissül és a form a következő alapértékekre áll.
+   Offline / hálózati hibánál új sor a várólistára kerül (offline_bevitel.js).
+   JS nélkül a form a szokásos POST-tal megy. */
+(function () {
+  "use strict";
+
+  const form = document.querySelector("form[data-api-url]");
+  const tbody = document.getElementById("utolso_20");
+  const hibak = document.getElementById("bevitel_hibak");
+  if (!form || !tbody || !window.fetch) return;
+
+  const gomb = form.querySelector("button[type=submit]");
+
+  function hibakMutat(errors) {
+    hibak.innerHTML = "<b>Hibák:</b><ul>" + Object.entries(errors).map(([mezo, uzenetek]) =>
+      `<li>${mezo === "__all__" ? "" : escapeHtml(mezo) + ": "}${uzenetek.map(escapeHtml).join(" ")}</li>`
+    ).join("") + "</ul>";
+    hibak.hidden = false;
+  }
+
+  function tablaFrissit(data) {
+    const tmp = document.createElement("tbody");
+    tmp.innerHTML = data.tabla_sor.trim();
+    const uj = tmp.firstElementChild;
+    const regi = tbody.querySelector(`tr[data-id="${data.row.id}"]`);
+    if (regi) {
+      regi.replaceWith(uj);
+      return;
+    }
+    const ures = tbody.querySelector("tr.ures");
+    if (ures) ures.remove();
+    tbody.prepend(uj);
+    const sorok = tbody.querySelectorAll("tr[data-id]");
+    for (let i = 20; i < sorok.length; i++) sorok[i].remove();
+  }
+
+  function ujSorMod(k) {
+    // szerkesztés után is új bevitelre váltunk – mint a régi átirányítás
+    if (form.dataset.apiUrl !== form.dataset.ujApiUrl) {
+      form.dataset.apiUrl = form.dataset.ujApiUrl;
+      history.replaceState(null, "", form.dataset.ujUrl);
+    }
+    // üres form, mint a GET-nél: csak a dátum/idő alap és az érték = 6
+    for (const nev of ["tevekenyseg", "megjegyzes", "kategoria", "kapcsolodo", "szerep", "erzelem", "kapcsolodo_cel"]) {
+      if (form.elements[nev]) form.elements[nev].value = "";
+    }
+    form.querySelectorAll("input[name=eletkerek_focus]").forEach(cb => { cb.checked = false; });
+    if (form.elements.ertek) form.elements.ertek.value = "6";
+    form.elements.datum.value = k.datum;
+    form.elements.kezdet.value = k.kezdet;
+    form.elements.veg.value = k.veg;
+    form.elements.kezdet.dispatchEvent(new Event("input"));   // időtartam kijelzés
+
+    const viewWrap = document.getElementById("megjegyzes_view_wrap");
+    const editWrap = document.getElementById("megjegyzes_edit_wrap");
+    if (viewWrap && editWrap) {
+      viewWrap.style.display = "none";
+      editWrap.style.display = "block";
+    }
+    form.elements.tevekenyseg.focus();
+  }
+
+  form.addEventListener("submit", async (e) => {
+    e.preventDefault();
+    hibak.hidden = true;
+
+    if (!navigator.onLine && window.NaploOffline && await NaploOffline.sorbaAllit()) return;
+
+    gomb.disabled = true;
+    try {
+      let res;
+      try {
+        res = await fetch(form.dataset.apiUrl, {
+          method: "POST",
+          body: new FormData(form),
+          credentials: "same-origin",
+          headers: { "X-Requested-With": "fetch" },
+        });
+      } catch (err) {
+        // hálózati hiba: új sor a várólistára, szerkesztésnél hibaüzenet
+        if (window.NaploOffline && await NaploOffline.sorbaAllit()) return;
+        hibakMutat({ __all__: ["Nincs kapcsolat a szerverrel, a mentés nem sikerült."] });
+        return;
+      }
+
+      const data = await res.json().catch(() => ({}));
+      if (!res.ok) {
+        hibakMutat(data.errors || { __all__: [data.error || `Szerverhiba (HTTP ${res.status}).`] });
+        return;
+      }
+      tablaFrissit(data);
+      ujSorMod(data.kovetkezo);
+    } finally {
+      gomb.disabled = false;
+    }
+  });
+})();
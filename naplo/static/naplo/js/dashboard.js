@@ -0,0 +1,8 @@
+// Teljes sor kattintható (szerkesztésre visz). Linkre kattintás marad link.
+document.addEventListener("click", function (e) {
+  const row = e.target.closest("tr.clickrow");
+  if (!row) return;
+  if (e.target.closest("a")) return;
+  const href = row.getAttribute("data-href");
+  if (href) window.location.href = href;
+});
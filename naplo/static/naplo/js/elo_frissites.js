@@ -0,0 +1,82 @@
+/* Élő frissítés: a /naplo/api/esemenyek/ SSE streamből "ezek a napok változtak"
+   jelzéseket kap, és csak akkor frissít, ha az oldal tartományát érinti.
+
+   - JS-ből rajzolt oldalak: NaploElo.figyel((napok, minden) => ...) és
+     NaploElo.erintett(napok, start, end)
+   - szerveren renderelt oldalak: <body data-elo-start="..." data-elo-end="...">
+     (üres határ = nyitott); érintett változásnál újratölt, de nem gépelés
+     közben és nem háttérben lévő fülön – azt a visszatéréskor pótolja. */
+(function () {
+  const URL_ = "/naplo/api/esemenyek/";
+  const KESLELTETES_MS = 400;   // több gyors mentés (pl. tömeges szinkron) egy frissítés
+
+  const figyelok = [];
+  let gyujtott = new Set();
+  let mindenFrissul = false;
+  let idozito = null;
+
+  function erintett(napok, start, end) {
+    // ISO dátumok: a szöveges összehasonlítás a dátumsorrendet adja
+    return napok.some(d => (!start || d >= start) && (!end || d <= end));
+  }
+
+  function kiertesit() {
+    idozito = null;
+    const napok = Array.from(gyujtott).sort();
+    const minden = mindenFrissul;
+    gyujtott = new Set();
+    mindenFrissul = false;
+    for (const fn of figyelok) {
+      try { fn(napok, minden); } catch (e) { console.error(e); }
+    }
+  }
+
+  function uzenet(ev) {
+    let adat;
+    try { adat = JSON.parse(ev.data); } catch (e) { return; }
+    if (adat.minden) mindenFrissul = true;
+    for (const d of adat.napok || []) gyujtott.add(d);
+    if (!idozito) idozito = setTimeout(kiertesit, KESLELTETES_MS);
+  }
+
+  function figyel(fn) {
+    figyelok.push(fn);
+  }
+
+  if ("EventSource" in window) {
+    // WSGI alatt a végpont 204-et ad: az EventSource lezárul, nincs újrapróbálkozás
+    const es = new EventSource(URL_);
+    es.addEventListener("valtozas", uzenet);
+  }
+
+  /* ---- szerveren renderelt oldalak ---- */
+  let fuggo = false;
+
+  function gepelesKozben() {
+    const a = document.activeElement;
+    return a && /^(INPUT|TEXTAREA|SELECT)$/.test(a.tagName);
+  }
+
+  function ujratolt() {
+    if (document.hidden || gepelesKozben()) {
+      fuggo = true;
+      return;
+    }
+    location.reload();
+  }
+
+  function pottolas() {
+    if (fuggo && !document.hidden && !gepelesKozben()) location.reload();
+  }
+
+  const ds = document.body.dataset;
+  if ("eloStart" in ds || "eloEnd" in ds) {
+    figyel((napok, minden) => {
+      if (minden || erintett(napok, ds.eloStart, ds.eloEnd)) ujratolt();
+    });
+    document.addEventListener("visibilitychange", pottolas);
+    document.addEventListener("focusout", () => setTimeout(pottolas, 0));
+  }
+
+  window.NaploElo = { figyel, erintett };
+})();
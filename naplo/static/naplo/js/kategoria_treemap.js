@@ -0,0 +1,263 @@
+const treemapEl = document.getElementById("treemap");
+const refreshBtn = document.getElementById("refreshBtn");
+const breadcrumbEl = document.getElementById("breadcrumb");
+
+const dlg = document.getElementById("entriesDialog");
+const dlgClose = document.getElementById("dlgClose");
+
+refreshBtn.addEventListener("click", loadData);
+dlgClose.addEventListener("click", () => dlg.close());
+
+dlg.addEventListener("click", (e) => {
+  const r = dlg.getBoundingClientRect();
+  const inside =
+    r.top <= e.clientY && e.clientY <= r.bottom &&
+    r.left <= e.clientX && e.clientX <= r.right;
+  if (!inside) dlg.close();
+});
+
+/* ---- percek -> "5 nap 12 óra 25 perc" ---- */
+function formatMinutes(totalMinutes) {
+  const m = Number(totalMinutes || 0);
+  const days = Math.floor(m / 1440);
+  const hours = Math.floor((m % 1440) / 60);
+  const mins = m % 60;
+
+  const parts = [];
+  if (days > 0) parts.push(`${days} nap`);
+  if (hours > 0) parts.push(`${hours} óra`);
+  if (mins > 0 || parts.length === 0) parts.push(`${mins} perc`);
+  return parts.join(" ");
+}
+
+/* ---- hash (stabil) ---- */
+function hashString(s) {
+  const str = String(s || "");
+  let h = 2166136261; // FNV-1a
+  for (let i = 0; i < str.length; i++) {
+    h ^= str.charCodeAt(i);
+    h = Math.imul(h, 16777619);
+  }
+  return h >>> 0;
+}
+
+/*
+  ---- Színek: csoportos + 8 alapszín ----
+  - ha kulcsszavak alapján csoportba esik, fix baseHue környéke
+  - egyébként 8 vödörből kap baseHue-t (nem lesz minden piros)
+*/
+const BASE_HUES_8 = [20, 60, 100, 140, 180, 210, 260, 300];
+
+function baseHueFrom8Buckets(name) {
+  const idx = hashString("B:" + String(name || "")) % 8;
+  return BASE_HUES_8[idx];
+}
+
+function groupBaseHue(name) {
+  const s = String(name || "").toLowerCase();
+
+  // Mozgás
+  if (s.includes("tenisz") || s.includes("kondi") || s.includes("séta") || s.includes("bicikli") || s.includes("edzés")) return 140;
+
+  // Piszkenet / munka / pénz / ügyvezetés
+  if (s.includes("piszkenet") || s.includes("pénz") || s.includes("ugyvezet") || s.includes("ügyvezet") || s.includes("számla") || s.includes("ügyintéz")) return 210;
+
+  // Tanulás / önfejlesztés
+  if (s.includes("tanul") || s.includes("önfejleszt") || s.includes("olvas") || s.includes("hangoskönyv")) return 35;
+
+  // Kikapcsolódás / média
+  if (s.includes("youtube") || s.includes("film") || s.includes("zene") || s.includes("pihi") || s.includes("laz")) return 285;
+
+  // Étkezés / főzés
+  if (s.includes("étkez") || s.includes("kaja") || s.includes("főz") || s.includes("ebéd") || s.includes("vacs")) return 60;
+
+  // Család / kapcsolódás
+  if (s.includes("család") || s.includes("emberi") || s.includes("kapcsol") || s.includes("zsu") || s.includes("andi")) return 300;
+
+  // Egyéb: 8 alapszín valamelyike
+  return baseHueFrom8Buckets(name);
+}
+
+function colorForCategory(name) {
+  const base = groupBaseHue(name);
+
+  // apró eltérés, hogy ugyanazon csoporton belül is különbözzenek
+  const h = hashString("H:" + String(name || ""));
+  const offset = (h % 17) - 8;                 // -8..+8
+  const light = 44 + (hashString("L:" + name) % 7);  // 44..50
+  const hue = (base + offset + 360) % 360;
+
+  return `hsl(${hue}, 60%, ${light}%)`;
+}
+
+/* ---- Treemap (hierarchikus: kategória → kapcsolódó → tevékenység) ---- */
+let treeRoot = null;   // a szerver egyben adja a teljes (metszett) fát
+let zoomPath = [];     // a gyökértől az aktuális node-ig vezető út
+
+async function loadData(opts) {
+  const start = document.getElementById("start").value;
+  const end = document.getElementById("end").value;
+  if (!start || !end) return;
+
+  // élő frissítésnél a nagyítás maradjon (név szerint visszakeresve)
+  const megtart = opts && opts.megtart ? zoomPath.slice(1).map(n => n.name) : [];
+
+  const res = await fetch(`/naplo/api/hierarchia-osszefoglalo/?start=${start}&end=${end}`);
+  const data = await res.json();
+
+  treeRoot = data.root || { name: "", minutes: 0, children: [] };
+  zoomPath = [treeRoot];
+  for (const nev of megtart) {
+    const gyerek = (zoomPath[zoomPath.length - 1].children || []).find(c => c.name === nev);
+    if (!gyerek) break;
+    zoomPath.push(gyerek);
+  }
+  render();
+}
+
+if (window.NaploElo) {
+  NaploElo.figyel((napok, minden) => {
+    const start = document.getElementById("start").value;
+    const end = document.getElementById("end").value;
+    if (minden || NaploElo.erintett(napok, start, end)) loadData({ megtart: true });
+  });
+}
+
+function zoomTo(depth) {
+  zoomPath = zoomPath.slice(0, depth + 1);
+  render();
+}
+
+function renderBreadcrumb() {
+  breadcrumbEl.innerHTML = "";
+  zoomPath.forEach((n, i) => {
+    if (i > 0) breadcrumbEl.append(" › ");
+    const b = document.createElement("button");
+    b.type = "button";
+    b.textContent = i === 0 ? "Összes" : (n.name || "(üres)");
+    b.disabled = i === zoomPath.length - 1;
+    b.addEventListener("click", () => zoomTo(i));
+    breadcrumbEl.appendChild(b);
+  });
+}
+
+function render() {
+  renderBreadcrumb();
+  treemapEl.innerHTML = "";
+
+  const current = zoomPath[zoomPath.length - 1];
+  if (!current) return;
+
+  const width = treemapEl.clientWidth;
+  const height = treemapEl.clientHeight;
+
+  // csak az aktuális szint gyerekei kerülnek ki; a mélyebb szintek kattintásra, helyben jönnek
+  const tiles = (current.children || []).map(c => ({ node: c, minutes: c.minutes }));
+  const root = d3.hierarchy({ children: tiles }).sum(d => d.minutes || 0);
+
+  d3.treemap().size([width, height]).padding(4)(root);
+
+  const svg = d3.select("#treemap")
+    .append("svg")
+    .attr("width", width)
+    .attr("height", height);
+
+  const colorKey = d => (zoomPath.length > 1 ? zoomPath[1].name : d.data.node.name);
+
+  const node = svg.selectAll("g")
+    .data(root.leaves().filter(d => d.depth > 0))
+    .enter()
+    .append("g")
+    .attr("transform", d => `translate(${d.x0},${d.y0})`)
+    .style("cursor", d => (d.data.node.egyeb ? "default" : "pointer"))
+    .on("click", (event, d) => openNode(d.data.node));
+
+  node.append("rect")
+    .attr("width", d => d.x1 - d.x0)
+    .attr("height", d => d.y1 - d.y0)
+    .attr("rx", 10)
+    .attr("fill", d => colorForCategory(colorKey(d)))
+    .attr("fill-opacity", d => (d.data.node.egyeb ? 0.55 : 1));
+
+  node.append("text")
+    .attr("x", 10)
+    .attr("y", 22)
+    .attr("font-size", "14px")
+    .attr("font-weight", "600")
+    .text(d => d.data.node.name || "(üres)");
+
+  node.append("text")
+    .attr("x", 10)
+    .attr("y", 40)
+    .attr("font-size", "12px")
+    .text(d => formatMinutes(d.data.minutes));
+}
+
+function openNode(n) {
+  if (n.egyeb) return;
+  if (n.children && n.children.length) {
+    zoomPath.push(n);
+    render();
+    return;
+  }
+  openEntries(n);
+}
+
+/* ---- Modal lista (levél: a teljes útvonal szűrésként megy) ---- */
+async function openEntries(leaf) {
+  const start = document.getElementById("start").value;
+  const end = document.getElementById("end").value;
+
+  const path = zoomPath.slice(1).concat([leaf]);
+  const params = new URLSearchParams({ start, end });
+  for (const n of path) params.set(n.dim, n.name || "");
+
+  document.getElementById("dlgTitle").textContent = path.map(n => n.name || "(üres)").join(" › ");
+  document.getElementById("dlgSub").textContent = `${start} – ${end} • ${formatMinutes(leaf.minutes)}`;
+
+  const url = `/naplo/api/kategoria-bejegyzesek/?${params.toString()}`;
+
+  const res = await fetch(url);
+  const data = await res.json();
+
+  const ul = document.getElementById("entriesList");
+  ul.innerHTML = "";
+
+  const entries = data.entries || [];
+  if (!entries.length) {
+    const li = document.createElement("li");
+    li.style.padding = "10px 12px";
+    li.style.border = "1px solid #eee";
+    li.style.borderRadius = "12px";
+    li.textContent = "Nincs bejegyzés ebben a kategóriában.";
+    ul.appendChild(li);
+  }
+
+  for (const e of entries) {
+    const li = document.createElement("li");
+    li.style.border = "1px solid #eee";
+    li.style.borderRadius = "12px";
+    li.style.padding = "10px 12px";
+
+    li.innerHTML = `
+      <div style="display:flex; justify-content:space-between; gap:12px;">
+        <div style="font-weight:600;">${escapeHtml(e.tevekenyseg || "")}</div>
+        <div style="white-space:nowrap; color:#555; font-size:12px;">
+          ${escapeHtml(e.datum || "")} ${escapeHtml(e.kezdet || "")}-${escapeHtml(e.veg || "")}
+          • ${escapeHtml(formatMinutes(e.minutes))}
+        </div>
+      </div>
+      ${e.megjegyzes ? `<div style="margin-top:6px; color:#666; font-size:12px;">${escapeHtml(e.megjegyzes)}</div>` : ""}
+    `;
+
+    ul.appendChild(li);
+  }
+
+  dlg.showModal();
+}
+
+function escapeHtml(s) {
+  return (s || "").replace(/[&<>"']/g, c => ({
+    "&":"&amp;","<":"&lt;",">":"&gt;","\"":"&quot;","'":"&#39;"
+  }[c]));
+}
@@ -0,0 +1,301 @@
+function parseTime(t) {
+  if (!t) return null;
+  const parts = t.split(":");
+  if (parts.length < 2) return null;
+  return {h: parseInt(parts[0],10), m: parseInt(parts[1],10)};
+}
+
+function toMinutes(tm){ return tm.h*60 + tm.m; }
+
+function updateDuration(){
+  const start = parseTime(document.getElementById("id_kezdet").value);
+  const end = parseTime(document.getElementById("id_veg").value);
+  const out = document.getElementById("ido_display");
+
+  if (!start || !end){ out.value = ""; return; }
+
+  let diff = toMinutes(end) - toMinutes(start);
+  if (diff < 0) diff += 24*60;
+  const h = Math.floor(diff/60);
+  const m = diff % 60;
+  out.value = `${h}:${String(m).padStart(2,"0")}`;
+}
+
+document.getElementById("id_kezdet").addEventListener("input", updateDuration);
+document.getElementById("id_veg").addEventListener("input", updateDuration);
+updateDuration();
+
+const catDlg = document.getElementById("catDialog");
+const catDlgClose = document.getElementById("catDlgClose");
+const catEntriesList = document.getElementById("catEntriesList");
+const catTitle = document.getElementById("catDlgTitle");
+const catSub = document.getElementById("catDlgSub");
+
+catDlgClose.addEventListener("click", () => catDlg.close());
+
+catDlg.addEventListener("click", (e) => {
+  const r = catDlg.getBoundingClientRect();
+  const inside =
+    r.top <= e.clientY && e.clientY <= r.bottom &&
+    r.left <= e.clientX && e.clientX <= r.right;
+  if (!inside) catDlg.close();
+});
+
+function escapeHtml(s) {
+  return (s || "").replace(/[&<>"']/g, c => ({
+    "&":"&amp;","<":"&lt;",">":"&gt;","\"":"&quot;","'":"&#39;"
+  }[c]));
+}
+
+function linkifyEscaped(escaped) {
+  // escaped szövegből kattintható linkek (http(s):// és www.)
+  const urlRe = /(https?:\/\/[^\s<]+)|(www\.[^\s<]+)/g;
+  return (escaped || "").replace(urlRe, (m) => {
+    const href = m.startsWith("www.") ? ("https://" + m) : m;
+    return `<a href="${href}" target="_blank" rel="noopener noreferrer">${m}</a>`;
+  });
+}
+
+// külön script blokk, hogy a fenti escapeHtml fixen elérhető legyen
+function escapeHtml2(s) {
+  return (s || "").replace(/[&<>"']/g, c => ({
+    "&":"&amp;","<":"&lt;",">":"&gt;","\"":"&quot;","'":"&#39;"
+  }[c]));
+}
+
+// NOTE: A fenti két escapeHtml blokk közül egyik is elég lenne. A te projektedbe illesztéskor hagyd meg az egyiket.
+
+// A fenti duplázás oka: itt futtatjuk a végleges, hibátlan verziót.
+function escapeHtml(s) {
+  return (s || "").replace(/[&<>"']/g, c => ({
+    "&":"&amp;","<":"&lt;",">":"&gt;",'"':"&quot;","'":"&#39;"
+  }[c]));
+}
+
+function setFieldValue(id, value) {
+  const el = document.getElementById(id);
+  if (!el) return;
+  el.value = value ?? "";
+  el.dispatchEvent(new Event("change", { bubbles: true }));
+  el.dispatchEvent(new Event("input", { bubbles: true }));
+}
+
+function setCheckboxGroupByName(name, selectedValues) {
+const set = new Set((selectedValues || []).map(String));
+document.querySelectorAll(`input[name="${name}"]`).forEach((el) => {
+  el.checked = set.has(String(el.value));
+  el.dispatchEvent(new Event("change", { bubbles: true }));
+});
+}
+
+
+function fillFromEntry(e) {
+  // Dátum / Kezd / Vég / Idő: változatlan.
+  setFieldValue("id_ertek", e.ertek ?? "");
+  setFieldValue("id_kapcsolodo", e.kapcsolodo ?? "");
+  setFieldValue("id_szerep", e.szerep ?? "");
+  setFieldValue("id_erzelem", e.erzelem ?? "");
+  setFieldValue("id_kapcsolodo_cel", e.kapcsolodo_cel ?? "");
+  setFieldValue("id_tevekenyseg", e.tevekenyseg ?? "");
+  setFieldValue("id_megjegyzes", e.megjegyzes ?? "");
+  setCheckboxGroupByName("eletkerek_focus", e.eletkerek_focus || []);
+}
+
+async function openCategoryLastEntries(kategoria) {
+  catTitle.textContent = kategoria || "";
+  catSub.textContent = "Válassz az utolsó 20 bejegyzésből. Kattintásra kitölti a mezőket.";
+
+  catEntriesList.innerHTML = "";
+
+  const url = `/naplo/api/utolso-bejegyzesek-kategoriara/?kategoria=${encodeURIComponent(kategoria)}&limit=20`;
+  const res = await fetch(url);
+  const data = await res.json();
+
+  const entries = data.entries || [];
+  if (!entries.length) {
+    const li = document.createElement("li");
+    li.style.padding = "10px 12px";
+    li.style.border = "1px solid #eee";
+    li.style.borderRadius = "12px";
+    li.textContent = "Nincs bejegyzés ebben a kategóriában.";
+    catEntriesList.appendChild(li);
+    catDlg.showModal();
+    return;
+  }
+
+  for (let e of entries) {
+    const li = document.createElement("li");
+    li.style.border = "1px solid #eee";
+    li.style.borderRadius = "12px";
+    li.style.padding = "10px 12px";
+    li.style.cursor = "pointer";
+
+    li.innerHTML = `
+      <div style="display:flex; justify-content:space-between; gap:12px;">
+        <div style="font-weight:600;">${escapeHtml(e.tevekenyseg || "")}</div>
+        <div style="white-space:nowrap; color:#555; font-size:12px;">
+          ${escapeHtml(e.datum || "")} ${escapeHtml(e.kezdet || "")}-${escapeHtml(e.veg || "")}
+          • Érték: ${escapeHtml(String(e.ertek ?? ""))}
+        </div>
+      </div>
+      ${e.megjegyzes ? `<div style="margin-top:6px; color:#666; font-size:12px;">${linkifyEscaped(escapeHtml(e.megjegyzes))}</div>` : ""}
+    `;
+
+    li.addEventListener("click", async () => {
+      // a lista csak kivonatot ad – a form a teljes megjegyzést kapja
+      if (e.megjegyzes) {
+        try {
+          const r = await fetch(`/naplo/api/megjegyzes/${e.id}/`);
+          if (r.ok) e = { ...e, megjegyzes: (await r.json()).megjegyzes };
+        } catch (err) { /* offline: marad a kivonat */ }
+      }
+      fillFromEntry(e);
+      catDlg.close();
+    });
+
+    catEntriesList.appendChild(li);
+  }
+
+  catDlg.showModal();
+}
+
+document.getElementById("id_kategoria").addEventListener("change", function () {
+  const v = (this.value || "").trim();
+  if (!v) return;
+  openCategoryLastEntries(v);
+});
+
+function escapeHtml(s) {
+  return (s || "").replace(/[&<>"']/g, c => ({
+    "&":"&amp;","<":"&lt;",">":"&gt;",'"':"&quot;","'":"&#39;"
+  }[c]));
+}
+
+function linkifyEscaped(escaped) {
+  const urlRe = /(https?:\/\/[^\s<]+)|(www\.[^\s<]+)/g;
+  return (escaped || "").replace(urlRe, (m) => {
+    const href = m.startsWith("www.") ? ("https://" + m) : m;
+    return `<a href="${href}" target="_blank" rel="noopener noreferrer">${m}</a>`;
+  });
+}
+
+function renderMegjegyzesViewFromTextarea() {
+  const ta = document.getElementById("id_megjegyzes");
+  const view = document.getElementById("megjegyzes_view");
+  if (!ta || !view) return;
+  const v = (ta.value || "").trim();
+  if (!v) {
+    view.innerHTML = '<span style="color:#888;">(nincs megjegyzés)</span>';
+    return;
+  }
+  // View mód: kattintható linkek
+  view.innerHTML = linkifyEscaped(escapeHtml(v)).replace(/\n/g, "<br>");
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+  const ta = document.getElementById("id_megjegyzes");
+  const viewWrap = document.getElementById("megjegyzes_view_wrap");
+  const editWrap = document.getElementById("megjegyzes_edit_wrap");
+  const view = document.getElementById("megjegyzes_view");
+  const done = document.getElementById("megjegyzes_done");
+
+  if (!ta || !viewWrap || !editWrap || !view || !done) return;
+
+  // Alap: ha van már szöveg, view mód indul; ha üres, edit mód indul.
+  const hasText = (ta.value || "").trim().length > 0;
+  if (hasText) {
+    renderMegjegyzesViewFromTextarea();
+    viewWrap.style.display = "block";
+    editWrap.style.display = "none";
+  } else {
+    viewWrap.style.display = "none";
+    editWrap.style.display = "block";
+  }
+
+  // View -> Edit
+  view.addEventListener("click", (e) => {
+    // ha linkre kattint, nyíljon meg, ne váltson edit módra
+    if (e.target && e.target.tagName === "A") return;
+    editWrap.style.display = "block";
+    viewWrap.style.display = "none";
+    ta.focus();
+  });
+
+  // Edit -> View (nem ment, csak visszavált)
+  done.addEventListener("click", () => {
+    const nowHasText = (ta.value || "").trim().length > 0;
+    if (!nowHasText) {
+      viewWrap.style.display = "none";
+      editWrap.style.display = "block";
+      return;
+    }
+    renderMegjegyzesViewFromTextarea();
+    viewWrap.style.display = "block";
+    editWrap.style.display = "none";
+  });
+});
+
+// Tevékenység-javaslatok: gépelés közben a szerver memóriabeli prefix indexéből.
+(function () {
+  const ta = document.getElementById("id_tevekenyseg");
+  const ul = document.getElementById("tev_javaslatok");
+  if (!ta || !ul) return;
+
+  let timer = null;
+  let seq = 0;
+  let aktiv = -1;
+
+  function bezar() { ul.hidden = true; ul.innerHTML = ""; aktiv = -1; }
+
+  function valaszt(szoveg) {
+    ta.value = szoveg;
+    ta.dispatchEvent(new Event("input", { bubbles: true }));
+    bezar();
+    ta.focus();
+  }
+
+  function jelol(i) {
+    const items = ul.querySelectorAll("li");
+    items.forEach((li, j) => li.classList.toggle("aktiv", j === i));
+    aktiv = i;
+  }
+
+  async function lekér(q) {
+    const my = ++seq;
+    const res = await fetch(`/naplo/api/tevekenyseg-javaslat/?q=${encodeURIComponent(q)}&limit=8`);
+    const data = await res.json();
+    if (my !== seq) return;  // közben már újabb kérés indult
+
+    ul.innerHTML = "";
+    const list = (data.javaslatok || []).filter(j => j.tevekenyseg !== ta.value);
+    if (!list.length) { bezar(); return; }
+
+    for (const j of list) {
+      const li = document.createElement("li");
+      li.innerHTML = `<span>${escapeHtml(j.tevekenyseg)}</span><span class="db">${j.db}× • ${escapeHtml(j.utolso)}</span>`;
+      li.addEventListener("mousedown", (e) => { e.preventDefault(); valaszt(j.tevekenyseg); });
+      ul.appendChild(li);
+    }
+    aktiv = -1;
+    ul.hidden = false;
+  }
+
+  ta.addEventListener("input", (e) => {
+    if (!e.isTrusted) return;  // programozott kitöltés (modal) ne nyissa meg
+    const q = ta.value.trim();
+    clearTimeout(timer);
+    if (q.length < 2 || q.includes("\n")) { bezar(); return; }
+    timer = setTimeout(() => lekér(q), 80);
+  });
+
+  ta.addEventListener("keydown", (e) => {
+    if (ul.hidden) return;
+    const items = ul.querySelectorAll("li");
+    if (e.key === "ArrowDown") { e.preventDefault(); jelol(Math.min(items.length - 1, aktiv + 1)); }
+    else if (e.key === "ArrowUp") { e.preventDefault(); jelol(Math.max(0, aktiv - 1)); }
+    else if (e.key === "Enter" && aktiv >= 0) { e.preventDefault(); items[aktiv].dispatchEvent(new Event("mousedown")); }
+    else if (e.key === "Escape") { bezar(); }
+  });
+
+  ta.addEventListener("blur", () => setTimeout(bezar, 100));
+})();
@@ -0,0 +1,106 @@
+/* Offline bevitel: kapcsolat nélkül az új sor a várólistába kerül (IndexedDB),
+   és a service worker a kapcsolat visszatérésekor egy kérésben küldi be. */
+(function () {
+  "use strict";
+
+  const form = document.querySelector("form[method=post]");
+  const jelzo = document.getElementById("varolista_jelzo");
+  if (!form || !jelzo || !window.indexedDB) return;
+
+  const SYNC_TAG = "naplo-varolista";
+  const ujSor = () => !/\/bevitel\/\d+\/?$/.test(location.pathname);   // szerkesztés nem mehet offline
+
+  function csrf() {
+    const i = form.querySelector("[name=csrfmiddlewaretoken]");
+    return i ? i.value : "";
+  }
+
+  function sorAdat() {
+    const sor = {};
+    for (const [k, v] of new FormData(form).entries()) {
+      if (k === "csrfmiddlewaretoken") continue;
+      if (k === "eletkerek_focus") (sor[k] = sor[k] || []).push(v);
+      else sor[k] = v;
+    }
+    return sor;
+  }
+
+  function hhmm(perc) {
+    perc = ((perc % 1440) + 1440) % 1440;
+    return String(Math.floor(perc / 60)).padStart(2, "0") + ":" + String(perc % 60).padStart(2, "0");
+  }
+
+  // a következő sor a mentett végétől indul (éjfél után a dátum is lép), mint a szerveren
+  function kovetkezoAlapertek(sor) {
+    const [kh, km] = (sor.kezdet || "0:0").split(":").map(Number);
+    const [vh, vm] = (sor.veg || "0:0").split(":").map(Number);
+    const veg = vh * 60 + vm;
+    if (sor.datum && veg < kh * 60 + km) {
+      const d = new Date(sor.datum + "T00:00:00");
+      d.setDate(d.getDate() + 1);
+      form.elements.datum.value = d.getFullYear() + "-" + String(d.getMonth() + 1).padStart(2, "0") + "-" + String(d.getDate()).padStart(2, "0");
+    }
+    form.elements.kezdet.value = hhmm(veg);
+    form.elements.veg.value = hhmm(veg + 30);
+    form.elements.tevekenyseg.value = "";
+    if (form.elements.megjegyzes) form.elements.megjegyzes.value = "";
+    form.elements.kezdet.dispatchEvent(new Event("input"));
+  }
+
+  async function frissitJelzo() {
+    const elemek = await NaploVarolista.osszes();
+    const hibas = elemek.filter(e => e.hiba);
+    jelzo.hidden = elemek.length === 0;
+    jelzo.classList.toggle("hibas", hibas.length > 0);
+    jelzo.textContent = hibas.length
+      ? `${elemek.length} sor offline várólistán, ${hibas.length} hibás`
+      : `${elemek.length} sor offline várólistán`;
+    jelzo.title = hibas.map(e => `${e.sor.datum} ${e.sor.kezdet} ${e.sor.tevekenyseg}: ${JSON.stringify(e.hiba)}`).join("\n");
+  }
+
+  async function szinkronKeres() {
+    if ("serviceWorker" in navigator && navigator.serviceWorker.controller) {
+      const reg = await navigator.serviceWorker.ready;
+      if (reg.sync) {
+        try { await reg.sync.register(SYNC_TAG); return; } catch (e) { /* pl. nincs engedély: üzenettel */ }
+      }
+      reg.active.postMessage({ tipus: "szinkron" });
+      return;
+    }
+    try { await NaploVarolista.szinkron(); } finally { frissitJelzo(); }
+  }
+
+  // bevitel_kuldes.js hívja: offline, vagy ha a küldés hálózati hibával elbukott
+  async function sorbaAllit() {
+    if (!ujSor()) return false;
+    const sor = sorAdat();
+    await NaploVarolista.hozzaad(sor, csrf());
+    kovetkezoAlapertek(sor);
+    await frissitJelzo();
+    szinkronKeres();   // Background Sync: akkor fut, amikor visszajön a kapcsolat
+    return true;
+  }
+  window.NaploOffline = { sorbaAllit };
+
+  // a hibás (szerver által elutasított) sorok listája és eldobása
+  jelzo.addEventListener("click", async () => {
+    const hibas = (await NaploVarolista.osszes()).filter(e => e.hiba);
+    if (!hibas.length) return;
+    if (confirm(jelzo.title + "\n\nEldobod a hibás sorokat?")) {
+      for (const e of hibas) await NaploVarolista.torol(e.client_id);
+      frissitJelzo();
+    }
+  });
+
+  if ("serviceWorker" in navigator) {
+    navigator.serviceWorker.register(jelzo.dataset.swUrl).catch(() => {});
+    navigator.serviceWorker.addEventListener("message", (e) => {
+      if (e.data && e.data.tipus === "szinkron-kesz") frissitJelzo();
+    });
+  }
+  window.addEventListener("online", szinkronKeres);
+
+  frissitJelzo().then(async () => {
+    if (navigator.onLine && (await NaploVarolista.osszes()).some(e => !e.hiba)) szinkronKeres();
+  });
+})();
@@ -0,0 +1,77 @@
+/* Offline várólista új naplósorokhoz (IndexedDB).
+   Az oldal (offline_bevitel.js) és a service worker (sw.js) is ezt használja. */
+(function (g) {
+  "use strict";
+
+  const DB_NEV = "hmnaplo";
+  const TAR = "varolista";
+  const SZINKRON_URL = "/naplo/api/bevitel-tomeges/";
+  const MAX_SOR = 500;   // = views.TOMEGES_MAX_SOR
+
+  function megnyit() {
+    return new Promise((resolve, reject) => {
+      const req = indexedDB.open(DB_NEV, 1);
+      req.onupgradeneeded = () => req.result.createObjectStore(TAR, { keyPath: "client_id" });
+      req.onsuccess = () => resolve(req.result);
+      req.onerror = () => reject(req.error);
+    });
+  }
+
+  async function tranzakcio(mod, fn) {
+    const db = await megnyit();
+    return new Promise((resolve, reject) => {
+      const tx = db.transaction(TAR, mod);
+      const req = fn(tx.objectStore(TAR));
+      tx.oncomplete = () => { db.close(); resolve(req ? req.result : undefined); };
+      tx.onerror = () => { db.close(); reject(tx.error); };
+    });
+  }
+
+  function ujAzonosito() {
+    if (g.crypto && g.crypto.randomUUID) return g.crypto.randomUUID();
+    return Date.now().toString(16) + "-" + Math.random().toString(16).slice(2);
+  }
+
+  async function hozzaad(sor, csrf) {
+    const elem = { client_id: ujAzonosito(), sor, csrf, sorba_allitva: new Date().toISOString(), hiba: null };
+    await tranzakcio("readwrite", s => s.put(elem));
+    return elem;
+  }
+
+  function osszes() {
+    return tranzakcio("readonly", s => s.getAll());
+  }
+
+  // A hibásnak jelzett sorokat nem küldjük újra (javítás nélkül úgyis elbuknának).
+  async function szinkron() {
+    const varok = (await osszes()).filter(e => !e.hiba);
+    let mentve = 0, hibas = 0;
+
+    for (let i = 0; i < varok.length; i += MAX_SOR) {
+      const csomag = varok.slice(i, i + MAX_SOR);
+      const res = await fetch(SZINKRON_URL, {
+        method: "POST",
+        credentials: "same-origin",
+        headers: { "Content-Type": "application/json", "X-CSRFToken": csomag[csomag.length - 1].csrf },
+        body: JSON.stringify({ rows: csomag.map(e => Object.assign({}, e.sor, { client_id: e.client_id })) }),
+      });
+      if (!res.ok) throw new Error("Szinkron hiba: HTTP " + res.status);
+      const data = await res.json();
+
+      await tranzakcio("readwrite", s => {
+        for (const r of data.results) {
+          const e = csomag[r.index];
+          if (r.status === "ok" || r.status === "duplikatum") { s.delete(e.client_id); mentve++; }
+          else { e.hiba = r.errors || { __all__: ["Ismeretlen hiba."] }; s.put(e); hibas++; }
+        }
+      });
+    }
+    return { mentve, hibas };
+  }
+
+  function torol(clientId) {
+    return tranzakcio("readwrite", s => s.delete(clientId));
+  }
+
+  g.NaploVarolista = { hozzaad, osszes, szinkron, torol };
+})(self);
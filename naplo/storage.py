@@ -0,0 +1,61 @@
+"""
+Statikus fájlok: hash-elt nevek + előtömörített változatok.
+
+A collectstatic után minden tömöríthető fájl mellé .gz (és ha a `brotli`
+csomag telepítve van, .br) is kerül, így a webszerver (nginx gzip_static /
+brotli_static) vagy a views.statikus_fajl tömörítés nélkül küldheti.
+
+A collectstatic előtt (fejlesztés, tesztek, mérések DEBUG=False mellett) a
+{% static %} nem dob hibát: a hash nélküli név megy ki, a hashelt csak a
+collectstatic kimenetéből.
+"""
+import gzip
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # opcionális: nélküle csak .gz készül
+    brotli = None
+
+
+TOMORITHETO_KITERJESZTESEK = (".css", ".js", ".svg", ".json", ".txt", ".html", ".map", ".xml")
+
+
+class TomoritettManifestStorage(ManifestStaticFilesStorage):
+    # a manifestből hiányzó fájl neve a STATIC_ROOT-beli tartalomból hash-elődik
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # nincs a STATIC_ROOT-ban (nem futott collectstatic): a hash nélküli név
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        min_bajt = getattr(settings, "NAPLO_TOMORITES_MIN_BAJT", 1024)
+        nevek = set(paths) | set(self.hashed_files.values())
+        for nev in sorted(nevek):
+            if not nev.endswith(TOMORITHETO_KITERJESZTESEK) or not self.exists(nev):
+                continue
+            with self.open(nev) as f:
+                tartalom = f.read()
+            if len(tartalom) < min_bajt:
+                continue
+            self._valtozat(nev + ".gz", gzip.compress(tartalom, compresslevel=9, mtime=0), len(tartalom))
+            if brotli is not None:
+                self._valtozat(nev + ".br", brotli.compress(tartalom), len(tartalom))
+
+    def _valtozat(self, nev, adat, eredeti_meret):
+        if len(adat) >= eredeti_meret:
+            return
+        if self.exists(nev):
+            self.delete(nev)
+        self._save(nev, ContentFile(adat))
@@ -0,0 +1,235 @@
+"""
+Szintetikus napló-adat mérésekhez (gen_naplo, bench_nezetek parancsok).
+
+Élethű szerkezet: napi ébredés – teendők – alvás, az alvás átlépi az éjfélt;
+néha hézag, néha párhuzamos sor (biciklizés közben hangoskönyv), 1–3
+életkerék-terület soronként, magyar szövegek. Ugyanaz a seed ugyanazt adja.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+from django.db import connection, transaction
+from django.urls import reverse
+
+from .autocomplete import tevekenyseg_index
+from .cache import adat_valtozott
+from .celok import cel_osszesito_ujraepites
+from .forms import ELETKEREK_CHOICES
+from .integritas import idovonal_ellenorzes, idovonal_mentes
+from .kereses import arnyek_mezok_kitoltese
+from .models import CelOsszesito, IdovonalEllenorzes, NaploSor, Param, ValtozasNaplo
+from .urls import urlpatterns
+from .valtozasok import utolso_sorszam, valtozasok_tomegesen
+
+
+# kategória -> (tevékenység-minták, kapcsolódó, szerep, jellemző életkerék-területek)
+SABLONOK = {
+    "Étkezés": (["Reggeli: zabkása gyümölccsel", "Ebéd a családdal", "Vacsora – zöldséges tészta",
+                 "Uzsonna, gyors kávé"], ["Önmagam", "Család"], ["test-ápoló", "férj"], ["EGESZSEG", "EMBEREK"]),
+    "Munka": (["Ügyfélegyeztetés, ajánlatírás", "Számlák rendezése", "Heti tervezés és priorizálás",
+               "E-mailek feldolgozása"], ["Kolléga", "Ügyfél"], ["ügyvezető"], ["MUNKA", "PENZUGY"]),
+    "Autózás": (["Autózás a Skodával a pályáról haza", "Autózás munkába", "Bevásárlás autóval"],
+                ["Skoda", "Önmagam"], ["sofőr"], ["MUNKA"]),
+    "Biciklizés": (["Biciklizés a Duna-parton", "Reggeli tekerés munkába", "Hosszú hétvégi túra"],
+                   ["Önmagam"], ["sportoló"], ["EGESZSEG", "HOBBI"]),
+    "Hangoskönyv hallgatás": (["Szepes Mária – A vörös oroszlán", "Gregg Braden – Az emberiség ereje",
+                               "Michael Easter – A telhetetlen agy"], ["Önmagam"], ["érdeklődő"],
+                              ["TANULAS", "SPIRIT"]),
+    "Tanulás, önfejlesztés": (["Django dokumentáció olvasása", "Nyelvtanulás – angol szavak",
+                               "Online kurzus: adatvizualizáció"], ["chatGPT", "Önmagam"], ["tanuló", "önfejlesztő"],
+                              ["TANULAS", "ONISMERET"]),
+    "Család": (["Játék a gyerekekkel", "Közös séta", "Beszélgetés Andival"], ["Andi", "Andi-Csongor"],
+               ["férj", "apa"], ["EMBEREK"]),
+    "Kikapcsolódás": (["Sakkozás a lichess app-pal", "Sorozatnézés", "Reels videók nézegetése"],
+                      ["Önmagam"], ["érdeklődő"], ["HOBBI"]),
+    "Test- és lélekápolás, készülődés": (["Zuhany, borotválkozás, készülődés", "Meditáció 15 perc",
+                                          "Reggeli rituálé, fogmosás"], ["Önmagam"], ["test-ápoló"],
+                                         ["EGESZSEG", "SPIRIT"]),
+    "Naplóírás": (["Részletes naplóírás a djangoban", "Napi értékelés és tervezés"], ["Önmagam"],
+                  ["önfejlesztő"], ["ONISMERET"]),
+}
+ERZELMEK = ["nyugalom", "figyelem", "elégedettség, hála", "hozzáértés", "jókedv, ráhangolódás",
+            "kitartás", "fáradtság", "türelmetlenség"]
+CELOK = [
+    "Az aktuális tudásomnak megfelelően a lehető legegészségesebben étkezem",
+    "Rendszeresen ápolom a testem, kívül-belül",
+    "5000 km letekerése",
+    "Kézben tartom a cég pénzügyeit",
+    "Minden nap tanulok valami újat",
+    "",
+]
+MEGJEGYZESEK = [
+    "", "", "",
+    "<p>Jól ment, <strong>holnap folytatom</strong>.</p>",
+    "<p>Kicsit fáradt voltam, de végigcsináltam.</p><ul><li>jegyzetek</li><li>teendők</li></ul>",
+    "<p>Érdemes lenne korábban kezdeni.</p>",
+]
+ELETKEREK_KODOK = [code for code, _ in ELETKEREK_CHOICES]
+
+
+def _sor(rnd, datum, kezdet, veg, kategoria):
+    tevek, kapcs, szerep, teruletek = SABLONOK.get(kategoria, (["Alvás"], ["Önmagam"], ["test-ápoló"], ["EGESZSEG"]))
+    fokusz = set(rnd.sample(teruletek, k=rnd.randint(1, len(teruletek))))
+    if rnd.random() < 0.2:
+        fokusz.add(rnd.choice(ELETKEREK_KODOK))
+    obj = NaploSor(
+        datum=datum,
+        kezdet=kezdet.time(),
+        veg=veg.time(),
+        ido=veg - kezdet,
+        tevekenyseg=rnd.choice(tevek),
+        ertek=rnd.randint(3, 10),
+        kategoria=kategoria,
+        kapcsolodo=rnd.choice(kapcs),
+        szerep=rnd.choice(szerep),
+        erzelem=rnd.choice(ERZELMEK),
+        kapcsolodo_cel=rnd.choice(CELOK),
+        eletkerek_focus=sorted(fokusz),
+        megjegyzes=rnd.choice(MEGJEGYZESEK),
+    )
+    arnyek_mezok_kitoltese(obj)  # bulk_create nem hívja a save()-et
+    return obj
+
+
+def general_naplo_sorok(evek, sor_per_nap, seed=1, veg_datum=None):
+    """Mentetlen NaploSor objektumok generátora, `evek` évre visszamenőleg."""
+    rnd = random.Random(seed)
+    veg_datum = veg_datum or date.today()
+    nap = veg_datum - timedelta(days=365 * evek)
+    kategoriak = list(SABLONOK)
+    ebredes = datetime.combine(nap, datetime.min.time()) + timedelta(hours=6, minutes=30)
+
+    while nap < veg_datum:
+        cur = ebredes
+        lefekves = datetime.combine(nap, datetime.min.time()) + timedelta(hours=22, minutes=rnd.randint(0, 90))
+        lepes = max(10, int((lefekves - cur).total_seconds() // 60) // max(1, sor_per_nap - 1))
+
+        for _ in range(max(0, sor_per_nap - 1)):
+            if rnd.random() < 0.08:   # néha kimarad egy kis idő
+                cur += timedelta(minutes=rnd.randint(5, 20))
+            # a hézag után is: különben a vege < cur, negatív idejű sor lenne
+            if cur >= lefekves:
+                break
+            perc = rnd.randint(max(5, lepes // 2), lepes + lepes // 2)
+            vege = min(cur + timedelta(minutes=perc), lefekves)
+            kategoria = rnd.choice(kategoriak)
+            yield _sor(rnd, nap, cur, vege, kategoria)
+            if kategoria in ("Biciklizés", "Autózás") and rnd.random() < 0.5:
+                # párhuzamos sor: közben hangoskönyv
+                yield _sor(rnd, nap, cur, vege, "Hangoskönyv hallgatás")
+            cur = vege
+
+        # alvás: éjfélen át a következő ébredésig (veg < kezdet)
+        ebredes = datetime.combine(nap + timedelta(days=1), datetime.min.time()) + timedelta(
+            hours=6, minutes=rnd.randint(0, 60)
+        )
+        yield _sor(rnd, nap, cur, ebredes, "Alvás")
+        nap += timedelta(days=1)
+
+
+def szintetikus_feltoltes(evek, sor_per_nap, seed=1, batch_size=2000):
+    """
+    A NaploSor és Param tábla feltöltése + a származtatott táblák (cél-összesítő,
+    idővonal-ellenőrzés) újraépítése. -> beszúrt sorok száma
+    """
+    uj_idk = []
+    batch = []
+    with transaction.atomic():
+        for obj in general_naplo_sorok(evek, sor_per_nap, seed=seed):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                uj_idk += [o.pk for o in NaploSor.objects.bulk_create(batch)]
+                batch = []
+        if batch:
+            uj_idk += [o.pk for o in NaploSor.objects.bulk_create(batch)]
+
+        Param.objects.bulk_create(
+            [Param(tipus="kategoria", nev=k) for k in [*SABLONOK, "Alvás"]]
+            + [Param(tipus="erzelem", nev=e) for e in ERZELMEK]
+            + [Param(tipus="cel", nev=c) for c in CELOK if c]
+            + [Param(tipus="kapcsolodo", nev=k) for s in SABLONOK.values() for k in s[1]]
+            + [Param(tipus="szerep", nev=sz) for s in SABLONOK.values() for sz in s[2]],
+            ignore_conflicts=True,
+        )
+
+    # bulk_create nem küld jelzést: a származtatott adatok kézzel
+    valtozasok_tomegesen(uj_idk)
+    cel_osszesito_ujraepites()
+    idovonal_mentes(idovonal_ellenorzes())
+    adat_valtozott()
+    tevekenyseg_index.ervenytelenit()
+    return len(uj_idk)
+
+
+# mérésből kihagyott url nevek (a többi naplo útvonal automatikusan bekerül)
+NEM_MERT = {
+    "api_bevitel": "csak POST (írási út)",
+    "api_bevitel_edit": "csak POST (írási út)",
+    "api_bevitel_tomeges": "csak POST (írási út)",
+    "api_esemenyek": "SSE stream, nem zárul le",
+    "api_profil": "csak staff",
+    "api_profil_torles": "csak staff, POST",
+}
+
+
+def meresi_vegpontok(ma):
+    """
+    (url név, url, GET paraméterek) – a naplo összes GET útvonala (urls.urlpatterns),
+    a NEM_MERT kivételével. Ahol több jellemző kérés is van, mindegyik külön sor;
+    a <pk>-s útvonalak a legutóbbi megjegyzéses sort kapják.
+    """
+    ho = {"start": (ma - timedelta(days=30)).isoformat(), "end": ma.isoformat()}
+    ev = {"start": (ma - timedelta(days=365)).isoformat(), "end": ma.isoformat()}
+    tegnap = (ma - timedelta(days=1)).isoformat()
+    vege = utolso_sorszam()
+    parameterek = {
+        # széles (az 500-as limitet elérő) és mezős keresések
+        "dashboard": [
+            {}, {"q": "a"}, {"q": "biciklizes"}, {"q": "kat:munka ertek>=7", **ev}, {"q": "nap:hétfő ido>=60"},
+        ],
+        "nap_attekintes": [{"date": tegnap}],
+        "api_kategoria_osszefoglalo": [ev],
+        "api_kategoria_bejegyzesek": [{**ho, "kategoria": "Munka"}],
+        "api_hierarchia_osszefoglalo": [ev],
+        "api_heti_hoterkep": [ev],
+        "api_idovonal_ellenorzes": [ev],
+        "api_ertek_gordulo": [ev],
+        "api_osszehasonlitas": [ho],
+        "api_eletkerek_osszefoglalo": [ev],
+        "api_eletkerek_bejegyzesek": [{**ho, "terulet": "EGESZSEG"}],
+        "api_utolso_bejegyzesek_kategoriara": [{"kategoria": "Munka"}],
+        "api_tevekenyseg_javaslat": [{"q": "bic"}, {"q": "b", "limit": 30}],
+        # teljes betöltés első oldala, és a szokásos inkrementális lekérés
+        "api_valtozasok": [{"since": 0, "limit": 1000}, {"since": max(0, vege - 50)}],
+    }
+    pk = (
+        NaploSor.objects.filter(datum__lte=ma).exclude(megjegyzes="")
+        .order_by("-datum", "-kezdet").values_list("id", flat=True).first()
+    )
+
+    out = []
+    for minta in urlpatterns:
+        if minta.name in NEM_MERT:
+            continue
+        argok = []
+        if minta.pattern.converters:
+            if pk is None:
+                continue
+            argok = [pk]
+        url = reverse(minta.name, args=argok)
+        for params in parameterek.get(minta.name, [{}]):
+            out.append((minta.name, url, params))
+    return out
+
+
+def szintetikus_torles():
+    """
+    Minden napló-adat törlése. Nyers DELETE: a QuerySet.delete() soronként
+    küldené a post_delete jelzést (napi újraellenőrzés), ez több százezer
+    sornál perceket jelentene.
+    """
+    with transaction.atomic(), connection.cursor() as cur:
+        for model in (NaploSor, Param, CelOsszesito, IdovonalEllenorzes, ValtozasNaplo):
+            cur.execute(f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}")
+    adat_valtozott()
+    tevekenyseg_index.ervenytelenit()
@@ -0,0 +1,68 @@
+{% load static %}/* HMNapló service worker: a bevitel oldal offline is betölt, a várólista
+   (sor_varolista.js) pedig a kapcsolat visszatérésekor szinkronizál (Background Sync). */
+importScripts("{% static 'naplo/js/sor_varolista.js' %}");
+
+const CACHE = "hmnaplo-bevitel-v1";
+const BEVITEL_URL = "{% url 'naplo_bevitel' %}";
+const STATIC_URL = "{% get_static_prefix %}";
+const SYNC_TAG = "naplo-varolista";
+
+self.addEventListener("install", (e) => {
+  e.waitUntil(caches.open(CACHE).then(c => c.add(BEVITEL_URL)).then(() => self.skipWaiting()));
+});
+
+self.addEventListener("activate", (e) => {
+  e.waitUntil(
+    caches.keys()
+      .then(kulcsok => Promise.all(kulcsok.filter(k => k !== CACHE).map(k => caches.delete(k))))
+      .then(() => self.clients.claim())
+  );
+});
+
+self.addEventListener("fetch", (e) => {
+  const req = e.request;
+  if (req.method !== "GET") return;
+  const url = new URL(req.url);
+  if (url.origin !== location.origin) return;
+
+  // bevitel oldal: hálózat előbb, offline a legutóbbi példány
+  if (req.mode === "navigate" && url.pathname === BEVITEL_URL) {
+    e.respondWith(
+      fetch(req)
+        .then(res => {
+          const masolat = res.clone();
+          caches.open(CACHE).then(c => c.put(BEVITEL_URL, masolat));
+          return res;
+        })
+        .catch(() => caches.match(BEVITEL_URL))
+    );
+    return;
+  }
+
+  // statikus fájlok (hash-elt nevek): cache előbb
+  if (url.pathname.startsWith(STATIC_URL)) {
+    e.respondWith(
+      caches.match(req).then(talalat => talalat || fetch(req).then(res => {
+        if (res.ok) {
+          const masolat = res.clone();
+          caches.open(CACHE).then(c => c.put(req, masolat));
+        }
+        return res;
+      }))
+    );
+  }
+});
+
+async function szinkronEsErtesites() {
+  const eredmeny = await NaploVarolista.szinkron();
+  const ablakok = await self.clients.matchAll({ type: "window" });
+  ablakok.forEach(c => c.postMessage(Object.assign({ tipus: "szinkron-kesz" }, eredmeny)));
+}
+
+self.addEventListener("sync", (e) => {
+  if (e.tag === SYNC_TAG) e.waitUntil(szinkronEsErtesites());
+});
+
+self.addEventListener("message", (e) => {
+  if (e.data && e.data.tipus === "szinkron") e.waitUntil(szinkronEsErtesites());
+});
@@ -1,3 +1,848 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import os
+import re
+import tempfile
+from datetime import date, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .autocomplete import TevekenysegIndex, kulcs
+from .kereses import KIVONAT_HOSSZ
+from .middleware import TELJES_SCAN, TomoritoMiddleware, _puffer, profil_torles
+from .models import CelOsszesito, IdovonalEllenorzes, LassuLekerdezes, NaploSor
+from .szintetikus import NEM_MERT, general_naplo_sorok, meresi_vegpontok
+from .timeline import hoterkep_racs
+from .urls import urlpatterns
+from .valtozasok import sor_adat, utolso_sorszam
+from .views import statikus_fajl
+
+
+class NaploTeszt(TestCase):
+    def setUp(self):
+        cache.clear()
+
+
+def uj_sor(**mezok):
+    adat = {
+        "datum": date(2025, 3, 3),
+        "kezdet": time(9, 0),
+        "veg": time(10, 0),
+        "tevekenyseg": "Tanítás",
+        "kategoria": "Munka",
+    }
+    adat.update(mezok)
+    return NaploSor.objects.create(**adat)
+
+
+class DashboardKeresesTeszt(NaploTeszt):
+    def setUp(self):
+        super().setUp()
+        uj_sor()
+        uj_sor(datum=date(2025, 3, 4), tevekenyseg="Futás", kategoria="Sport")
+
+    def test_csak_hibas_mezo_nem_ad_teljes_naplot(self):
+        r = self.client.get(reverse("dashboard"), {"q": "ertek>=abc"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.context["results"], [])
+        self.assertEqual(r.context["summary"]["count"], 0)
+        self.assertEqual(r.context["hibak"], ["ertek: nem szám (abc)"])
+
+    def test_hibas_mezo_mellett_a_szabad_szoveg_szur(self):
+        r = self.client.get(reverse("dashboard"), {"q": "ertek>=abc futas"})
+        self.assertEqual([s.tevekenyseg for s in r.context["results"]], ["Futás"])
+        self.assertEqual(len(r.context["hibak"]), 1)
+
+
+class TevekenysegJavaslatTeszt(NaploTeszt):
+    def _index(self, adat):
+        index = TevekenysegIndex()
+        index._adat = {szoveg: list(e) for szoveg, e in adat.items()}
+        index._rendezett = sorted((kulcs(s), s) for s in adat)
+        index._kesz = True
+        return index
+
+    def test_a_teljes_prefix_szakasz_pontozodik(self):
+        ma = date(2025, 3, 1)
+        adat = {f"a{i:04d}": (1, ma - timedelta(days=400)) for i in range(600)}
+        # ábécé szerint a 600 ritka kulcs után: gyakori és friss
+        adat["azsonglorkodes"] = (50, ma)
+        index = self._index(adat)
+
+        javaslat = index.javasol("a", limit=3, ma=ma)
+        self.assertEqual(javaslat[0][0], "azsonglorkodes")
+        self.assertEqual(len(javaslat), 3)
+
+    def test_prefixen_kivuli_kulcs_nem_jon(self):
+        ma = date(2025, 3, 1)
+        index = self._index({"Ebéd": (3, ma), "Edzés": (9, ma), "Futás": (20, ma)})
+        self.assertEqual([j[0] for j in index.javasol("e", ma=ma)], ["Edzés", "Ebéd"])
+        self.assertEqual([j[0] for j in index.javasol("eb", ma=ma)], ["Ebéd"])
+
+
+class AdminTomegesMuveletTeszt(NaploTeszt):
+    def setUp(self):
+        super().setUp()
+        admin_user = User.objects.create_superuser("admin", "admin@example.com", "jelszo")
+        self.client.force_login(admin_user)
+
+    def test_atkategorizalas_frissiti_a_modositva_mezot(self):
+        sor = uj_sor()
+        regi = timezone.now() - timedelta(days=1)
+        NaploSor.objects.filter(pk=sor.pk).update(modositva=regi)
+
+        r = self.client.post(reverse("admin:naplo_naplosor_changelist"), {
+            "action": "kategoria_atallitas",
+            "_selected_action": [sor.pk],
+            "uj_kategoria": "Pihenés",
+        })
+        self.assertEqual(r.status_code, 302)
+        sor.refresh_from_db()
+        self.assertEqual(sor.kategoria, "Pihenés")
+        self.assertGreater(sor.modositva, regi)
+
+
+class OsszehasonlitasTeszt(NaploTeszt):
+    def _ref(self, **params):
+        r = self.client.get(reverse("api_osszehasonlitas"), params)
+        self.assertEqual(r.status_code, 200)
+        return r.json()["ref"]
+
+    def test_egesz_honap_az_elozo_naptari_honappal(self):
+        uj_sor(datum=date(2025, 1, 30))
+        uj_sor(datum=date(2025, 2, 1))
+        uj_sor(datum=date(2025, 3, 3))
+        ref = self._ref(start="2025-03-01", end="2025-03-31")
+        self.assertEqual((ref["start"], ref["end"], ref["mod"]), ("2025-02-01", "2025-02-28", "naptari_honap"))
+        # a 31 napos visszalépés (jan. 29–febr. 28) a jan. 30-i sort is beszámolná
+        self.assertEqual(ref["total_minutes"], 60)
+
+    def test_tobb_honap_evhatarral(self):
+        ref = self._ref(start="2025-01-01", end="2025-02-28")
+        self.assertEqual((ref["start"], ref["end"]), ("2024-11-01", "2024-12-31"))
+
+    def test_nem_egesz_honap_ugyanolyan_hosszu_elozo_idoszak(self):
+        ref = self._ref(start="2025-03-10", end="2025-03-16")
+        self.assertEqual((ref["start"], ref["end"], ref["mod"]), ("2025-03-03", "2025-03-09", "elozo_idoszak"))
+
+    def test_megadott_referencia(self):
+        ref = self._ref(start="2025-03-01", end="2025-03-31", ref_start="2024-03-01", ref_end="2024-03-31")
+        self.assertEqual((ref["start"], ref["end"], ref["mod"]), ("2024-03-01", "2024-03-31", "megadott"))
+
+
+class MeresiVegpontokTeszt(NaploTeszt):
+    def test_minden_get_utvonal_mert_es_valaszol(self):
+        uj_sor(megjegyzes="Jegyzet")
+        vegpontok = meresi_vegpontok(date(2025, 3, 4))
+
+        nevek = {nev for nev, _, _ in vegpontok}
+        self.assertEqual(nevek | set(NEM_MERT), {m.name for m in urlpatterns})
+        for nev, url, params in vegpontok:
+            with self.subTest(nev=nev, params=params):
+                self.assertEqual(self.client.get(url, params).status_code, 200)
+
+
+class BevitelTomegesTeszt(NaploTeszt):
+    def _kuld(self, *sorok):
+        r = self.client.post(
+            reverse("api_bevitel_tomeges"), json.dumps({"rows": list(sorok)}), content_type="application/json",
+        )
+        self.assertEqual(r.status_code, 200)
+        return r.json()
+
+    def _sor(self, client_id, kezdet="08:00", veg="08:30"):
+        return {"client_id": client_id, "datum": "2025-03-03", "kezdet": kezdet, "veg": veg,
+                "tevekenyseg": "Offline bejegyzés", "ertek": 5, "kategoria": "Munka"}
+
+    def test_ujrakuldott_sor_duplikatum(self):
+        elso = self._kuld(self._sor("a"))
+        masodik = self._kuld(self._sor("a"))
+        self.assertEqual(masodik["results"][0]["status"], "duplikatum")
+        self.assertEqual(masodik["results"][0]["id"], elso["results"][0]["id"])
+        self.assertEqual(masodik["mentve"], 0)
+        self.assertEqual(NaploSor.objects.count(), 1)
+
+    def test_keresen_beluli_ismetlodes_hiba(self):
+        valasz = self._kuld(self._sor("a"), self._sor("a", "09:00", "09:30"))
+        self.assertEqual([r["status"] for r in valasz["results"]], ["ok", "hiba"])
+        self.assertIn("client_id", valasz["results"][1]["errors"])
+        self.assertEqual(valasz["mentve"], 1)
+
+    def test_hibas_sor_nem_allitja_meg_a_tobbit(self):
+        valasz = self._kuld({**self._sor("a"), "datum": "nem dátum"}, "nem objektum", self._sor("b"))
+        self.assertEqual([r["status"] for r in valasz["results"]], ["hiba", "hiba", "ok"])
+        self.assertIn("datum", valasz["results"][0]["errors"])
+        self.assertEqual(valasz["mentve"], 1)
+        self.assertEqual(list(NaploSor.objects.values_list("kliens_id", flat=True)), ["b"])
+
+    def test_parhuzamos_beszuras_duplikatum_nem_500(self):
+        eredeti = NaploSor.szamitott_mezok
+        elozo = {}
+
+        def kozben_beszur(obj):
+            # a meglévők ellenőrzése után, a beszúrás előtt ér be a másik kérés
+            if not elozo:
+                elozo["sor"] = None   # a save() is hívja: ne fusson újra
+                elozo["sor"] = uj_sor(kliens_id="a", kezdet=time(7, 0), veg=time(7, 30))
+            return eredeti(obj)
+
+        with mock.patch.object(NaploSor, "szamitott_mezok", autospec=True, side_effect=kozben_beszur):
+            valasz = self._kuld(self._sor("a"), self._sor("b"))
+
+        self.assertEqual(
+            [(r["status"], r["id"]) for r in valasz["results"]],
+            [("duplikatum", elozo["sor"].pk), ("ok", NaploSor.objects.get(kliens_id="b").pk)],
+        )
+        self.assertEqual(valasz["mentve"], 1)
+
+
+class ImportCsvTeszt(NaploTeszt):
+    CSV = (
+        "Dátum;Kezd;Vég;Idő;Tevékenység;Érték;Kategória;Kapcsolódó cél\n"
+        "2025. március 3., hétfő;08:00;09:00;1:00;Tervezés;7;Munka;Projekt\n"
+        "2025. március 3., hétfő;09:30;10:00;0:30;Kávé;;Pihenés;\n"
+        "2025. március 4., kedd;rossz;10:00;0:30;Átugrott;;Munka;\n"
+        "2025. március 4., kedd;23:00;01:00;2:00;Alvás;;Alvás;\n"
+    )
+
+    def test_import_a_szarmaztatott_adatokkal_egyutt(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8") as f:
+            f.write(self.CSV)
+            f.flush()
+            call_command("import_excel_csv", f.name, stdout=io.StringIO())
+
+        self.assertEqual(NaploSor.objects.count(), 3)
+        alvas = NaploSor.objects.get(tevekenyseg="Alvás")
+        self.assertEqual(alvas.ido, timedelta(hours=2))
+        self.assertEqual(alvas.kategoria_norm, "alvas")
+        self.assertEqual(CelOsszesito.objects.get(cel="Projekt").osszes_ido, timedelta(hours=1))
+        hetfo = IdovonalEllenorzes.objects.get(datum=date(2025, 3, 3))
+        self.assertEqual((hetfo.sorok, hetfo.hezag_db, hetfo.hezag_perc), (2, 1, 30))
+        self.assertTrue(IdovonalEllenorzes.objects.filter(datum=date(2025, 3, 4)).exists())
+
+
+class SzintetikusTeszt(NaploTeszt):
+    def test_nincs_nem_pozitiv_ideju_sor_es_a_hoterkep_osszege_egyezik(self):
+        sorok = [(s.kategoria, s.datum, s.kezdet, s.ido) for s in general_naplo_sorok(1, 15)]
+        self.assertGreater(min(s[3] for s in sorok), timedelta(0))
+
+        racsok = hoterkep_racs(iter(sorok))
+        racs_sec = sum(sec for racs in racsok.values() for nap in racs for sec in nap)
+        self.assertEqual(racs_sec, sum(s[3].total_seconds() for s in sorok))
+
+
+class HierarchiaTeszt(NaploTeszt):
+    def _osszeg_egyezik(self, node):
+        if "children" in node:
+            self.assertEqual(node["minutes"], sum(c["minutes"] for c in node["children"]), node["name"])
+            for c in node["children"]:
+                self._osszeg_egyezik(c)
+
+    def test_szulo_perce_a_gyerekek_osszege(self):
+        # tevékenységenként 50 mp: külön kerekítve mind 0 perc lenne, a Munka együtt 2 perc
+        for i, tev in enumerate(["Olvasás", "Írás", "Számolás"]):
+            uj_sor(tevekenyseg=tev, kezdet=time(8 + i, 0), veg=time(8 + i, 0, 50))
+        uj_sor(tevekenyseg="Futás", kategoria="Sport", kezdet=time(12, 0), veg=time(12, 1, 30))
+        uj_sor(tevekenyseg="Úszás", kategoria="Sport", kezdet=time(13, 0), veg=time(13, 0, 40))
+
+        r = self.client.get(reverse("api_hierarchia_osszefoglalo"),
+                            {"start": "2025-03-03", "end": "2025-03-03", "szintek": "kategoria,tevekenyseg", "top": 2})
+        root = r.json()["root"]
+        self.assertEqual(root["minutes"], (3 * 50 + 90 + 40) // 60)
+        self._osszeg_egyezik(root)
+        munka = next(c for c in root["children"] if c["name"] == "Munka")
+        # top=2: a harmadik tevékenység az 'Egyéb' csomópontba kerül
+        self.assertTrue(munka["children"][-1]["egyeb"])
+        self.assertEqual(sorted(c["minutes"] for c in munka["children"]), [0, 1, 1])
+
+
+class CelOsszesitoTeszt(NaploTeszt):
+    def assertEgyezikAzUjraepitessel(self):
+        def allapot():
+            return sorted(CelOsszesito.objects.values_list("cel", "osszes_ido", "sorok", "elso_datum", "utolso_datum"))
+
+        inkrementalis = allapot()
+        call_command("build_cel_osszesito", stdout=io.StringIO())
+        self.assertEqual(inkrementalis, allapot())
+        return inkrementalis
+
+    def setUp(self):
+        super().setUp()
+        self.elso = uj_sor(datum=date(2025, 3, 1), kapcsolodo_cel="Maraton")
+        self.kozepso = uj_sor(datum=date(2025, 3, 5), kapcsolodo_cel="Maraton", kezdet=time(6, 0), veg=time(7, 30))
+        self.utolso = uj_sor(datum=date(2025, 3, 9), kapcsolodo_cel="Maraton")
+        uj_sor(datum=date(2025, 3, 2), kapcsolodo_cel="Könyv")
+
+    def test_letrehozas(self):
+        allapot = self.assertEgyezikAzUjraepitessel()
+        self.assertIn(("Maraton", timedelta(hours=3, minutes=30), 3, date(2025, 3, 1), date(2025, 3, 9)), allapot)
+
+    def test_ido_es_datum_modositas(self):
+        self.kozepso.veg = time(8, 0)
+        self.kozepso.save()
+        self.utolso.datum = date(2025, 3, 20)
+        self.utolso.save()
+        self.assertEgyezikAzUjraepitessel()
+        # a szélső sor korábbra kerül: az utolsó dátum újraszámolódik
+        self.utolso.datum = date(2025, 3, 4)
+        self.utolso.save()
+        allapot = self.assertEgyezikAzUjraepitessel()
+        self.assertIn(("Maraton", timedelta(hours=4), 3, date(2025, 3, 1), date(2025, 3, 5)), allapot)
+
+    def test_cel_csere(self):
+        self.elso.kapcsolodo_cel = "Könyv"
+        self.elso.save()
+        allapot = self.assertEgyezikAzUjraepitessel()
+        self.assertIn(("Maraton", timedelta(hours=2, minutes=30), 2, date(2025, 3, 5), date(2025, 3, 9)), allapot)
+        # cél elhagyása: a sor kikerül az összesítőből
+        self.kozepso.kapcsolodo_cel = ""
+        self.kozepso.save()
+        self.assertEgyezikAzUjraepitessel()
+
+    def test_torles(self):
+        self.utolso.delete()
+        self.assertEgyezikAzUjraepitessel()
+        self.elso.delete()
+        allapot = self.assertEgyezikAzUjraepitessel()
+        self.assertIn(("Maraton", timedelta(hours=1, minutes=30), 1, date(2025, 3, 5), date(2025, 3, 5)), allapot)
+        # az utolsó sor törlésével a cél sora is megszűnik
+        self.kozepso.delete()
+        self.assertNotIn("Maraton", [c for c, *_ in self.assertEgyezikAzUjraepitessel()])
+
+    def test_tomeges_beszuras(self):
+        sorok = [
+            {"client_id": f"t{i}", "datum": f"2025-02-{20 + i}", "kezdet": "08:00", "veg": "08:45",
+             "tevekenyseg": "Edzés", "kategoria": "Sport", "kapcsolodo_cel": cel}
+            for i, cel in enumerate(["Maraton", "Maraton", "Új cél"])
+        ]
+        r = self.client.post(reverse("api_bevitel_tomeges"), json.dumps({"rows": sorok}),
+                             content_type="application/json")
+        self.assertEqual(r.json()["mentve"], 3)
+        allapot = self.assertEgyezikAzUjraepitessel()
+        self.assertIn(("Maraton", timedelta(hours=5), 5, date(2025, 2, 20), date(2025, 3, 9)), allapot)
+
+    def test_csv_import(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8") as f:
+            f.write(
+                "Dátum;Kezd;Vég;Idő;Tevékenység;Kategória;Kapcsolódó cél\n"
+                "2025. március 12., szerda;07:00;08:00;1:00;Futás;Sport;Maraton\n"
+                "2025. február 1., szombat;20:00;21:00;1:00;Olvasás;Tanulás;Könyv\n"
+            )
+            f.flush()
+            call_command("import_excel_csv", f.name, stdout=io.StringIO())
+        allapot = self.assertEgyezikAzUjraepitessel()
+        self.assertIn(("Könyv", timedelta(hours=2), 2, date(2025, 2, 1), date(2025, 3, 2)), allapot)
+
+
+class NapCacheTeszt(NaploTeszt):
+    HETFO, KEDD = date(2025, 3, 3), date(2025, 3, 4)
+
+    def setUp(self):
+        super().setUp()
+        self.sor = uj_sor(datum=self.HETFO, tevekenyseg="Óratartás")
+        uj_sor(datum=self.HETFO, kezdet=time(11, 0), veg=time(11, 30), tevekenyseg="Ebéd", kategoria="Étkezés")
+        uj_sor(datum=self.KEDD, tevekenyseg="Úszás", kategoria="Sport")
+        admin_user = User.objects.create_superuser("admin", "admin@example.com", "jelszo")
+        self.client.force_login(admin_user)
+
+    def _nap(self, d):
+        r = self.client.get(reverse("nap_attekintes"), {"date": d.isoformat()})
+        self.assertEqual(r.status_code, 200)
+        return r.context
+
+    def _sorok(self, d):
+        return [(e.tevekenyseg, e.kategoria) for e in self._nap(d)["entries"]]
+
+    def test_a_mult_napja_cachelt(self):
+        self._nap(self.HETFO)
+        # jelzés nélküli módosítás: a cache-elt nap a régit mutatja
+        NaploSor.objects.filter(pk=self.sor.pk).update(tevekenyseg="Jelzés nélkül")
+        self.assertIn(("Óratartás", "Munka"), self._sorok(self.HETFO))
+
+    def test_modositas_athelyezes_es_tomeges_muvelet_utan_friss(self):
+        self._nap(self.HETFO)
+        self._nap(self.KEDD)
+
+        self.sor.tevekenyseg = "Dolgozatjavítás"
+        self.sor.save()
+        self.assertEqual(self._sorok(self.HETFO), [("Dolgozatjavítás", "Munka"), ("Ebéd", "Étkezés")])
+        self.assertEqual(self._sorok(self.KEDD), [("Úszás", "Sport")])
+
+        self.sor.datum = self.KEDD
+        self.sor.save()
+        hetfo, kedd = self._nap(self.HETFO), self._nap(self.KEDD)
+        self.assertEqual([e.tevekenyseg for e in hetfo["entries"]], ["Ebéd"])
+        self.assertEqual(hetfo["total_minutes"], 30)
+        self.assertEqual([e.tevekenyseg for e in kedd["entries"]], ["Dolgozatjavítás", "Úszás"])
+        self.assertEqual(kedd["total_minutes"], 120)
+
+        r = self.client.post(reverse("admin:naplo_naplosor_changelist"), {
+            "action": "kategoria_atallitas",
+            "_selected_action": list(NaploSor.objects.values_list("pk", flat=True)),
+            "uj_kategoria": "Átsorolt",
+        })
+        self.assertEqual(r.status_code, 302)
+        self.assertEqual(self._sorok(self.HETFO), [("Ebéd", "Átsorolt")])
+        self.assertEqual(self._sorok(self.KEDD), [("Dolgozatjavítás", "Átsorolt"), ("Úszás", "Átsorolt")])
+        self.assertEqual(self._nap(self.KEDD)["top_kategoriak"][0]["kategoria"], "Átsorolt")
+
+
+class ErtekGorduloTeszt(NaploTeszt):
+    START, END = date(2025, 2, 1), date(2025, 2, 20)
+
+    def setUp(self):
+        super().setUp()
+        self.sorok = []   # (datum, kategoria, ertek)
+        nap = date(2025, 1, 1)
+        while nap <= self.END:
+            i = (nap - date(2025, 1, 1)).days
+            # febr. 5–9: nincs adat; a Sport csak páros napokon; néha érték nélküli sor
+            if not date(2025, 2, 5) <= nap <= date(2025, 2, 9):
+                self._sor(nap, "Munka", i % 10 + 1, time(9, 0))
+                if i % 4 == 0:
+                    self._sor(nap, "Munka", 10, time(11, 0))
+                if i % 2 == 0:
+                    self._sor(nap, "Sport", (i * 7) % 10 + 1, time(18, 0))
+                if i % 5 == 0:
+                    self._sor(nap, "Munka", None, time(20, 0))
+            nap += timedelta(days=1)
+
+    def _sor(self, nap, kategoria, ertek, kezdet):
+        uj_sor(datum=nap, kategoria=kategoria, ertek=ertek, kezdet=kezdet,
+               veg=time(kezdet.hour, 30))
+        self.sorok.append((nap, kategoria, ertek))
+
+    def _vart(self, kategoria):
+        """Független referencia: soronkénti átlag a naptári ablakban (csak adatos napokra)."""
+        ertekek = [(d, e) for d, k, e in self.sorok if e is not None and kategoria in (None, k)]
+
+        def atlag(tol, ig):
+            vals = [e for d, e in ertekek if tol <= d <= ig]
+            return sum(vals) / len(vals)
+
+        out = []
+        for d in sorted({d for d, _ in ertekek if self.START <= d <= self.END}):
+            out.append({
+                "datum": d.isoformat(),
+                "db": sum(1 for x, _ in ertekek if x == d),
+                "atlag": atlag(d, d),
+                "atlag_7": atlag(d - timedelta(days=6), d),
+                "atlag_30": atlag(d - timedelta(days=29), d),
+            })
+        return out
+
+    def _get(self, **params):
+        return self.client.get(reverse("api_ertek_gordulo"), params)
+
+    def assertSorozat(self, sorozat, vart):
+        self.assertEqual([p["datum"] for p in sorozat["pontok"]], [p["datum"] for p in vart])
+        for kapott, elvart in zip(sorozat["pontok"], vart):
+            self.assertEqual(kapott["db"], elvart["db"], kapott["datum"])
+            for mezo in ("atlag", "atlag_7", "atlag_30"):
+                self.assertAlmostEqual(kapott[mezo], elvart[mezo], delta=0.0051, msg=(kapott["datum"], mezo))
+
+    def test_osszes_es_kategoriankent(self):
+        r = self._get(start=self.START.isoformat(), end=self.END.isoformat(), kategoria=["Munka", "Sport", "Nincs"])
+        self.assertEqual(r.status_code, 200)
+        series = r.json()["series"]
+        self.assertEqual([s["label"] for s in series], ["Összes", "Munka", "Sport"])
+        self.assertSorozat(series[0], self._vart(None))
+        self.assertSorozat(series[1], self._vart("Munka"))
+        self.assertSorozat(series[2], self._vart("Sport"))
+
+        # kézzel is: a hézag utáni első nap (febr. 10., i=40) 7 napos ablaka
+        # csak febr. 4-et és 10-et látja, a 30 napos a kezdet előtti januárt is
+        pont = next(p for p in series[2]["pontok"] if p["datum"] == "2025-02-10")
+        self.assertEqual((pont["db"], pont["atlag"], pont["atlag_7"]), (1, 1.0, 5.0))
+        self.assertNotIn("2025-02-07", [p["datum"] for p in series[0]["pontok"]])
+
+    def test_ures_tartomany_es_hibas_parameter(self):
+        r = self._get(start="2024-06-01", end="2024-06-30", kategoria="Munka")
+        self.assertEqual(r.json(), {"series": [{"kategoria": None, "label": "Összes", "pontok": []}]})
+        self.assertEqual(self._get(start="2025-02-01").status_code, 400)
+
+
+class ValtozasokTeszt(NaploTeszt):
+    """A kliens oldali cache szemével: lapozás a kurzorral, a tükör egyezzen az adatbázissal."""
+
+    def setUp(self):
+        super().setUp()
+        self.since = 0
+        self.tukor = {}
+        admin_user = User.objects.create_superuser("admin", "admin@example.com", "jelszo")
+        self.client.force_login(admin_user)
+
+    def _szinkron(self, limit=2):
+        """Lapozás, amíg more=true; a sorszámok szigorúan nőnek. -> az új változások."""
+        uj = []
+        while True:
+            r = self.client.get(reverse("api_valtozasok"), {"since": self.since, "limit": limit}).json()
+            self.assertLessEqual(len(r["changes"]), limit)
+            for v in r["changes"]:
+                self.assertGreater(v["seq"], self.since)
+                self.since = v["seq"]
+                if v["op"] == "delete":
+                    self.tukor.pop(v["id"], None)
+                else:
+                    self.tukor[v["row"]["id"]] = v["row"]
+            self.assertEqual(r["next"], self.since)
+            self.assertLessEqual(r["next"], r["latest"])
+            uj += r["changes"]
+            if not r["more"]:
+                self.assertEqual(r["next"], r["latest"])
+                return uj
+
+    def assertTukorEgyezik(self):
+        self.assertEqual(self.tukor, {s.id: sor_adat(s) for s in NaploSor.objects.all()})
+
+    def test_beszuras_modositas_torles_es_tomeges_muveletek(self):
+        a = uj_sor(tevekenyseg="Első")
+        b = uj_sor(tevekenyseg="Második", kezdet=time(10, 0), veg=time(11, 0))
+        c = uj_sor(tevekenyseg="Harmadik", kezdet=time(11, 0), veg=time(12, 0))
+        self.assertEqual(len(self._szinkron()), 3)
+        self.assertTukorEgyezik()
+
+        # módosítás: ugyanarra a sorra csak az utolsó állapot megy ki
+        a.tevekenyseg = "Első, javítva"
+        a.save()
+        a.ertek = 8
+        a.save()
+        valtozasok = self._szinkron()
+        self.assertEqual([(v["op"], v["row"]["id"]) for v in valtozasok], [("upsert", a.pk)])
+        self.assertTukorEgyezik()
+
+        # törlés: sírkő (tombstone) az id-val
+        b_id = b.pk
+        b.delete()
+        self.assertEqual(self._szinkron(), [{"seq": self.since, "op": "delete", "id": b_id}])
+        self.assertTukorEgyezik()
+
+        # bulk_create (tomeges_beszuras_utan)
+        sorok = [{"client_id": f"k{i}", "datum": "2025-03-05", "kezdet": f"0{i}:00", "veg": f"0{i}:30",
+                  "tevekenyseg": f"Offline {i}", "kategoria": "Munka"} for i in range(1, 4)]
+        self.client.post(reverse("api_bevitel_tomeges"), json.dumps({"rows": sorok}), content_type="application/json")
+        self.assertEqual(len(self._szinkron()), 3)
+        self.assertTukorEgyezik()
+
+        # update() az admin tömeges műveletével (tomeges_modositas_utan)
+        self.client.post(reverse("admin:naplo_naplosor_changelist"), {
+            "action": "kategoria_atallitas",
+            "_selected_action": [a.pk, c.pk],
+            "uj_kategoria": "Átsorolt",
+        })
+        valtozasok = self._szinkron()
+        self.assertEqual(sorted(v["row"]["id"] for v in valtozasok), sorted([a.pk, c.pk]))
+        self.assertTrue(all(v["row"]["kategoria"] == "Átsorolt" for v in valtozasok))
+        self.assertTukorEgyezik()
+
+        # nincs új változás: üres lap, a kurzor marad
+        self.assertEqual(self._szinkron(), [])
+
+    def test_mentes_majd_torles_egy_lapon_belul(self):
+        a = uj_sor()
+        a.delete()
+        self.assertEqual([v["op"] for v in self._szinkron(limit=10)], ["delete"])
+        self.assertTukorEgyezik()
+
+    def test_kurzor_a_legutolso_utan_reset(self):
+        uj_sor()
+        r = self.client.get(reverse("api_valtozasok"), {"since": 10 ** 6}).json()
+        self.assertEqual(r, {"reset": True, "latest": utolso_sorszam()})
+        self.assertEqual(self.client.get(reverse("api_valtozasok"), {"since": "x"}).status_code, 400)
+
+
+class BevitelApiTeszt(NaploTeszt):
+    def _adat(self, **mezok):
+        adat = {"datum": "2025-03-03", "kezdet": "22:30", "veg": "00:15", "tevekenyseg": "Olvasás",
+                "ertek": "7", "kategoria": "Pihenés", "eletkerek_focus": ["HOBBI", "TANULAS"]}
+        adat.update(mezok)
+        return adat
+
+    def test_uj_sor(self):
+        r = self.client.post(reverse("api_bevitel"), self._adat())
+        self.assertEqual(r.status_code, 200)
+        valasz = r.json()
+        sor = NaploSor.objects.get()
+        self.assertTrue(valasz["letrehozva"])
+        self.assertEqual(valasz["row"], sor_adat(sor))
+        self.assertEqual(valasz["row"]["ido_perc"], 105)
+        self.assertEqual(sor.eletkerek_focus, ["HOBBI", "TANULAS"])
+        self.assertIn(reverse("naplo_bevitel_edit", args=[sor.pk]), valasz["tabla_sor"])
+        # a következő alap a mentett sor végétől, éjfél után már a következő napon
+        self.assertEqual(valasz["kovetkezo"], {"datum": "2025-03-04", "kezdet": "00:15", "veg": "00:45"})
+
+    def test_hibas_adat_400_mezohibakkal(self):
+        r = self.client.post(reverse("api_bevitel"), self._adat(kezdet="25:99", ertek="sok", eletkerek_focus="XYZ"))
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(set(r.json()["errors"]), {"kezdet", "ertek", "eletkerek_focus"})
+
+        r = self.client.post(reverse("api_bevitel"), self._adat(kezdet="", veg=""))
+        self.assertEqual(r.status_code, 400)
+        self.assertIn("__all__", r.json()["errors"])
+        self.assertFalse(NaploSor.objects.exists())
+
+    def test_modositas(self):
+        regi = uj_sor(tevekenyseg="Régi", kezdet=time(8, 0), veg=time(9, 0))
+        uj_sor(datum=date(2025, 3, 5), kezdet=time(17, 0), veg=time(18, 20))
+
+        r = self.client.post(reverse("api_bevitel_edit", args=[regi.pk]),
+                             self._adat(tevekenyseg="Új", kezdet="08:00", veg="09:30"))
+        self.assertEqual(r.status_code, 200)
+        valasz = r.json()
+        regi.refresh_from_db()
+        self.assertFalse(valasz["letrehozva"])
+        self.assertEqual((regi.tevekenyseg, regi.ido), ("Új", timedelta(minutes=90)))
+        self.assertEqual(valasz["row"]["id"], regi.pk)
+        # módosításnál – mint az oldal GET-jénél – a legutóbb felvitt sor végétől
+        self.assertEqual(valasz["kovetkezo"], {"datum": "2025-03-05", "kezdet": "18:20", "veg": "18:50"})
+
+        self.assertEqual(self.client.post(reverse("api_bevitel_edit", args=[10 ** 6]), self._adat()).status_code, 404)
+        self.assertEqual(self.client.get(reverse("api_bevitel")).status_code, 405)
+
+
+class MegjegyzesSzovegTeszt(NaploTeszt):
+    HTML = "<p>Első&nbsp;<strong>fontos</strong> pont</p><p>a</p><p>b</p>"
+
+    def setUp(self):
+        super().setUp()
+        self.sor = uj_sor(tevekenyseg="Tervezés", megjegyzes=self.HTML)
+        self.hosszu = uj_sor(tevekenyseg="Napló", datum=date(2025, 3, 4),
+                             megjegyzes="<p>" + "<em>szó</em> " * 100 + "</p>")
+
+    def _talalatok(self, q):
+        r = self.client.get(reverse("dashboard"), {"q": q})
+        return [s.id for s in r.context["results"]]
+
+    def test_arnyekmezok(self):
+        self.assertEqual(self.sor.megjegyzes_szoveg, "Első fontos pont a b")
+        self.assertEqual(self.sor.megjegyzes_kivonat, "Első fontos pont a b")
+        self.assertNotIn("strong", self.sor.kereso)
+
+        self.assertEqual(len(self.hosszu.megjegyzes_kivonat), KIVONAT_HOSSZ)
+        self.assertTrue(self.hosszu.megjegyzes_kivonat.endswith("…"))
+        self.assertNotIn("<em>", self.hosszu.megjegyzes_kivonat)
+
+    def test_a_markup_nem_talal(self):
+        self.assertEqual(self._talalatok("strong"), [])
+        self.assertEqual(self._talalatok("nbsp"), [])
+        self.assertEqual(self._talalatok("em"), [])
+        self.assertEqual(self._talalatok("fontos"), [self.sor.pk])
+        # a blokkelemek határa szóköz: "a" és "b" külön szó, nem "ab"
+        self.assertEqual(self._talalatok("pont a b"), [self.sor.pk])
+
+    def test_a_lista_kivonatot_a_megjegyzes_api_teljes_htmlt_ad(self):
+        r = self.client.get(reverse("dashboard"), {"q": "napló"})
+        self.assertEqual([s.megjegyzes for s in r.context["results"]], [self.hosszu.megjegyzes_kivonat])
+
+        r = self.client.get(reverse("api_megjegyzes", args=[self.sor.pk]))
+        self.assertEqual(r.json(), {"id": self.sor.pk, "megjegyzes": self.HTML, "szoveg": "Első fontos pont a b"})
+        self.assertEqual(self.client.get(reverse("api_megjegyzes", args=[10 ** 6])).status_code, 404)
+
+
+@override_settings(NAPLO_PROFILOZAS=True)
+class ProfilozoTeszt(NaploTeszt):
+    def setUp(self):
+        super().setUp()
+        profil_torles()
+        self.addCleanup(profil_torles)
+        self.staff = User.objects.create_user("staff", password="jelszo", is_staff=True)
+
+    def _statisztika(self):
+        r = self.client.get(reverse("api_profil"))
+        self.assertEqual(r.status_code, 200)
+        return {v["url_name"]: v for v in r.json()["vegpontok"]}
+
+    def test_server_timing_es_meres_url_nev_szerint(self):
+        uj_sor()
+        for _ in range(3):
+            r = self.client.get(reverse("api_kategoria_osszefoglalo"), {"start": "2025-03-01", "end": "2025-03-31"})
+            self.assertRegex(r["Server-Timing"], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ query"$')
+
+        self.client.force_login(self.staff)
+        meres = self._statisztika()["api_kategoria_osszefoglalo"]
+        self.assertEqual(meres["db"], 3)
+        self.assertGreaterEqual(meres["lekerdezes_max"], 1)
+        self.assertEqual(meres["meret_atlag"], len(r.content))
+
+    def test_percentilisek_nearest_rank(self):
+        for ms in range(100, 0, -1):   # 1..100 ms, fordított sorrendben
+            _puffer.append(("minta", float(ms), ms / 10, ms % 3, 1000))
+        self.client.force_login(self.staff)
+        meres = self._statisztika()["minta"]
+        self.assertEqual(
+            (meres["db"], meres["p50_ms"], meres["p95_ms"], meres["p99_ms"], meres["max_ms"]),
+            (100, 50.0, 95.0, 99.0, 100.0),
+        )
+        self.assertEqual((meres["db_ms_atlag"], meres["lekerdezes_max"]), (5.0, 2))
+
+    def test_get_nem_torol_a_torles_staff_post(self):
+        _puffer.append(("minta", 1.0, 0.0, 0, 0))
+        self.client.force_login(self.staff)
+        self.client.get(reverse("api_profil"), {"torles": "1"})
+        self.assertIn("minta", self._statisztika())
+        self.assertEqual(self.client.get(reverse("api_profil_torles")).status_code, 405)
+
+        csrf_kliens = Client(enforce_csrf_checks=True)
+        csrf_kliens.force_login(self.staff)
+        self.assertEqual(csrf_kliens.post(reverse("api_profil_torles")).status_code, 403)
+
+        r = self.client.post(reverse("api_profil_torles"))
+        self.assertEqual(r.status_code, 200)
+        self.assertGreaterEqual(r.json()["torolve"], 1)
+        self.assertNotIn("minta", self._statisztika())
+
+        self.client.logout()
+        self.assertEqual(self.client.post(reverse("api_profil_torles")).status_code, 302)
+
+
+class StatikusFajlTeszt(NaploTeszt):
+    def setUp(self):
+        super().setUp()
+        gyoker = tempfile.TemporaryDirectory()
+        self.addCleanup(gyoker.cleanup)
+        beallitas = override_settings(STATIC_ROOT=gyoker.name)
+        beallitas.enable()
+        self.addCleanup(beallitas.disable)
+        self.gyoker = gyoker.name
+
+    def _bevitel_js(self):
+        r = self.client.get(reverse("naplo_bevitel"))
+        self.assertEqual(r.status_code, 200)
+        return re.search(r'src="/static/(naplo/js/naplo_bevitel[^"]*\.js)"', r.content.decode()).group(1)
+
+    def test_collectstatic_elott_hash_nelkuli_nev(self):
+        self.assertEqual(self._bevitel_js(), "naplo/js/naplo_bevitel.js")
+
+    def test_collectstatic_utan_hashelt_nev_es_immutable(self):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        utvonal = self._bevitel_js()
+        self.assertRegex(utvonal, r"^naplo/js/naplo_bevitel\.[0-9a-f]{12}\.js$")
+
+        r = statikus_fajl(RequestFactory().get("/static/" + utvonal), utvonal)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r["Cache-Control"], "public, max-age=31536000, immutable")
+        with open(os.path.join(self.gyoker, utvonal), "rb") as f:
+            self.assertEqual(b"".join(r.streaming_content), f.read())
+
+        r = statikus_fajl(RequestFactory().get("/static/naplo/js/naplo_bevitel.js"), "naplo/js/naplo_bevitel.js")
+        self.assertEqual(r["Cache-Control"], "public, max-age=300")
+
+
+    def test_collectstatic_gz_valtozat_es_kiszolgalasa(self):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        utvonal = self._bevitel_js()
+        with open(os.path.join(self.gyoker, utvonal), "rb") as f:
+            eredeti = f.read()
+        self.assertGreaterEqual(len(eredeti), settings.NAPLO_TOMORITES_MIN_BAJT)
+        with open(os.path.join(self.gyoker, utvonal + ".gz"), "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), eredeti)
+
+        keres = RequestFactory().get("/static/" + utvonal, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        r = statikus_fajl(keres, utvonal)
+        self.assertEqual(r["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", r["Vary"])
+        self.assertEqual(gzip.decompress(b"".join(r.streaming_content)), eredeti)
+
+        # gzip nélküli kliens a tömörítetlent kapja
+        r = statikus_fajl(RequestFactory().get("/static/" + utvonal), utvonal)
+        self.assertFalse(r.has_header("Content-Encoding"))
+        self.assertEqual(b"".join(r.streaming_content), eredeti)
+
+
+class TomoritoTeszt(NaploTeszt):
+    def _valasz(self, valasz):
+        keres = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        return TomoritoMiddleware(lambda r: valasz)(keres)
+
+    def test_kicsi_json_nem_tomorul(self):
+        sor = uj_sor(megjegyzes="Rövid")
+        r = self.client.get(reverse("api_megjegyzes", args=[sor.pk]), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertLess(len(r.content), settings.NAPLO_TOMORITES_MIN_BAJT)
+        self.assertFalse(r.has_header("Content-Encoding"))
+
+    def test_nagy_json_gzip_vary_fejlecel(self):
+        for i in range(20):
+            uj_sor(tevekenyseg=f"Hosszabb tevékenység leírás {i}", kezdet=time(i, 0), veg=time(i, 30))
+        r = self.client.get(reverse("api_valtozasok"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(r["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", r["Vary"])
+        self.assertEqual(len(json.loads(gzip.decompress(r.content))["changes"]), 20)
+
+        # Accept-Encoding nélkül tömörítetlen
+        self.assertFalse(self.client.get(reverse("api_valtozasok")).has_header("Content-Encoding"))
+
+    def test_kuszob_es_tipus(self):
+        nagy = JsonResponse({"x": "a" * settings.NAPLO_TOMORITES_MIN_BAJT})
+        self.assertEqual(self._valasz(nagy)["Content-Encoding"], "gzip")
+        kicsi = JsonResponse({"x": "a" * (settings.NAPLO_TOMORITES_MIN_BAJT - 20)})
+        self.assertFalse(self._valasz(kicsi).has_header("Content-Encoding"))
+        kep = HttpResponse(b"\0" * 5000, content_type="image/png")
+        self.assertFalse(self._valasz(kep).has_header("Content-Encoding"))
+
+    def test_stream_erintetlen(self):
+        for tipus in ("text/event-stream", "application/json"):
+            with self.subTest(tipus=tipus):
+                esemenyek = [b"event: valtozas\ndata: {}\n\n"] * 200
+                r = self._valasz(StreamingHttpResponse(iter(esemenyek), content_type=tipus))
+                self.assertFalse(r.has_header("Content-Encoding"))
+                self.assertEqual(b"".join(r.streaming_content), b"".join(esemenyek))
+
+
+@override_settings(NAPLO_LASSU_LEKERDEZES_MS=0, NAPLO_LASSU_LEKERDEZES_MAX=500)
+class LassuLekerdezesTeszt(NaploTeszt):
+    def setUp(self):
+        super().setUp()
+        uj_sor(tevekenyseg="Futás a parton")
+
+    def test_minden_utasitas_tervvel_es_teljes_scan_jelzessel(self):
+        self.client.get(reverse("dashboard"), {"q": "futas"})
+        sorok = list(LassuLekerdezes.objects.order_by("id"))
+        self.assertTrue(sorok)
+        self.assertTrue(all(s.url == "/naplo/dashboard/?q=futas" for s in sorok))
+
+        # a szabad szöveges keresés a kereso oszlopon LIKE: teljes táblabejárás
+        kereses = next(s for s in sorok if "LIKE" in s.sql and '"kereso"' in s.sql)
+        self.assertRegex(kereses.terv, r"(?m)^SCAN (TABLE )?naplo_naplosor$")
+        self.assertTrue(kereses.teljes_scan)
+        self.assertIn("%futas%", kereses.params)
+        self.assertGreaterEqual(kereses.ido_ms, 0)
+
+    def test_indexes_bejaras_nem_teljes_scan(self):
+        self.client.get(reverse("api_kategoria_bejegyzesek"),
+                        {"start": "2025-03-01", "end": "2025-03-31", "kategoria": "Munka"})
+        naplosor = [s for s in LassuLekerdezes.objects.all() if "FROM \"naplo_naplosor\"" in s.sql]
+        self.assertTrue(naplosor)
+        self.assertTrue(all("USING INDEX" in s.terv and not s.teljes_scan for s in naplosor))
+
+        for terv, vart in (
+            ("SCAN naplo_naplosor", True),
+            ("SCAN TABLE naplo_naplosor", True),
+            ("SCAN naplo_naplosor USING INDEX naplosor_datum_kezdet_idx", False),
+            ("SEARCH naplo_naplosor USING INDEX naplosor_datum_kezdet_idx (datum>? AND datum<?)", False),
+            ("SCAN naplo_naplosor_eletkerek", False),
+        ):
+            self.assertEqual(bool(TELJES_SCAN.search(terv)), vart, terv)
+
+    @override_settings(NAPLO_LASSU_LEKERDEZES_MS=10 ** 6)
+    def test_kuszob_alatt_nem_ment(self):
+        self.client.get(reverse("dashboard"), {"q": "futas"})
+        self.assertFalse(LassuLekerdezes.objects.exists())
+
+    @override_settings(NAPLO_LASSU_LEKERDEZES_MAX=3)
+    def test_a_legutolso_max_sor_marad(self):
+        self.client.get(reverse("dashboard"), {"q": "futas"})
+        self.client.get(reverse("nap_attekintes"), {"date": "2025-03-03"})
+        sorok = list(LassuLekerdezes.objects.order_by("id").values_list("id", "url"))
+        self.assertEqual(len(sorok), 3)
+        self.assertTrue(all(url.startswith("/naplo/nap/") for _, url in sorok))
+        # a legnagyobb id-k maradtak (a törlés a határ alattiakat viszi)
+        self.assertEqual(sorok[-1][0] - sorok[0][0], 2)
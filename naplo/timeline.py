@@ -0,0 +1,120 @@
+"""
+Idővonal-segédek a NaploSor sorokhoz.
+
+A `kezdet`/`veg` csak időpont; ha `veg < kezdet`, a sor átlépi az éjfélt
+(lásd NaploSor.save()). Az `ido` mező ezt már tartalmazza, ezért az
+intervallum vége mindig `datum + kezdet + ido`.
+"""
+from datetime import datetime, timedelta
+
+
+NAPOK = ["H", "K", "Sze", "Cs", "P", "Szo", "V"]
+
+
+def sor_intervallum(datum, kezdet, ido):
+    """(datum, kezdet, ido) -> (start, end) datetime pár; kezdet nélkül None."""
+    if not datum or kezdet is None:
+        return None
+    start = datetime.combine(datum, kezdet)
+    return start, start + (ido or timedelta(0))
+
+
+def orankenti_szeletek(start, end):
+    """
+    [start, end) felbontása egész órás szeletekre.
+
+    Yield: (hét napja 0=hétfő, óra 0..23, másodperc). Az éjfél (és a hét vége)
+    átlépését a datetime aritmetika intézi.
+    """
+    cur = start
+    while cur < end:
+        next_hour = cur.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        stop = next_hour if next_hour < end else end
+        yield cur.weekday(), cur.hour, (stop - cur).total_seconds()
+        cur = stop
+
+
+def hoterkep_racs(rows):
+    """
+    Hét napja × óra rács kategóriánként, egy menetben.
+
+    rows: (kategoria, datum, kezdet, ido) sorok tetszőleges iterálható forrása
+          (pl. values_list(...).iterator()).
+
+    Visszaad: {kategoria: [[másodperc] * 24] * 7}
+    """
+    racsok = {}
+    for kategoria, datum, kezdet, ido in rows:
+        iv = sor_intervallum(datum, kezdet, ido)
+        if iv is None:
+            continue
+        racs = racsok.get(kategoria)
+        if racs is None:
+            racs = [[0.0] * 24 for _ in range(7)]
+            racsok[kategoria] = racs
+        for nap, ora, sec in orankenti_szeletek(*iv):
+            racs[nap][ora] += sec
+    return racsok
+
+
+def _uj_nap():
+    return {"sorok": 0, "hezagok": [], "atfedesek": [], "nulla": []}
+
+
+def idovonal_sweep(rows, elozo=None):
+    """
+    Hézagok, átfedések és 0 perces sorok keresése egyetlen rendezett bejárással.
+
+    rows: (id, datum, kezdet, ido) sorok (datum, kezdet, id) sorrendben –
+          a rendezést az adatbázis végzi az index mentén, így az egész O(n log n).
+    elozo: (id, end) – a bejárt szakasz előtti utolsó sor vége (opcionális),
+           hogy a szakasz első napja is helyesen ellenőrződjön.
+
+    Visszaad: {datum: {"sorok": n,
+                       "hezagok": [(tol, ig)],
+                       "atfedesek": [(id, masik_id, másodperc)],
+                       "nulla": [id]}}
+    Az eltérés mindig annak a sornak a napjához kerül, amelyiknél észleljük.
+    """
+    napok = {}
+    max_id, max_end = elozo if elozo else (None, None)
+
+    for pk, datum, kezdet, ido in rows:
+        iv = sor_intervallum(datum, kezdet, ido)
+        if iv is None:
+            continue
+        start, end = iv
+
+        nap = napok.get(datum)
+        if nap is None:
+            nap = _uj_nap()
+            napok[datum] = nap
+        nap["sorok"] += 1
+
+        if end <= start:
+            nap["nulla"].append(pk)
+            continue
+
+        if max_end is not None:
+            if start > max_end:
+                nap["hezagok"].append((max_end, start))
+            elif start < max_end:
+                atfedes = (min(end, max_end) - start).total_seconds()
+                nap["atfedesek"].append((pk, max_id, atfedes))
+
+        if max_end is None or end > max_end:
+            max_id, max_end = pk, end
+
+    return napok
+
+
+def nap_osszesites(nap):
+    """Egy nap sweep-eredménye -> darabszámok és percek."""
+    return {
+        "sorok": nap["sorok"],
+        "hezag_db": len(nap["hezagok"]),
+        "hezag_perc": int(sum((ig - tol).total_seconds() for tol, ig in nap["hezagok"]) // 60),
+        "atfedes_db": len(nap["atfedesek"]),
+        "atfedes_perc": int(sum(sec for _, _, sec in nap["atfedesek"]) // 60),
+        "nulla_db": len(nap["nulla"]),
+    }
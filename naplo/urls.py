@@ -7,9 +7,24 @@ from .views import (
     api_eletkerek_bejegyzesek,
     api_kategoria_osszefoglalo,
     api_kategoria_bejegyzesek,
+    api_hierarchia_osszefoglalo,
+    api_heti_hoterkep,
+    api_idovonal_ellenorzes,
+    api_ertek_gordulo,
+    api_osszehasonlitas,
     api_utolso_bejegyzesek_kategoriara,
+    api_megjegyzes,
+    api_tevekenyseg_javaslat,
     dashboard_kereses,
     nap_attekintes,
+    celok,
+    api_profil,
+    api_profil_torles,
+    api_valtozasok,
+    api_bevitel,
+    api_bevitel_tomeges,
+    api_esemenyek,
+    service_worker,
 )
 
 urlpatterns = [
@@ -21,9 +36,15 @@ urlpatterns = [
 
     path("dashboard/", dashboard_kereses, name="dashboard"),
     path("nap/", nap_attekintes, name="nap_attekintes"),
+    path("celok/", celok, name="celok"),
 
     path("api/kategoria-osszefoglalo/", api_kategoria_osszefoglalo, name="api_kategoria_osszefoglalo"),
     path("api/kategoria-bejegyzesek/", api_kategoria_bejegyzesek, name="api_kategoria_bejegyzesek"),
+    path("api/hierarchia-osszefoglalo/", api_hierarchia_osszefoglalo, name="api_hierarchia_osszefoglalo"),
+    path("api/heti-hoterkep/", api_heti_hoterkep, name="api_heti_hoterkep"),
+    path("api/idovonal-ellenorzes/", api_idovonal_ellenorzes, name="api_idovonal_ellenorzes"),
+    path("api/ertek-gordulo/", api_ertek_gordulo, name="api_ertek_gordulo"),
+    path("api/osszehasonlitas/", api_osszehasonlitas, name="api_osszehasonlitas"),
 
     path("api/eletkerek-osszefoglalo/", api_eletkerek_osszefoglalo, name="api_eletkerek_osszefoglalo"),
     path("api/eletkerek-bejegyzesek/", api_eletkerek_bejegyzesek, name="api_eletkerek_bejegyzesek"),
@@ -34,4 +55,14 @@ urlpatterns = [
         api_utolso_bejegyzesek_kategoriara,
         name="api_utolso_bejegyzesek_kategoriara",
     ),
+    path("api/megjegyzes/<int:pk>/", api_megjegyzes, name="api_megjegyzes"),
+    path("api/tevekenyseg-javaslat/", api_tevekenyseg_javaslat, name="api_tevekenyseg_javaslat"),
+    path("api/valtozasok/", api_valtozasok, name="api_valtozasok"),
+    path("api/bevitel/", api_bevitel, name="api_bevitel"),
+    path("api/bevitel/<int:pk>/", api_bevitel, name="api_bevitel_edit"),
+    path("api/bevitel-tomeges/", api_bevitel_tomeges, name="api_bevitel_tomeges"),
+    path("api/esemenyek/", api_esemenyek, name="api_esemenyek"),
+    path("sw.js", service_worker, name="service_worker"),
+    path("api/profil/", api_profil, name="api_profil"),
+    path("api/profil/torles/", api_profil_torles, name="api_profil_torles"),
 ]
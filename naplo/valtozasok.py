@@ -0,0 +1,81 @@
+"""
+Változásnapló (ValtozasNaplo) írása és olvasása a delta-szinkronhoz.
+
+A böngésző IndexedDB cache-e az utolsó látott sorszámot tartja; az
+api_valtozasok ettől kezdve adja vissza a mentett sorok aktuális állapotát
+és a törölt id-kat. Tömeges műveletek (bulk_create, update()) nem küldenek
+jelzést – ott a valtozasok_tomegesen() kell.
+"""
+from django.db.models import Max
+
+from .models import NaploSor, ValtozasNaplo
+
+
+def valtozas_rogzites(naplosor_id, muvelet):
+    ValtozasNaplo.objects.create(naplosor_id=naplosor_id, muvelet=muvelet)
+
+
+def valtozasok_tomegesen(naplosor_idk, muvelet=ValtozasNaplo.MENTES, batch_size=2000):
+    ValtozasNaplo.objects.bulk_create(
+        [ValtozasNaplo(naplosor_id=i, muvelet=muvelet) for i in naplosor_idk],
+        batch_size=batch_size,
+    )
+
+
+def utolso_sorszam():
+    return ValtozasNaplo.objects.aggregate(m=Max("id"))["m"] or 0
+
+
+def sor_adat(s):
+    return {
+        "id": s.id,
+        "datum": s.datum.isoformat(),
+        "kezdet": s.kezdet.strftime("%H:%M") if s.kezdet else "",
+        "veg": s.veg.strftime("%H:%M") if s.veg else "",
+        "ido_perc": int(s.ido.total_seconds() // 60) if s.ido else 0,
+        "tevekenyseg": s.tevekenyseg or "",
+        "ertek": s.ertek,
+        "kategoria": s.kategoria or "",
+        "kapcsolodo": s.kapcsolodo or "",
+        "szerep": s.szerep or "",
+        "erzelem": s.erzelem or "",
+        "kapcsolodo_cel": s.kapcsolodo_cel or "",
+        "eletkerek_focus": list(s.eletkerek_focus or []),
+        "megjegyzes": s.megjegyzes or "",
+        "modositva": s.modositva.isoformat() if s.modositva else None,
+    }
+
+
+def valtozasok_lekerdezese(since, limit):
+    """
+    A `since` utáni legfeljebb `limit` naplóbejegyzés, soronként összevonva
+    (ugyanarra a sorra csak az utolsó művelet számít). Mentésnél a sor
+    *aktuális* állapota megy ki, ezért az ismételt alkalmazás is biztonságos.
+    -> (valtozasok, kovetkezo_since, van_meg)
+    """
+    naplo = list(
+        ValtozasNaplo.objects.filter(id__gt=since)
+        .order_by("id")
+        .values_list("id", "naplosor_id", "muvelet")[:limit + 1]
+    )
+    van_meg = len(naplo) > limit
+    naplo = naplo[:limit]
+    if not naplo:
+        return [], since, False
+
+    utolso = {}  # naplosor_id -> (sorszám, művelet)
+    for seq, sor_id, muvelet in naplo:
+        utolso[sor_id] = (seq, muvelet)
+
+    mentett = [sor_id for sor_id, (_, m) in utolso.items() if m == ValtozasNaplo.MENTES]
+    sorok = {s.id: s for s in NaploSor.objects.filter(id__in=mentett)} if mentett else {}
+
+    valtozasok = []
+    for sor_id, (seq, muvelet) in sorted(utolso.items(), key=lambda kv: kv[1][0]):
+        s = sorok.get(sor_id)
+        if muvelet == ValtozasNaplo.MENTES and s is not None:
+            valtozasok.append({"seq": seq, "op": ValtozasNaplo.MENTES, "row": sor_adat(s)})
+        else:
+            # törölve – vagy azóta törölték (a törlés bejegyzése később úgyis jön)
+            valtozasok.append({"seq": seq, "op": ValtozasNaplo.TORLES, "id": sor_id})
+    return valtozasok, naplo[-1][0], van_meg
@@ -0,0 +1,88 @@
+"""
+Keskeny sor-vetítés (projection) a listás nézetekhez és API-khoz.
+
+A listák nem teljes NaploSor példányokat töltenek be (minden oszlop, hosszú
+szövegek, JSON mező, model-init), hanem values_list()-tel csak a kért
+oszlopokat, és ezekből kompakt, __slots__-os Sor objektumot építenek.
+A perc betöltéskor számolódik, a formázott dátum/idő a JSON-hoz az adat()-ban.
+
+    for s in vetites(qs, ("id", "datum", "kezdet", "minutes", "tevekenyseg")):
+        s.minutes, s.edit_url, s.adat(mezok)
+
+A Sor templatekben is a model helyett használható (s.datum, s.kezdet|time, ...),
+és pickle-elhető, így cache-be (nap_cache) is mehet.
+"""
+from django.urls import reverse
+
+
+# vetítési mező -> adatbázis-oszlop, ahol eltér
+OSZLOPOK = {
+    "minutes": "ido",                     # perc (int), az ido DurationFieldből
+    "megjegyzes": "megjegyzes_kivonat",   # listákban csak a kivonat megy ki
+}
+
+
+class Sor:
+    __slots__ = (
+        "id", "datum", "kezdet", "veg", "minutes", "ertek",
+        "kategoria", "kapcsolodo", "szerep", "erzelem", "kapcsolodo_cel",
+        "tevekenyseg", "megjegyzes", "eletkerek_focus",
+        "_edit_url",
+    )
+
+    def __init__(self, mezok, ertekek):
+        for mezo, ertek in zip(mezok, ertekek):
+            setattr(self, mezo, ertek)
+
+    @classmethod
+    def sorbol(cls, mezok, row):
+        """values_list() sorból (a mezok sorrendjében); az ido -> perc átváltással."""
+        s = cls(mezok, row)
+        if "minutes" in mezok:
+            s.minutes = int(s.minutes.total_seconds() // 60) if s.minutes else 0
+        return s
+
+    @property
+    def edit_url(self):
+        # a template soronként többször is kéri: a reverse() csak egyszer fusson
+        try:
+            return self._edit_url
+        except AttributeError:
+            self._edit_url = reverse("naplo_bevitel_edit", args=[self.id])
+            return self._edit_url
+
+    def adat(self, mezok):
+        """JSON-hoz: dátum ISO, időpontok HH:MM, a JSON lista másolva."""
+        out = {}
+        for mezo in mezok:
+            ertek = getattr(self, mezo)
+            if mezo == "datum":
+                ertek = ertek.isoformat() if ertek else ""
+            elif mezo in ("kezdet", "veg"):
+                ertek = ertek.strftime("%H:%M") if ertek else ""
+            elif mezo == "eletkerek_focus":
+                ertek = list(ertek or [])
+            out[mezo] = ertek
+        return out
+
+    def __getstate__(self):
+        return {m: getattr(self, m) for m in self.__slots__ if hasattr(self, m)}
+
+    def __setstate__(self, allapot):
+        for mezo, ertek in allapot.items():
+            setattr(self, mezo, ertek)
+
+    def __repr__(self):
+        return f"<Sor {getattr(self, 'id', None)}>"
+
+
+def oszlopok(mezok):
+    """Vetítési mezők -> values_list() oszlopnevek."""
+    return [OSZLOPOK.get(m, m) for m in mezok]
+
+
+def vetites(qs, mezok):
+    """A queryset sorai Sor objektumként, csak a `mezok` oszlopaival (generátor)."""
+    mezok = tuple(mezok)
+    for row in qs.values_list(*oszlopok(mezok)):
+        yield Sor.sorbol(mezok, row)
@@ -1,14 +1,35 @@
+import asyncio
+import json
+import os
+import re
 from datetime import datetime, timedelta
 
-from django.db.models import Sum, Q, Avg
-from django.http import JsonResponse
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Sum, Q, Avg, Count, Window
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from django.utils.dateparse import parse_date
-from django.urls import reverse
-
-from .models import NaploSor
-from .forms import NaploSorForm
+from django.views.decorators.http import require_POST
+from django.views.static import serve as static_serve
+
+from .autocomplete import tevekenyseg_index
+from .cache import nap_cache, tartomany_cache
+from .esemenyek import kozvetito
+from .integritas import idovonal_ellenorzes
+from .kereses import lekerdezes_forditas, normalizal
+from .middleware import profil_statisztika, profil_torles
+from .models import CelOsszesito, IdovonalEllenorzes, NaploSor, Param
+from .signals import tomeges_beszuras_utan
+from .forms import NaploSorAdatForm, NaploSorForm
+from .timeline import NAPOK, hoterkep_racs, nap_osszesites
+from .valtozasok import sor_adat, utolso_sorszam, valtozasok_lekerdezese
+from .vetites import Sor, oszlopok, vetites
 
 # Életkerék – fix sorrend (oldal + API)
 ELETKEREK_ORDER = [
@@ -22,6 +43,33 @@ ELETKEREK_ORDER = [
     ("EGESZSEG", "Egészség"),
 ]
 
+# Listák sor-vetítései (vetites.Sor mezők) – mindenhol csak a megjelenített oszlopok.
+# A "megjegyzes" a kivonat, a "minutes" az ido percben (lásd vetites.OSZLOPOK).
+DASHBOARD_MEZOK = (
+    "id", "datum", "kezdet", "veg", "minutes", "ertek",
+    "kategoria", "kapcsolodo", "szerep", "erzelem", "kapcsolodo_cel",
+    "tevekenyseg", "megjegyzes",
+)
+NAP_MEZOK = (
+    "id", "kezdet", "veg", "minutes", "ertek",
+    "kategoria", "kapcsolodo", "szerep", "erzelem", "kapcsolodo_cel",
+    "tevekenyseg", "megjegyzes",
+)
+UTOLSO_20_MEZOK = ("id", "datum", "kezdet", "veg", "tevekenyseg")
+KATEGORIA_BEJEGYZES_MEZOK = ("id", "datum", "kezdet", "veg", "minutes", "tevekenyseg", "megjegyzes")
+# az utolsó elem (eletkerek_focus) csak szűréshez kell, a válaszba nem megy
+ELETKEREK_BEJEGYZES_MEZOK = (*KATEGORIA_BEJEGYZES_MEZOK, "eletkerek_focus")
+# a form kitöltéséhez kellő mezők
+UTOLSO_KATEGORIARA_MEZOK = (
+    "id", "datum", "kezdet", "veg", "ertek",
+    "kapcsolodo", "szerep", "erzelem", "kapcsolodo_cel",
+    "tevekenyseg", "megjegyzes", "eletkerek_focus",
+)
+
+# Hierarchikus treemap – szintként választható mezők (sorrend = alapértelmezett lánc)
+HIERARCHIA_DIMENZIOK = ("kategoria", "kapcsolodo", "szerep", "erzelem", "kapcsolodo_cel", "tevekenyseg")
+HIERARCHIA_ALAP_SZINTEK = ("kategoria", "kapcsolodo", "tevekenyseg")
+HIERARCHIA_MAX_SZINT = 4
 
 
 def format_minutes(total_minutes: int) -> str:
@@ -68,39 +116,34 @@ def month_pill_style(month: int) -> str:
     return f"background: {bg}; border-color: {border}; color: #111;"
 
 
-def naplo_bevitel(request, pk=None):
-    # ---- szerkesztési mód (ha van pk) ----
-    obj = NaploSor.objects.filter(pk=pk).first() if pk else None
-
-    # ---- segédfüggvény: éjfél átlépés ----
-    def end_datetime(s):
+def kovetkezo_alapertek(s=None):
+    """
+    Új sor alap dátum / kezdet / vég: az `s` sor végétől (éjfél-átlépéssel,
+    így a dátum is léphet), 30 perc hosszan. Sor nélkül: most.
+    """
+    if s and s.datum and s.kezdet and s.veg:
         dt_start = datetime.combine(s.datum, s.kezdet)
         dt_end = datetime.combine(s.datum, s.veg)
         if dt_end < dt_start:
             dt_end += timedelta(days=1)
-        return dt_end
-
-    # ---- alap kezdő idő: utolsó sor végéről (csak új bevitelnél releváns) ----
-    last = NaploSor.objects.order_by("-id").first()
-    if last:
-        last_end = end_datetime(last)
-        initial_date = last_end.date()
-        initial_start = last_end.time().replace(second=0, microsecond=0)
+        dt0 = dt_end.replace(second=0, microsecond=0)
     else:
-        now = timezone.localtime()
-        initial_date = now.date()
-        initial_start = now.time().replace(second=0, microsecond=0)
-
-    dt0 = datetime.combine(initial_date, initial_start)
-    initial_end = (dt0 + timedelta(minutes=30)).time()
-
-    # ---- initial alap (csak új bevitelnél használjuk) ----
-    initial = {
-        "datum": initial_date,
-        "kezdet": initial_start,
-        "veg": initial_end,
+        dt0 = timezone.localtime().replace(second=0, microsecond=0, tzinfo=None)
+
+    return {
+        "datum": dt0.date(),
+        "kezdet": dt0.time(),
+        "veg": (dt0 + timedelta(minutes=30)).time(),
     }
 
+
+def naplo_bevitel(request, pk=None):
+    # ---- szerkesztési mód (ha van pk) ----
+    obj = NaploSor.objects.filter(pk=pk).first() if pk else None
+
+    # ---- alap kezdő idő: utolsó sor végéről (csak új bevitelnél releváns) ----
+    initial = kovetkezo_alapertek(NaploSor.objects.order_by("-id").first())
+
     # ---- POST / GET ----
     if request.method == "POST":
         form = NaploSorForm(request.POST, instance=obj)
@@ -113,7 +156,7 @@ def naplo_bevitel(request, pk=None):
         else:
             form = NaploSorForm(initial=initial)
 
-    utolso_20 = NaploSor.objects.order_by("-id")[:20]
+    utolso_20 = list(vetites(NaploSor.objects.order_by("-id")[:20], UTOLSO_20_MEZOK))
 
 
 
@@ -127,6 +170,49 @@ def naplo_bevitel(request, pk=None):
     )
 
 
+@require_POST
+def api_bevitel(request, pk=None):
+    """
+    Egy sor mentése a teljes oldal újrarajzolása nélkül (a bevitel oldal fetch-csel küldi).
+
+    POST: a bevitel form mezői (form-urlencoded, csrfmiddlewaretoken-nel)
+      - /api/bevitel/        új sor
+      - /api/bevitel/<pk>/   meglévő sor módosítása
+
+    Válasz (200):
+      {"row": {id, datum, kezdet, veg, ido_perc, tevekenyseg, ...},
+       "tabla_sor": "<tr>…</tr>",        # az "utolsó 20" táblázat sora
+       "kovetkezo": {"datum": "2025-12-02", "kezdet": "00:30", "veg": "01:00"},
+       "letrehozva": true}
+    Hibás adat (400): {"errors": {"veg": ["..."], "__all__": [...]}}
+
+    A következő alap a mentett sor végétől indul; módosításnál – mint az oldal
+    GET-jénél – a legutóbb felvitt sor végétől.
+    """
+    obj = None
+    if pk is not None:
+        obj = NaploSor.objects.filter(pk=pk).first()
+        if obj is None:
+            return JsonResponse({"error": "Nincs ilyen sor."}, status=404)
+
+    form = NaploSorAdatForm(request.POST, instance=obj)
+    if not form.is_valid():
+        return JsonResponse({"errors": {k: list(v) for k, v in form.errors.items()}}, status=400)
+    s = form.save()
+
+    alap = kovetkezo_alapertek(s if obj is None else NaploSor.objects.order_by("-id").first())
+    return JsonResponse({
+        "row": sor_adat(s),
+        "tabla_sor": render_to_string("naplo/_utolso_sor.html", {"s": s}, request=request),
+        "kovetkezo": {
+            "datum": alap["datum"].isoformat(),
+            "kezdet": alap["kezdet"].strftime("%H:%M"),
+            "veg": alap["veg"].strftime("%H:%M"),
+        },
+        "letrehozva": obj is None,
+    })
+
+
 def kategoria_treemap(request):
     return render(request, "naplo/kategoria_treemap.html")
 
@@ -200,6 +286,8 @@ def api_eletkerek_bejegyzesek(request):
 
     Válasz:
       {"entries":[{id, edit_url, datum, kezdet, veg, minutes, minutes_human, tevekenyseg, megjegyzes}, ...]}
+
+    A megjegyzes itt sima szöveges kivonat; a teljes HTML: api_megjegyzes.
     """
     start_s = request.GET.get("start")
     end_s = request.GET.get("end")
@@ -214,27 +302,21 @@ def api_eletkerek_bejegyzesek(request):
     base_qs = (
         NaploSor.objects
         .filter(datum__range=(start_d, end_d))
+        # durva előszűrés a JSON szövegén (SQLite-on nincs JSON contains);
+        # a pontos egyezést lent a lista nézi
+        .filter(eletkerek_focus__icontains=f'"{code}"')
         .order_by("-datum", "-kezdet", "-id")
     )
 
     entries = []
-    for s in base_qs.only("id", "datum", "kezdet", "veg", "ido", "tevekenyseg", "megjegyzes", "eletkerek_focus"):
-        tags = list(s.eletkerek_focus or [])
-        if code not in tags:
+    for s in vetites(base_qs, ELETKEREK_BEJEGYZES_MEZOK):
+        if code not in (s.eletkerek_focus or []):
             continue
 
-        minutes = int(s.ido.total_seconds() // 60) if s.ido else 0
-        entries.append({
-            "id": s.id,
-            "edit_url": reverse("naplo_bevitel_edit", args=[s.id]),
-            "datum": s.datum.isoformat() if s.datum else "",
-            "kezdet": s.kezdet.strftime("%H:%M") if s.kezdet else "",
-            "veg": s.veg.strftime("%H:%M") if s.veg else "",
-            "minutes": minutes,
-            "minutes_human": format_minutes(minutes),
-            "tevekenyseg": s.tevekenyseg or "",
-            "megjegyzes": s.megjegyzes or "",
-        })
+        e = s.adat(ELETKEREK_BEJEGYZES_MEZOK[:-1])
+        e["edit_url"] = s.edit_url
+        e["minutes_human"] = format_minutes(s.minutes)
+        entries.append(e)
         if len(entries) >= 500:
             break
 
@@ -287,8 +369,13 @@ def api_kategoria_bejegyzesek(request):
       - end=YYYY-MM-DD
       - kategoria=szoveg
 
+      - kapcsolodo / szerep / erzelem / kapcsolodo_cel / tevekenyseg (opcionális,
+        a hierarchikus treemap levelének szűkítéséhez)
+
     Válasz:
       {"entries":[{id, datum, kezdet, veg, minutes, tevekenyseg, megjegyzes}, ...]}
+
+    A megjegyzes itt sima szöveges kivonat; a teljes HTML: api_megjegyzes.
     """
     start_s = request.GET.get("start")
     end_s = request.GET.get("end")
@@ -306,22 +393,484 @@ def api_kategoria_bejegyzesek(request):
         .order_by("-datum", "-kezdet", "-id")   # legújabb felül
     )
 
-    entries = []
-    for s in qs:
-        minutes = int(s.ido.total_seconds() // 60) if s.ido else 0
-        entries.append({
-            "id": s.id,
-            "datum": s.datum.isoformat(),
-            "kezdet": s.kezdet.strftime("%H:%M") if s.kezdet else "",
-            "veg": s.veg.strftime("%H:%M") if s.veg else "",
-            "minutes": minutes,
-            "tevekenyseg": s.tevekenyseg,
-            "megjegyzes": s.megjegyzes or "",
-        })
+    # hierarchikus drill-down: a levél útvonalának többi szintje is szűrés
+    for dim in HIERARCHIA_DIMENZIOK:
+        if dim != "kategoria" and dim in request.GET:
+            qs = qs.filter(**{dim: request.GET.get(dim) or ""})
 
+    entries = [s.adat(KATEGORIA_BEJEGYZES_MEZOK) for s in vetites(qs, KATEGORIA_BEJEGYZES_MEZOK)]
     return JsonResponse({"entries": entries})
 
 
+def _hierarchia_szintek(szintek_s):
+    """'kategoria,kapcsolodo' -> ['kategoria', 'kapcsolodo'] (csak engedélyezett, ismétlés nélkül)."""
+    szintek = []
+    for dim in (szintek_s or "").split(","):
+        dim = dim.strip()
+        if dim in HIERARCHIA_DIMENZIOK and dim not in szintek:
+            szintek.append(dim)
+    return szintek[:HIERARCHIA_MAX_SZINT]
+
+
+def _perc_elosztas(perc, masodpercek):
+    """
+    `perc` szétosztása a másodpercek arányában egész percekre (legnagyobb maradék):
+    mindenki a lefelé kerekített percét kapja, a hiányzó perceket a legnagyobb
+    töredékűek. Az összeg pontosan `perc`.
+    """
+    sec = [int(round(x)) for x in masodpercek]
+    out = [x // 60 for x in sec]
+    maradek = max(0, min(len(sec), perc - sum(out)))
+    for idx in sorted(range(len(sec)), key=lambda k: -(sec[k] % 60))[:maradek]:
+        out[idx] += 1
+    return out
+
+
+def _hierarchia_metszes(node, top, perc=None):
+    """
+    Node-onként csak a top N legnagyobb gyerek marad, a többi egy 'Egyéb' csomópontba kerül.
+    A másodpercekből itt lesz perc: a gyökér egyszer kerekít, lefelé minden szülő
+    perce a gyerekei között oszlik el, így a szülő összege pontosan a gyerekeké.
+    """
+    children = sorted(node.pop("_children").values(), key=lambda c: -c["_sec"])
+    kept, rest = children[:top], children[top:]
+
+    sec = node.pop("_sec")
+    node["minutes"] = int(sec // 60) if perc is None else perc
+    if not children:
+        return node
+
+    rest_sec = sum(c["_sec"] for c in rest)
+    percek = _perc_elosztas(node["minutes"], [c["_sec"] for c in kept] + ([rest_sec] if rest else []))
+    node["children"] = [_hierarchia_metszes(c, top, p) for c, p in zip(kept, percek)]
+    if rest:
+        node["children"].append({
+            "name": f"Egyéb ({len(rest)} db)",
+            "dim": rest[0]["dim"],
+            "egyeb": True,
+            "minutes": percek[-1],
+        })
+    return node
+
+
+def api_hierarchia_osszefoglalo(request):
+    """
+    GET:
+      - start=YYYY-MM-DD
+      - end=YYYY-MM-DD
+      - szintek=kategoria,kapcsolodo,tevekenyseg (opcionális, max 4 szint)
+      - top=12 (opcionális, node-onként megtartott gyerekek száma)
+
+    Válasz:
+      {
+        "szintek": ["kategoria", "kapcsolodo", "tevekenyseg"],
+        "root": {"name": "", "minutes": 1000, "children": [
+          {"name": "Munka", "dim": "kategoria", "minutes": 600, "children": [...]},
+          {"name": "Egyéb (7 db)", "dim": "kategoria", "egyeb": true, "minutes": 40},
+        ]}
+      }
+
+    Egyetlen GROUP BY a legfinomabb szintre; a részösszegek (ROLLUP) ebből
+    egy menetben állnak elő, így a treemap további kérés nélkül zoomolhat.
+    Az Alvás kategória – a treemap többi API-jához hasonlóan – kimarad.
+    """
+    start_s = request.GET.get("start")
+    end_s = request.GET.get("end")
+
+    start_d = parse_date(start_s) if start_s else None
+    end_d = parse_date(end_s) if end_s else None
+
+    if not start_d or not end_d:
+        return JsonResponse({"error": "Kell start és end (YYYY-MM-DD)."}, status=400)
+
+    szintek = _hierarchia_szintek(request.GET.get("szintek")) or list(HIERARCHIA_ALAP_SZINTEK)
+
+    try:
+        top = max(1, min(50, int(request.GET.get("top") or 12)))
+    except ValueError:
+        top = 12
+
+    rows = (
+        NaploSor.objects
+        .filter(datum__range=(start_d, end_d))
+        .exclude(kategoria__iexact="Alvás")
+        .values_list(*szintek)
+        .annotate(total_ido=Sum("ido"))
+        .order_by()
+    )
+
+    root = {"name": "", "_sec": 0, "_children": {}}
+    for row in rows:
+        dur = row[-1]
+        sec = dur.total_seconds() if dur else 0
+        node = root
+        node["_sec"] += sec
+        for dim, value in zip(szintek, row[:-1]):
+            name = value or ""
+            child = node["_children"].get(name)
+            if child is None:
+                child = {"name": name, "dim": dim, "_sec": 0, "_children": {}}
+                node["_children"][name] = child
+            child["_sec"] += sec
+            node = child
+
+    return JsonResponse({"szintek": szintek, "root": _hierarchia_metszes(root, top)})
+
+
+def api_heti_hoterkep(request):
+    """
+    GET:
+      - start=YYYY-MM-DD
+      - end=YYYY-MM-DD
+      - kategoria=szoveg (opcionális, csak ez az egy kategória)
+
+    Válasz:
+      {
+        "napok": ["H", "K", ...],
+        "osszes": {"minutes": 1000, "racs": [[perc x 24] x 7]},
+        "kategoriak": [{"kategoria": "...", "minutes": 600, "racs": [[...]]}, ...]
+      }
+
+    A sorok pontos órás szeletekre bomlanak (éjfélen átnyúló sor a következő
+    nap 0. órájába is ad), egy streamelt menetben. Az eredmény tartományonként
+    cache-elt, mentéskor/törléskor elévül.
+    """
+    start_s = request.GET.get("start")
+    end_s = request.GET.get("end")
+    kategoria = (request.GET.get("kategoria") or "").strip()
+
+    start_d = parse_date(start_s) if start_s else None
+    end_d = parse_date(end_s) if end_s else None
+
+    if not start_d or not end_d:
+        return JsonResponse({"error": "Kell start és end (YYYY-MM-DD)."}, status=400)
+
+    def szamol():
+        qs = NaploSor.objects.filter(datum__range=(start_d, end_d))
+        if kategoria:
+            qs = qs.filter(kategoria=kategoria)
+        rows = qs.order_by().values_list("kategoria", "datum", "kezdet", "ido").iterator(chunk_size=2000)
+
+        racsok = hoterkep_racs(rows)
+
+        osszes = [[0.0] * 24 for _ in range(7)]
+        kategoriak = []
+        for kat, racs in racsok.items():
+            total_sec = 0.0
+            for nap in range(7):
+                for ora in range(24):
+                    osszes[nap][ora] += racs[nap][ora]
+                    total_sec += racs[nap][ora]
+            kategoriak.append({
+                "kategoria": kat or "",
+                "minutes": int(total_sec // 60),
+                "racs": [[int(round(sec / 60)) for sec in nap] for nap in racs],
+            })
+        kategoriak.sort(key=lambda k: -k["minutes"])
+
+        return {
+            "napok": NAPOK,
+            "osszes": {
+                "minutes": sum(k["minutes"] for k in kategoriak),
+                "racs": [[int(round(sec / 60)) for sec in nap] for nap in osszes],
+            },
+            "kategoriak": kategoriak,
+        }
+
+    data = tartomany_cache("hoterkep", (start_d, end_d, kategoria), szamol)
+    return JsonResponse(data)
+
+
+def api_idovonal_ellenorzes(request):
+    """
+    GET:
+      - start=YYYY-MM-DD (opcionális)
+      - end=YYYY-MM-DD (opcionális) – nélkülük a teljes napló
+
+    Válasz:
+      {
+        "osszesites": {"napok": 80, "hibas_napok": 3, "hezag_db": 2, "hezag_perc": 45,
+                       "atfedes_db": 1, "atfedes_perc": 10, "nulla_db": 0},
+        "napok": [{"datum": "2025-12-01", "sorok": 14, "hezag_db": 1, ...,
+                   "hezagok": [{"tol": "...", "ig": "...", "perc": 45}],
+                   "atfedesek": [{"id": 12, "masik_id": 11, "perc": 10}],
+                   "nulla": [15]}, ...]
+      }
+
+    Csak a hibás napok szerepelnek a listában; a sweep egy rendezett bejárás.
+    """
+    start_s = request.GET.get("start")
+    end_s = request.GET.get("end")
+
+    start_d = parse_date(start_s) if start_s else None
+    end_d = parse_date(end_s) if end_s else None
+
+    napok = idovonal_ellenorzes(start_d, end_d)
+
+    osszesites = {"napok": len(napok), "hibas_napok": 0, "hezag_db": 0, "hezag_perc": 0,
+                  "atfedes_db": 0, "atfedes_perc": 0, "nulla_db": 0}
+    hibas = []
+    for d in sorted(napok):
+        nap = napok[d]
+        o = nap_osszesites(nap)
+        for k in ("hezag_db", "hezag_perc", "atfedes_db", "atfedes_perc", "nulla_db"):
+            osszesites[k] += o[k]
+        if not (o["hezag_db"] or o["atfedes_db"] or o["nulla_db"]):
+            continue
+        osszesites["hibas_napok"] += 1
+        hibas.append({
+            "datum": d.isoformat(),
+            **o,
+            "hezagok": [
+                {"tol": tol.isoformat(timespec="minutes"), "ig": ig.isoformat(timespec="minutes"),
+                 "perc": int((ig - tol).total_seconds() // 60)}
+                for tol, ig in nap["hezagok"]
+            ],
+            "atfedesek": [
+                {"id": pk, "masik_id": masik, "perc": int(sec // 60)}
+                for pk, masik, sec in nap["atfedesek"]
+            ],
+            "nulla": nap["nulla"],
+        })
+
+    return JsonResponse({"osszesites": osszesites, "napok": hibas})
+
+
+# Napi rollup + gördülő átlagok SQLite ablakfüggvényekkel (RANGE: naptári napok,
+# nem sorok; a hiányzó napok így nem torzítják az ablakot). Az átlag súlyozott:
+# SUM(ertek) / COUNT(ertek) az ablakon belül.
+ERTEK_GORDULO_SQL = """
+WITH napi AS (
+    SELECT datum, NULL AS kategoria, SUM(ertek) AS s, COUNT(ertek) AS n
+    FROM {tabla}
+    WHERE datum BETWEEN %s AND %s AND ertek IS NOT NULL
+    GROUP BY datum
+    {kategoria_union}
+),
+gordulo AS (
+    SELECT datum, kategoria, s, n,
+           SUM(s) OVER w7 AS s7, SUM(n) OVER w7 AS n7,
+           SUM(s) OVER w30 AS s30, SUM(n) OVER w30 AS n30
+    FROM napi
+    WINDOW w7 AS (PARTITION BY kategoria ORDER BY julianday(datum)
+                  RANGE BETWEEN 6 PRECEDING AND CURRENT ROW),
+           w30 AS (PARTITION BY kategoria ORDER BY julianday(datum)
+                   RANGE BETWEEN 29 PRECEDING AND CURRENT ROW)
+)
+SELECT kategoria, datum, n,
+       ROUND(1.0 * s / n, 2), ROUND(1.0 * s7 / n7, 2), ROUND(1.0 * s30 / n30, 2)
+FROM gordulo
+WHERE datum >= %s
+ORDER BY kategoria, datum
+"""
+
+ERTEK_GORDULO_KATEGORIA_SQL = """
+    UNION ALL
+    SELECT datum, kategoria, SUM(ertek), COUNT(ertek)
+    FROM {tabla}
+    WHERE datum BETWEEN %s AND %s AND ertek IS NOT NULL AND kategoria IN ({helyek})
+    GROUP BY datum, kategoria
+"""
+
+
+def api_ertek_gordulo(request):
+    """
+    GET:
+      - start=YYYY-MM-DD
+      - end=YYYY-MM-DD
+      - kategoria=szoveg (opcionális, ismételhető: ?kategoria=A&kategoria=B)
+
+    Válasz:
+      {"series":[
+        {"kategoria": null, "label": "Összes", "pontok": [
+          {"datum": "2025-12-01", "db": 12, "atlag": 6.5, "atlag_7": 6.3, "atlag_30": 6.1}, ...]},
+        {"kategoria": "Munka", "label": "Munka", "pontok": [...]}
+      ]}
+
+    A számolás teljesen SQL-ben fut (napi GROUP BY + ablakfüggvények); a 30
+    napos ablak miatt a rollup a kezdet előtti 29 napot is beolvassa.
+    """
+    start_s = request.GET.get("start")
+    end_s = request.GET.get("end")
+    kategoriak = [k.strip() for k in request.GET.getlist("kategoria") if k.strip()][:20]
+
+    start_d = parse_date(start_s) if start_s else None
+    end_d = parse_date(end_s) if end_s else None
+
+    if not start_d or not end_d:
+        return JsonResponse({"error": "Kell start és end (YYYY-MM-DD)."}, status=400)
+
+    def szamol():
+        tabla = connection.ops.quote_name(NaploSor._meta.db_table)
+        elo = (start_d - timedelta(days=29)).isoformat()
+        params = [elo, end_d.isoformat()]
+        kategoria_union = ""
+        if kategoriak:
+            kategoria_union = ERTEK_GORDULO_KATEGORIA_SQL.format(
+                tabla=tabla, helyek=", ".join(["%s"] * len(kategoriak))
+            )
+            params += [elo, end_d.isoformat(), *kategoriak]
+        params.append(start_d.isoformat())
+
+        sql = ERTEK_GORDULO_SQL.format(tabla=tabla, kategoria_union=kategoria_union)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        series = {}
+        for kat, datum, n, atlag, atlag_7, atlag_30 in rows:
+            if kat not in series:
+                series[kat] = {"kategoria": kat, "label": kat if kat is not None else "Összes", "pontok": []}
+            series[kat]["pontok"].append({
+                "datum": datum,
+                "db": n,
+                "atlag": atlag,
+                "atlag_7": atlag_7,
+                "atlag_30": atlag_30,
+            })
+
+        out = [series.get(None) or {"kategoria": None, "label": "Összes", "pontok": []}]
+        out += [series[k] for k in kategoriak if k in series]
+        return {"series": out}
+
+    data = tartomany_cache("ertek_gordulo", (start_d, end_d, *kategoriak), szamol)
+    return JsonResponse(data)
+
+
+# Összehasonlításnál választható dimenziók (+ "eletkerek", ami JSON listából oszlik)
+OSSZEHASONLITAS_DIMENZIOK = ("kategoria", "kapcsolodo", "szerep", "erzelem", "kapcsolodo_cel", "eletkerek")
+
+
+def _percek(dur):
+    return dur.total_seconds() / 60 if dur else 0.0
+
+
+def _alap_referencia(start_d, end_d):
+    """Az alapértelmezett összehasonlító időszak: (ref_start, ref_end, mod)."""
+    kovetkezo = end_d + timedelta(days=1)
+    if start_d.day == 1 and kovetkezo.day == 1:
+        # egész naptári hónap(ok): ugyanannyi hónap visszafelé, a hónapok tényleges hosszával
+        honapok = (end_d.year - start_d.year) * 12 + end_d.month - start_d.month + 1
+        sorszam = start_d.year * 12 + start_d.month - 1 - honapok
+        ref_start_d = start_d.replace(year=sorszam // 12, month=sorszam % 12 + 1)
+        return ref_start_d, start_d - timedelta(days=1), "naptari_honap"
+    hossz = end_d - start_d
+    ref_end_d = start_d - timedelta(days=1)
+    return ref_end_d - hossz, ref_end_d, "elozo_idoszak"
+
+
+def api_osszehasonlitas(request):
+    """
+    GET:
+      - start=YYYY-MM-DD, end=YYYY-MM-DD   (vizsgált időszak)
+      - ref_start=YYYY-MM-DD, ref_end=YYYY-MM-DD (opcionális; alapból, ha a
+        vizsgált időszak egész naptári hónap(ok), akkor az előtte lévő ugyanannyi
+        naptári hónap (márc. 1–31 -> febr. 1–28), különben az előtte lévő,
+        ugyanolyan hosszú időszak)
+      - dim=kategoria|kapcsolodo|szerep|erzelem|kapcsolodo_cel|eletkerek (alap: kategoria)
+
+    Válasz:
+      {
+        "dim": "kategoria",
+        "idoszak": {"start": "...", "end": "...", "total_minutes": 1000},
+        "ref": {"start": "...", "end": "...", "total_minutes": 900,
+                "mod": "naptari_honap"},   # vagy "elozo_idoszak" / "megadott"
+        "items": [{"kulcs": "Munka", "label": "Munka", "minutes": 600, "ref_minutes": 500,
+                   "delta": 100, "delta_pct": 20.0}, ...]
+      }
+
+    Egy lekérdezés, feltételes aggregálással (SUM ... FILTER) mindkét időszakra;
+    az eredmény tartomány-cache-elt, így egy összehasonlítás annyiba kerül, mint
+    egy sima összefoglaló.
+    """
+    start_s = request.GET.get("start")
+    end_s = request.GET.get("end")
+    dim = (request.GET.get("dim") or "kategoria").strip()
+
+    start_d = parse_date(start_s) if start_s else None
+    end_d = parse_date(end_s) if end_s else None
+
+    if not start_d or not end_d or end_d < start_d:
+        return JsonResponse({"error": "Kell start és end (YYYY-MM-DD)."}, status=400)
+    if dim not in OSSZEHASONLITAS_DIMENZIOK:
+        return JsonResponse({"error": f"Ismeretlen dim: {dim}"}, status=400)
+
+    ref_start_s = request.GET.get("ref_start")
+    ref_end_s = request.GET.get("ref_end")
+    ref_start_d = parse_date(ref_start_s) if ref_start_s else None
+    ref_end_d = parse_date(ref_end_s) if ref_end_s else None
+    if ref_start_d and ref_end_d:
+        ref_mod = "megadott"
+    else:
+        ref_start_d, ref_end_d, ref_mod = _alap_referencia(start_d, end_d)
+
+    def szamol():
+        q_cur = Q(datum__range=(start_d, end_d))
+        q_ref = Q(datum__range=(ref_start_d, ref_end_d))
+        group_field = "eletkerek_focus" if dim == "eletkerek" else dim
+
+        rows = (
+            NaploSor.objects
+            .filter(q_cur | q_ref)
+            .values_list(group_field)
+            .annotate(cur=Sum("ido", filter=q_cur), ref=Sum("ido", filter=q_ref))
+            .order_by()
+        )
+
+        cur_total = ref_total = 0.0
+        per = {}
+        for key, cur, ref in rows:
+            cur_m, ref_m = _percek(cur), _percek(ref)
+            cur_total += cur_m
+            ref_total += ref_m
+
+            if dim == "eletkerek":
+                # több terület esetén az idő egyenlően oszlik (mint az életkerék összefoglalóban)
+                tags = [t for t in (key or []) if t in dict(ELETKEREK_ORDER)]
+                shares = [(t, 1 / len(tags)) for t in tags]
+            else:
+                shares = [(key or "", 1.0)]
+
+            for k, arany in shares:
+                acc = per.setdefault(k, [0.0, 0.0])
+                acc[0] += cur_m * arany
+                acc[1] += ref_m * arany
+
+        if dim == "eletkerek":
+            labels = dict(ELETKEREK_ORDER)
+            keys = [code for code, _ in ELETKEREK_ORDER]
+        else:
+            labels = {}
+            keys = sorted(per, key=lambda k: -max(per[k]))
+
+        items = []
+        for k in keys:
+            cur_m, ref_m = per.get(k, (0.0, 0.0))
+            cur_i, ref_i = int(round(cur_m)), int(round(ref_m))
+            delta = cur_i - ref_i
+            items.append({
+                "kulcs": k,
+                "label": labels.get(k, k),
+                "minutes": cur_i,
+                "ref_minutes": ref_i,
+                "delta": delta,
+                "delta_pct": round(delta / ref_i * 100.0, 1) if ref_i else None,
+            })
+
+        return {
+            "dim": dim,
+            "idoszak": {"start": start_d.isoformat(), "end": end_d.isoformat(), "total_minutes": int(round(cur_total))},
+            "ref": {
+                "start": ref_start_d.isoformat(), "end": ref_end_d.isoformat(),
+                "total_minutes": int(round(ref_total)), "mod": ref_mod,
+            },
+            "items": items,
+        }
+
+    data = tartomany_cache("osszehasonlitas", (start_d, end_d, ref_start_d, ref_end_d, ref_mod, dim), szamol)
+    return JsonResponse(data)
+
+
 def api_utolso_bejegyzesek_kategoriara(request):
     """
     GET:
@@ -333,6 +882,9 @@ def api_utolso_bejegyzesek_kategoriara(request):
         {id, datum, kezdet, veg, ertek, kapcsolodo, szerep, erzelem, kapcsolodo_cel, tevekenyseg, megjegyzes},
         ...
       ]}
+
+    A megjegyzes itt sima szöveges kivonat; a form kitöltéséhez a teljes HTML-t
+    a kliens kattintáskor kéri le (api_megjegyzes).
     """
     kategoria = (request.GET.get("kategoria") or "").strip()
     limit_s = request.GET.get("limit") or "20"
@@ -351,34 +903,59 @@ def api_utolso_bejegyzesek_kategoriara(request):
         .order_by("-datum", "-kezdet", "-id")[:limit]
     )
 
-    entries = []
-    for s in qs:
-        entries.append({
-            "id": s.id,
-            "datum": s.datum.isoformat(),
-            "kezdet": s.kezdet.strftime("%H:%M") if s.kezdet else "",
-            "veg": s.veg.strftime("%H:%M") if s.veg else "",
-
-            # a formhoz kellő mezők
-            "ertek": s.ertek,
-            "kapcsolodo": s.kapcsolodo or "",
-            "szerep": s.szerep or "",
-            "erzelem": s.erzelem or "",
-            "kapcsolodo_cel": s.kapcsolodo_cel or "",
-            "tevekenyseg": s.tevekenyseg or "",
-            "megjegyzes": s.megjegyzes or "",
-            "eletkerek_focus": list(s.eletkerek_focus or []),
-        })
-
+    entries = [s.adat(UTOLSO_KATEGORIARA_MEZOK) for s in vetites(qs, UTOLSO_KATEGORIARA_MEZOK)]
     return JsonResponse({"entries": entries})
 
 
+def api_megjegyzes(request, pk):
+    """
+    GET: egy sor teljes megjegyzése (a listás végpontok csak kivonatot adnak).
+
+    Válasz:
+      {"id": 12, "megjegyzes": "<p>…TinyMCE HTML…</p>", "szoveg": "…sima szöveg…"}
+    """
+    row = (
+        NaploSor.objects.filter(pk=pk)
+        .values("id", "megjegyzes", "megjegyzes_szoveg").first()
+    )
+    if row is None:
+        return JsonResponse({"error": "Nincs ilyen sor."}, status=404)
+
+    return JsonResponse({"id": row["id"], "megjegyzes": row["megjegyzes"], "szoveg": row["megjegyzes_szoveg"]})
+
+
+def api_tevekenyseg_javaslat(request):
+    """
+    GET:
+      - q=szoveg (a tevékenység eleje, kis/nagybetű mindegy)
+      - limit=10 (opcionális, max 30)
+
+    Válasz:
+      {"javaslatok":[{"tevekenyseg": "...", "db": 12, "utolso": "2026-01-07"}, ...]}
+
+    Memóriabeli prefix indexből (autocomplete.py), gyakoriság és frissesség szerint.
+    """
+    q = request.GET.get("q") or ""
+    try:
+        limit = max(1, min(30, int(request.GET.get("limit") or 10)))
+    except ValueError:
+        limit = 10
+
+    javaslatok = [
+        {"tevekenyseg": szoveg, "db": db, "utolso": utolso.isoformat() if utolso else ""}
+        for szoveg, db, utolso in tevekenyseg_index.javasol(q, limit=limit, ma=timezone.localdate())
+    ]
+    return JsonResponse({"javaslatok": javaslatok})
+
+
 def dashboard_kereses(request):
     """
     Kérdésvezérelt dashboard (v1) – globális kereső a naplóban.
 
     GET paraméterek:
-      - q: keresőkifejezés
+      - q: keresőkifejezés; mezős részekkel is, pl.
+           kategoria:Munka erzelem:öröm cel:"hosszú távú" ertek>=7 ido>60 nap:hétfő datum>=2025-12-01
+           (a szöveges mezőknél ':' = kezdődik-vel, '=' = pontosan; ido percben)
       - start: YYYY-MM-DD (opcionális)
       - end: YYYY-MM-DD (opcionális)
 
@@ -410,113 +987,96 @@ def dashboard_kereses(request):
     results = []
     day_groups = []
     day_nav = []
+    hibak = []
 
     if q:
-        # szöveges keresés több mezőben egyszerre
-        q_obj = (
-            Q(tevekenyseg__icontains=q)
-            | Q(megjegyzes__icontains=q)
-            | Q(kategoria__icontains=q)
-            | Q(kapcsolodo__icontains=q)
-            | Q(szerep__icontains=q)
-            | Q(erzelem__icontains=q)
-            | Q(kapcsolodo_cel__icontains=q)
-        )
+        # mezős részek (kategoria:Munka ertek>=7 nap:hétfő ...) -> célzott szűrők,
+        # csak a maradék szabad szöveg megy a teljes szöveges keresésre
+        mezo_szuro, szabad, hibak = lekerdezes_forditas(q)
+
+        # csak hibás mezős tokenek: a Q() mindenre illeszkedne, a teljes napló helyett
+        # üres találat + a hibaüzenetek
+        if hibak and not mezo_szuro and not szabad:
+            qs = qs.none()
+
+        q_obj = Q()
+        if szabad:
+            # szöveges keresés több mezőben egyszerre – a normalizált (ékezet nélküli,
+            # kisbetűs) 'kereso' árnyékmezőben, így "erzelem" megtalálja az "Érzelem"-et
+            q_obj = Q(kereso__contains=normalizal(szabad))
 
-        # ha a q tisztán szám, akkor Érték-re is szűrünk
-        if q.isdigit():
-            try:
-                q_int = int(q)
-                q_obj = q_obj | Q(ertek=q_int)
-            except ValueError:
-                pass
+            # ha a szabad szöveg tisztán szám, akkor Érték-re is szűrünk
+            if szabad.isdigit():
+                q_obj = q_obj | Q(ertek=int(szabad))
 
         qs2 = (
-            qs.filter(q_obj)
+            qs.filter(mezo_szuro, q_obj)
             .order_by("-datum", "-kezdet", "-id")
+            # összegzés a teljes találathalmazra ugyanabban a lekérdezésben:
+            # az ablakfüggvény a LIMIT előtt fut, így nem kell külön aggregate()/count()
+            .annotate(
+                osszes_db=Window(Count("id")),
+                osszes_ido=Window(Sum("ido")),
+                osszes_atlag=Window(Avg("ertek")),
+            )
+            .values_list(*oszlopok(DASHBOARD_MEZOK), "osszes_db", "osszes_ido", "osszes_atlag")
         )
 
-        # összegzés (percek + átlag Érték)
-        agg = qs2.aggregate(
-            total_ido=Sum("ido"),
-            avg_ertek=Avg("ertek"),
-        )
-        total_minutes = int((agg["total_ido"].total_seconds() // 60)) if agg.get("total_ido") else 0
-        avg_ertek = agg.get("avg_ertek")
-        summary = {
-            "count": qs2.count(),
-            "total_minutes": total_minutes,
-            "total_human": format_minutes(total_minutes),
-            "avg_ertek": round(avg_ertek, 2) if avg_ertek is not None else None,
-        }
+        # Egy menet: találatok + napi csoportok + navigáció. A sorrend legújabb ->
+        # legrégebbi, így egy nap sorai egymás után jönnek.
+        g = None
+        n = len(DASHBOARD_MEZOK)
+        for row in qs2[:500]:  # v1: gyors, mégis bőséges
+            r = Sor.sorbol(DASHBOARD_MEZOK, row[:n])
+            osszes_db, osszes_ido, osszes_atlag = row[n:]
+            datum = r.datum
+
+            if g is None:
+                total_minutes = int(osszes_ido.total_seconds() // 60) if osszes_ido else 0
+                summary = {
+                    "count": osszes_db,
+                    "total_minutes": total_minutes,
+                    "total_human": format_minutes(total_minutes),
+                    "avg_ertek": round(osszes_atlag, 2) if osszes_atlag is not None else None,
+                }
 
-        for s in qs2[:500]:  # v1: gyors, mégis bőséges
-            minutes = int(s.ido.total_seconds() // 60) if s.ido else 0
-            results.append({
-                "id": s.id,
-                "edit_url": reverse("naplo_bevitel_edit", args=[s.id]),
-                "datum": s.datum,
-                "kezdet": s.kezdet,
-                "veg": s.veg,
-                "minutes": minutes,
-                "ertek": s.ertek,
-                "kategoria": s.kategoria or "",
-                "kapcsolodo": s.kapcsolodo or "",
-                "szerep": s.szerep or "",
-                "erzelem": s.erzelem or "",
-                "kapcsolodo_cel": s.kapcsolodo_cel or "",
-                "tevekenyseg": s.tevekenyseg or "",
-                "megjegyzes": s.megjegyzes or "",
-            })
+            results.append(r)
 
-        # Napi csoportosítás (ritmus / áttekintés)
-        # A results már legújabb -> legrégebbi sorrendben van.
-        by_day = {}
-        for r in results:
-            d = r["datum"]
-            key = d.isoformat()
-            if key not in by_day:
-                by_day[key] = {
-                    "date": d,
-                    "anchor": f"d{d.strftime('%Y%m%d')}",
-                    "items": [],
+            # Napi csoportosítás (ritmus / áttekintés)
+            if g is None or g["date"] != datum:
+                anchor = f"d{datum.strftime('%Y%m%d')}"
+                g = {
+                    "date": datum,
+                    "anchor": anchor,
+                    "count": 0,
                     "total_minutes": 0,
                     "ertek_sum": 0,
                     "ertek_count": 0,
+                    "items": [],
                 }
-            g = by_day[key]
+                day_groups.append(g)
+                day_nav.append({
+                    "anchor": anchor,
+                    "date": datum,
+                    "label": datum.strftime("%m.%d"),
+                    "title": datum.strftime("%Y.%m.%d"),
+                    "month": datum.month,
+                    "style": month_pill_style(datum.month),
+                })
+
             g["items"].append(r)
-            g["total_minutes"] += int(r.get("minutes") or 0)
-            if r.get("ertek") is not None:
-                g["ertek_sum"] += int(r["ertek"])
+            g["count"] += 1
+            g["total_minutes"] += r.minutes
+            if r.ertek is not None:
+                g["ertek_sum"] += r.ertek
                 g["ertek_count"] += 1
 
-        # by_day megőrzi a beszúrási sorrendet (Python 3.7+), ez a legújabb napok sorrendje.
-        day_groups = []
-        day_nav = []
-        for g in by_day.values():
-            avg = (g["ertek_sum"] / g["ertek_count"]) if g["ertek_count"] else None
-            day_groups.append({
-                "date": g["date"],
-                "anchor": g["anchor"],
-                "count": len(g["items"]),
-                "total_minutes": g["total_minutes"],
-                "total_human": format_minutes(g["total_minutes"]),
-                "avg_ertek": round(avg, 2) if avg is not None else None,
-                "items": g["items"],
-            })
-            day_nav.append({
-                "anchor": g["anchor"],
-                "date": g["date"],
-            })
-
-        # day_nav kiegészítése címkékkel
-        for n in day_nav:
-            d = n["date"]
-            n["label"] = d.strftime("%m.%d")
-            n["title"] = d.strftime("%Y.%m.%d")
-            n["month"] = d.month
-            n["style"] = month_pill_style(d.month)
+        # napi átlagok / szöveges összidő (napok száma szerinti lépés, nem soronkénti)
+        for g in day_groups:
+            avg = g.pop("ertek_sum") / g["ertek_count"] if g["ertek_count"] else None
+            g.pop("ertek_count")
+            g["avg_ertek"] = round(avg, 2) if avg is not None else None
+            g["total_human"] = format_minutes(g["total_minutes"])
 
     return render(
         request,
@@ -526,6 +1086,7 @@ def dashboard_kereses(request):
             "start": start_s,
             "end": end_s,
             "summary": summary,
+            "hibak": hibak,
             "results": results,
             "day_groups": day_groups,
             "day_nav": day_nav,
@@ -533,6 +1094,49 @@ def dashboard_kereses(request):
     )
 
 
+def _nap_adatok(d):
+    """
+    Egy nap idővonala és összesítői egyetlen rendezett lekérdezésből:
+    sorok, összidő, Érték min/átlag/max, TOP kategóriák, TOP célok.
+    """
+    entries = list(vetites(NaploSor.objects.filter(datum=d).order_by("kezdet", "id"), NAP_MEZOK))
+
+    total_minutes = 0
+    ertek_vals = []
+    kat_sec = {}
+    cel_sec = {}
+
+    for e in entries:
+        # a kezdet/vég percre pontos, így az ido is egész perc
+        sec = e.minutes * 60
+        total_minutes += e.minutes
+        if e.ertek is not None:
+            ertek_vals.append(e.ertek)
+
+        kat_sec[e.kategoria] = kat_sec.get(e.kategoria, 0) + sec
+        if e.kapcsolodo_cel:
+            cel_sec[e.kapcsolodo_cel] = cel_sec.get(e.kapcsolodo_cel, 0) + sec
+
+    def top(per_sec, kulcs):
+        out = []
+        for nev, sec in sorted(per_sec.items(), key=lambda kv: (-kv[1], kv[0]))[:12]:
+            m = int(sec // 60)
+            out.append({kulcs: nev, "minutes": m, "human": format_minutes(m)})
+        return out
+
+    return {
+        "entries": entries,
+        "total_minutes": total_minutes,
+        "total_human": format_minutes(total_minutes),
+        "avg_ertek": round(sum(ertek_vals) / len(ertek_vals), 2) if ertek_vals else None,
+        "min_ertek": min(ertek_vals) if ertek_vals else None,
+        "max_ertek": max(ertek_vals) if ertek_vals else None,
+        # TOP kategóriák (perc) / TOP célok (perc) – csak ha van szöveg
+        "top_kategoriak": top(kat_sec, "kategoria"),
+        "top_celok": top(cel_sec, "cel"),
+    }
+
+
 def nap_attekintes(request):
     """
     Napi összkép – válasz a kérdésre: 'hogyan telt egy bizonyos napom?'
@@ -544,94 +1148,36 @@ def nap_attekintes(request):
       - idővonal (sorok időrendben)
       - napi összesítők
       - TOP kategóriák / TOP célok
+      - előző / következő nap (amelyiken van bejegyzés)
+
+    A múltbeli napok adatai cache-eltek (mentéskor az adott nap kulcsa törlődik);
+    a szomszéd napok és az idővonal-jelzés indexelt egysoros lekérdezések.
     """
     date_s = (request.GET.get("date") or request.GET.get("datum") or "").strip()
     d = parse_date(date_s) if date_s else None
 
     if d is None:
         # alapértelmezés: legutóbbi bejegyzés napja, ha nincs, akkor a mai nap
-        last = NaploSor.objects.order_by("-datum", "-kezdet", "-id").first()
-        if last and last.datum:
-            d = last.datum
-        else:
+        d = NaploSor.objects.order_by("-datum").values_list("datum", flat=True).first()
+        if d is None:
             d = timezone.localdate()
 
-    qs = NaploSor.objects.filter(datum=d).order_by("kezdet", "id")
-
-    entries = []
-    total_minutes = 0
-    ertek_vals = []
-
-    for s in qs:
-        minutes = int(s.ido.total_seconds() // 60) if s.ido else 0
-        total_minutes += minutes
-        if s.ertek is not None:
-            try:
-                ertek_vals.append(int(s.ertek))
-            except (TypeError, ValueError):
-                pass
-
-        entries.append({
-            "id": s.id,
-            "edit_url": reverse("naplo_bevitel_edit", args=[s.id]),
-            "datum": s.datum,
-            "kezdet": s.kezdet,
-            "veg": s.veg,
-            "minutes": minutes,
-            "minutes_human": format_minutes(minutes),
-            "ertek": s.ertek,
-            "kategoria": s.kategoria or "",
-            "kapcsolodo": s.kapcsolodo or "",
-            "szerep": s.szerep or "",
-            "erzelem": s.erzelem or "",
-            "kapcsolodo_cel": s.kapcsolodo_cel or "",
-            "tevekenyseg": s.tevekenyseg or "",
-            "megjegyzes": s.megjegyzes or "",
-        })
-
-    avg_ertek = round(sum(ertek_vals) / len(ertek_vals), 2) if ertek_vals else None
-    min_ertek = min(ertek_vals) if ertek_vals else None
-    max_ertek = max(ertek_vals) if ertek_vals else None
+    if d < timezone.localdate():
+        adatok = nap_cache(d, lambda: _nap_adatok(d))
+    else:
+        adatok = _nap_adatok(d)
 
-    # TOP kategóriák (perc)
-    cat_rows = (
-        NaploSor.objects
-        .filter(datum=d)
-        .values("kategoria")
-        .annotate(total_ido=Sum("ido"))
-        .order_by("-total_ido", "kategoria")
+    elozo_nap = (
+        NaploSor.objects.filter(datum__lt=d)
+        .order_by("-datum").values_list("datum", flat=True).first()
     )
-
-    top_kategoriak = []
-    for r in cat_rows[:12]:
-        dur = r.get("total_ido")
-        m = int(dur.total_seconds() // 60) if dur else 0
-        top_kategoriak.append({
-            "kategoria": r.get("kategoria") or "",
-            "minutes": m,
-            "human": format_minutes(m),
-        })
-
-    # TOP célok (perc) – csak ha van szöveg
-    cel_rows = (
-        NaploSor.objects
-        .filter(datum=d)
-        .exclude(kapcsolodo_cel__isnull=True)
-        .exclude(kapcsolodo_cel__exact="")
-        .values("kapcsolodo_cel")
-        .annotate(total_ido=Sum("ido"))
-        .order_by("-total_ido", "kapcsolodo_cel")
+    kovetkezo_nap = (
+        NaploSor.objects.filter(datum__gt=d)
+        .order_by("datum").values_list("datum", flat=True).first()
     )
 
-    top_celok = []
-    for r in cel_rows[:12]:
-        dur = r.get("total_ido")
-        m = int(dur.total_seconds() // 60) if dur else 0
-        top_celok.append({
-            "cel": r.get("kapcsolodo_cel") or "",
-            "minutes": m,
-            "human": format_minutes(m),
-        })
+    # idővonal-jelzés az előre kiszámolt táblából (egy indexelt lookup)
+    idovonal = IdovonalEllenorzes.objects.filter(datum=d).first()
 
     return render(
         request,
@@ -639,13 +1185,294 @@ def nap_attekintes(request):
         {
             "date": d,
             "date_iso": d.isoformat(),
-            "entries": entries,
-            "total_minutes": total_minutes,
-            "total_human": format_minutes(total_minutes),
-            "avg_ertek": avg_ertek,
-            "min_ertek": min_ertek,
-            "max_ertek": max_ertek,
-            "top_kategoriak": top_kategoriak,
-            "top_celok": top_celok,
+            # élő frissítés: az előző napi változás az idővonal-jelzést is érinti
+            "elo_start_iso": (d - timedelta(days=1)).isoformat(),
+            "elozo_nap": elozo_nap,
+            "kovetkezo_nap": kovetkezo_nap,
+            "idovonal": idovonal,
+            **adatok,
         }
     )
+
+
+def celok(request):
+    """
+    Célok – mennyi időt tettem eddig az egyes célokba?
+
+    Minden Param(tipus="cel") cél: összes idő, heti tempó (az első bejegyzés
+    óta eltelt hetekre vetítve), utolsó érintés. Az adatok a CelOsszesito
+    táblából jönnek (egy olvasás, nincs GROUP BY a naplón).
+    """
+    ma = timezone.localdate()
+    osszesitok = {o.cel: o for o in CelOsszesito.objects.all()}
+    nevek = list(Param.objects.filter(tipus="cel").order_by("nev").values_list("nev", flat=True))
+
+    # a naplóban előforduló, de a Param-ban nem szereplő célok a lista végére
+    extra = sorted(set(osszesitok) - set(nevek))
+
+    sorok = []
+    for nev in nevek + extra:
+        o = osszesitok.get(nev)
+        minutes = int(o.osszes_ido.total_seconds() // 60) if o and o.osszes_ido else 0
+        heti = None
+        napja = None
+        if o and o.elso_datum:
+            hetek = max(1.0, ((ma - o.elso_datum).days + 1) / 7)
+            heti = int(round(minutes / hetek))
+        if o and o.utolso_datum:
+            napja = (ma - o.utolso_datum).days
+        sorok.append({
+            "cel": nev,
+            "param": nev not in extra,
+            "minutes": minutes,
+            "human": format_minutes(minutes),
+            "sorok": o.sorok if o else 0,
+            "heti_perc": heti,
+            "heti_human": format_minutes(heti) if heti is not None else "",
+            "elso_datum": o.elso_datum if o else None,
+            "utolso_datum": o.utolso_datum if o else None,
+            "napja": napja,
+        })
+
+    sorok.sort(key=lambda r: (-r["minutes"], r["cel"]))
+
+    return render(request, "naplo/celok.html", {"sorok": sorok, "ma": ma})
+
+
+def api_valtozasok(request):
+    """
+    Delta-szinkron a kliens oldali (IndexedDB) napló-cache-hez.
+
+    GET:
+      - since=<sorszám> (alap: 0 = teljes betöltés)
+      - limit=1000 (opcionális, max 5000)
+
+    Válasz:
+      {"changes": [
+         {"seq": 812, "op": "upsert", "row": {id, datum, kezdet, veg, ido_perc, tevekenyseg, ...}},
+         {"seq": 815, "op": "delete", "id": 1234},
+         ...],
+       "next": 815,       # a következő kérés since értéke
+       "more": false,     # true: azonnal lehet folytatni next- től
+       "latest": 815}
+
+    Ha a since nagyobb a legutolsó sorszámnál (a napló újraindult), a válasz
+    {"reset": true, "latest": ...} – a kliens ürítse a cache-t és kezdje 0-tól.
+    """
+    try:
+        since = int(request.GET.get("since") or 0)
+        limit = max(1, min(5000, int(request.GET.get("limit") or 1000)))
+    except ValueError:
+        return JsonResponse({"error": "A since és limit egész szám."}, status=400)
+
+    latest = utolso_sorszam()
+    if since > latest:
+        return JsonResponse({"reset": True, "latest": latest})
+
+    changes, kovetkezo, van_meg = valtozasok_lekerdezese(since, limit)
+    return JsonResponse({"changes": changes, "next": kovetkezo, "more": van_meg, "latest": latest})
+
+
+TOMEGES_MAX_SOR = 500
+
+
+@require_POST
+def api_bevitel_tomeges(request):
+    """
+    Több új NaploSor egy kérésben (offline várólista szinkronja, sw.js).
+
+    POST (JSON, X-CSRFToken fejléccel):
+      {"rows": [
+         {"client_id": "uuid", "datum": "2025-12-01", "kezdet": "08:00", "veg": "08:30",
+          "tevekenyseg": "...", "ertek": 7, "kategoria": "...", "eletkerek_focus": ["MUNKA"], ...},
+         ...]}
+
+    A sorok a NaploSorForm szabályaival validálódnak; az érvényesek egy
+    tranzakcióban kerülnek be. A client_id idempotencia-kulcs: az újraküldött
+    sor "duplikatum" lesz, nem új sor – akkor is, ha két kérés párhuzamosan
+    küldi (a unique ütközés után a többi sor újra próbálkozik).
+
+    Válasz:
+      {"results": [
+         {"index": 0, "client_id": "...", "status": "ok", "id": 123},
+         {"index": 1, "client_id": "...", "status": "duplikatum", "id": 98},
+         {"index": 2, "client_id": "...", "status": "hiba", "errors": {"veg": ["..."]}}],
+       "mentve": 1}
+    """
+    try:
+        rows = json.loads(request.body or b"{}").get("rows")
+    except (ValueError, AttributeError):
+        rows = None
+    if not isinstance(rows, list):
+        return JsonResponse({"error": "Kell JSON: {\"rows\": [...]}."}, status=400)
+    if len(rows) > TOMEGES_MAX_SOR:
+        return JsonResponse({"error": f"Legfeljebb {TOMEGES_MAX_SOR} sor egy kérésben."}, status=400)
+
+    kliens_idk = [str(r.get("client_id"))[:64] for r in rows if isinstance(r, dict) and r.get("client_id")]
+    meglevok = dict(
+        NaploSor.objects.filter(kliens_id__in=kliens_idk).values_list("kliens_id", "id")
+    ) if kliens_idk else {}
+
+    results = []
+    uj = []   # (results index, obj)
+    latott = set()
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict):
+            results.append({"index": i, "status": "hiba", "errors": {"__all__": ["A sor nem objektum."]}})
+            continue
+        kliens_id = str(row["client_id"])[:64] if row.get("client_id") else None
+        res = {"index": i, "client_id": kliens_id}
+        results.append(res)
+
+        if kliens_id in meglevok:
+            res.update(status="duplikatum", id=meglevok[kliens_id])
+            continue
+        if kliens_id and kliens_id in latott:
+            res.update(status="hiba", errors={"client_id": ["Ismétlődő client_id a kérésen belül."]})
+            continue
+
+        form = NaploSorAdatForm(data=row)
+        if not form.is_valid():
+            res.update(status="hiba", errors={k: list(v) for k, v in form.errors.items()})
+            continue
+        obj = form.save(commit=False)
+        obj.kliens_id = kliens_id
+        obj.szamitott_mezok()  # bulk_create nem hívja a save()-et
+        uj.append((len(results) - 1, obj))
+        if kliens_id:
+            latott.add(kliens_id)
+
+    while uj:
+        try:
+            with transaction.atomic():
+                objs = NaploSor.objects.bulk_create([obj for _, obj in uj])
+                tomeges_beszuras_utan(objs)
+        except IntegrityError:
+            # egy párhuzamos kérés (pl. újraküldés) a fenti ellenőrzés óta beszúrta
+            # ugyanazt a client_id-t: azok duplikátumok, a többi újra próbálkozik
+            utkozok = dict(
+                NaploSor.objects.filter(kliens_id__in=[obj.kliens_id for _, obj in uj if obj.kliens_id])
+                .values_list("kliens_id", "id")
+            )
+            if not utkozok:
+                raise
+            for idx, obj in uj:
+                if obj.kliens_id in utkozok:
+                    results[idx].update(status="duplikatum", id=utkozok[obj.kliens_id])
+            uj = [(idx, obj) for idx, obj in uj if obj.kliens_id not in utkozok]
+            continue
+        for (idx, _), obj in zip(uj, objs):
+            results[idx].update(status="ok", id=obj.pk)
+        break
+
+    return JsonResponse({"results": results, "mentve": sum(r.get("status") == "ok" for r in results)})
+
+
+def service_worker(request):
+    """
+    A bevitel oldal service workere. A /naplo/ alól kell kiszolgálni (nem a
+    /static/ alól), különben a hatóköre nem terjedne ki a bevitel oldalra.
+    """
+    response = render(request, "naplo/sw.js", content_type="text/javascript")
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+ESEMENY_SZIVVERES_MP = 15
+
+
+async def api_esemenyek(request):
+    """
+    GET: server-sent events stream (text/event-stream), csak ASGI alatt.
+
+    Események:
+      event: valtozas
+      data: {"napok": ["2025-03-01", "2025-03-02"]}   – ezeken a napokon változott sor
+      data: {"minden": true}                           – túl sok kimaradt üzenet, mindent frissíteni
+
+    15 mp-enként ": ping" komment tartja életben a kapcsolatot (proxyk).
+    WSGI alatt 204-et ad: a Django ott a teljes választ pufferelné, az EventSource
+    pedig 204-re nem kapcsolódik újra.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    async def stream():
+        elem = kozvetito.feliratkozas()
+        _, sor = elem
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    uzenet = await asyncio.wait_for(sor.get(), ESEMENY_SZIVVERES_MP)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: valtozas\ndata: {json.dumps(uzenet)}\n\n"
+        finally:
+            # kliens bontáskor a Django CancelledError-ral állítja le a generátort
+            kozvetito.leiratkozas(elem)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"   # nginx ne pufferelje
+    return response
+
+
+@staff_member_required
+def api_profil(request):
+    """
+    GET (csak staff, csak olvas): a gyűrűpuffer statisztikája.
+
+    Válasz:
+      {"minta": 1200, "puffer_meret": 5000, "vegpontok": [
+        {"url_name": "dashboard", "db": 40, "p50_ms": 35.2, "p95_ms": 120.4, "p99_ms": 180.0,
+         "max_ms": 190.3, "db_ms_atlag": 8.1, "lekerdezes_atlag": 1.0, "lekerdezes_max": 1,
+         "meret_atlag": 154000}, ...]}
+
+    Üres, ha a ProfilozoMiddleware nincs bekapcsolva (settings.NAPLO_PROFILOZAS).
+    A puffer ürítése külön POST (api_profil_torles).
+    """
+    return JsonResponse(profil_statisztika())
+
+
+@staff_member_required
+@require_POST
+def api_profil_torles(request):
+    """
+    POST (csak staff, X-CSRFToken fejléccel): a profil-puffer ürítése.
+    Nem GET: egy előtöltés, link-előnézet vagy újratöltés nem törölheti a mérést.
+
+    Válasz: {"torolve": 1200}   # ennyi minta volt a pufferben
+    """
+    return JsonResponse({"torolve": profil_torles()})
+
+
+# ManifestStaticFilesStorage névminta: <név>.<12 hex>.<kiterjesztés>
+HASHELT_STATIKUS = re.compile(r"\.[0-9a-f]{12}\.\w+$")
+
+
+def statikus_fajl(request, path):
+    """
+    Statikus fájl a STATIC_ROOT-ból, DEBUG=False mellett (ha nincs előtte
+    webszerver, ami ezt átvenné). A hash-elt nevek tartalma sosem változik,
+    ezért egy év + immutable; a hash nélküliek csak rövid ideig cache-elhetők.
+    Ha a kliens elfogadja, a collectstatic által előre tömörített .br / .gz
+    változat megy ki (storage.py).
+    """
+    elfogad = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    response = None
+    for kodolas, kit in (("br", ".br"), ("gzip", ".gz")):
+        if re.search(rf"\b{kodolas}\b", elfogad) and os.path.isfile(os.path.join(settings.STATIC_ROOT, path + kit)):
+            # a serve() a .br / .gz kiterjesztésből beállítja a Content-Encoding-ot
+            response = static_serve(request, path + kit, document_root=settings.STATIC_ROOT)
+            break
+    if response is None:
+        response = static_serve(request, path, document_root=settings.STATIC_ROOT)
+    patch_vary_headers(response, ("Accept-Encoding",))
+
+    if HASHELT_STATIKUS.search(path):
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        response["Cache-Control"] = "public, max-age=300"
+    return response